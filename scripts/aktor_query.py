@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Query an actor JSON file (2024-arsrapport.json, sammenligning-2024/{area}.json) through its indexes.
+
+Lookups use the `indexes` written by the actor converters (see build_actor_indexes in
+aktor_rows.py) instead of scanning `actors`: type and kommune lookups are a dict access,
+ranges and top-N a binary search or slice over the sorted views. Files written before the
+indexes existed are indexed on load.
+
+    python3 scripts/aktor_query.py src/data/aktorer/2024-arsrapport.json --top markedsandel 10
+    python3 scripts/aktor_query.py lokka.json --type "Mat og opplevelser / Restaurant" --min-revenue 10
+"""
+
+import argparse
+import json
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+
+from aktor_rows import SORTED_FIELDS, build_actor_indexes, index_key
+
+class AktorIndex:
+    """Index-backed lookups over one actor file; every query returns actor dicts"""
+
+    def __init__(self, data):
+        self.actors = data['actors']
+        self.indexes = data.get('indexes') or build_actor_indexes(self.actors)
+        # Ascending sort keys per field, built on first use for range queries
+        self.sort_keys = {}
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def lookup(self, positions):
+        return [self.actors[position] for position in positions]
+
+    def type_positions(self, type_):
+        return self.indexes['byType'].get(index_key(type_), [])
+
+    def kommune_positions(self, kommune):
+        return self.indexes['byKommune'].get(index_key(kommune), [])
+
+    def range_positions(self, field, minimum=None, maximum=None):
+        """Positions with minimum <= field <= maximum, largest value first"""
+        order = self.indexes['sortedBy'][field]
+        if field not in self.sort_keys:
+            # sortedBy is largest first; negating gives an ascending list for bisect
+            self.sort_keys[field] = [-self.actors[position][field] for position in order]
+        keys = self.sort_keys[field]
+
+        start = 0 if maximum is None else bisect_left(keys, -maximum)
+        end = len(keys) if minimum is None else bisect_right(keys, -minimum)
+        return order[start:end]
+
+    def by_type(self, type_):
+        return self.lookup(self.type_positions(type_))
+
+    def by_kommune(self, kommune):
+        return self.lookup(self.kommune_positions(kommune))
+
+    def in_range(self, field, minimum=None, maximum=None):
+        return self.lookup(self.range_positions(field, minimum, maximum))
+
+    def top(self, field, n=10):
+        return self.lookup(self.indexes['sortedBy'][field][:n])
+
+    def bands(self, name):
+        """Actor counts per band for 'revenueBands' or 'growthBands'"""
+        return [{'min': band['min'], 'max': band['max'], 'count': len(band['actors'])}
+                for band in self.indexes[name]]
+
+    def query(self, type_=None, kommune=None, min_revenue=None, max_revenue=None, order_by=None, limit=None):
+        """
+        Actors matching every given filter.
+
+        Results are in file order, or largest first by order_by. Only the smallest
+        candidate list is walked; the other filters are set lookups.
+        """
+        candidates = []
+        if type_ is not None:
+            candidates.append(self.type_positions(type_))
+        if kommune is not None:
+            candidates.append(self.kommune_positions(kommune))
+        if min_revenue is not None or max_revenue is not None:
+            candidates.append(self.range_positions('omsetning', min_revenue, max_revenue))
+
+        if order_by is not None:
+            # Walk the sorted view so the result comes out in order and can stop at limit
+            candidates.append(self.indexes['sortedBy'][order_by])
+            walk = candidates.pop()
+        elif candidates:
+            walk = sorted(candidates.pop(min(range(len(candidates)), key=lambda i: len(candidates[i]))))
+        else:
+            walk = range(len(self.actors))
+
+        filters = [set(positions) for positions in candidates]
+        matches = []
+        for position in walk:
+            if all(position in positions for positions in filters):
+                matches.append(position)
+                if limit is not None and len(matches) >= limit:
+                    break
+
+        return self.lookup(matches)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('path', type=Path, help='Actor JSON file written by an actor converter')
+    parser.add_argument('--type', dest='type_', help='Only actors of this type, e.g. "Handel / Mat og drikke"')
+    parser.add_argument('--kommune', help='Only actors in this kommune')
+    parser.add_argument('--min-revenue', type=float, help='Minimum omsetning in mill NOK')
+    parser.add_argument('--max-revenue', type=float, help='Maximum omsetning in mill NOK')
+    parser.add_argument('--top', nargs=2, metavar=('FIELD', 'N'),
+                        help=f"Largest N actors by FIELD ({', '.join(SORTED_FIELDS)})")
+    args = parser.parse_args()
+
+    order_by, limit = None, None
+    if args.top:
+        order_by, limit = args.top[0], int(args.top[1])
+        if order_by not in SORTED_FIELDS:
+            parser.error(f"--top FIELD must be one of: {', '.join(SORTED_FIELDS)}")
+
+    index = AktorIndex.from_file(args.path)
+    actors = index.query(args.type_, args.kommune, args.min_revenue, args.max_revenue, order_by, limit)
+
+    for aktor in actors:
+        print(f"{aktor['rank'] or '':>6}  {aktor['navn'] or '':<40}  {aktor['omsetning']:>6}M NOK  "
+              f"{aktor['yoy_vekst']:>6.1f}%  {aktor['ansatte']:>5} ansatte  {aktor['markedsandel']:.2f}%")
+    print(f"\n✓ {len(actors)} av {len(index.actors)} aktører")
+
+if __name__ == "__main__":
+    main()
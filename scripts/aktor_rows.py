@@ -0,0 +1,144 @@
+"""
+Row decoding and indexing shared by the Aktørkartlegging converters.
+
+AktorRowDecoder turns one CSV row into an actor dict. Each cell's whitespace is
+normalised once and the numeric fields are extracted with precompiled patterns, so
+large actor lists avoid re-cleaning the same cell and repeated regex cache lookups.
+
+build_actor_indexes precomputes the lookups the pages and aktor_query.py need
+(by type, kommune, revenue and growth band, and views sorted by the numeric fields)
+as lists of positions in the `actors` array, so they do not rescan the full list.
+"""
+
+import csv
+import re
+from bisect import bisect_right
+from collections import defaultdict
+
+OMSETNING_PATTERN = re.compile(r'NOK\s+(\d+)\s+mill')
+PERCENTAGE_PATTERN = re.compile(r'(-?\d+(?:\.\d+)?)\s*%')
+ANSATTE_PATTERN = re.compile(r'(\d+)')
+
+def clean_value(value):
+    """Clean multiline values and extract main data"""
+    if not value:
+        return None
+    # Remove newlines and extra spaces
+    return ' '.join(value.split())
+
+def parse_omsetning(value):
+    """Extract NOK amount from omsetning field"""
+    match = OMSETNING_PATTERN.search(value) if value else None
+    return int(match.group(1)) if match else 0
+
+def parse_percentage(value):
+    """Extract percentage from YoY or market share"""
+    match = PERCENTAGE_PATTERN.search(value) if value else None
+    return float(match.group(1)) if match else 0.0
+
+def parse_ansatte(value):
+    """Extract employee count"""
+    match = ANSATTE_PATTERN.match(value) if value else None
+    return int(match.group(1)) if match else 0
+
+class AktorRowDecoder:
+    """
+    Decode csv.reader rows of an Aktørkartlegging sheet into actor dicts.
+
+    Produces the same dicts as reading the sheet with csv.DictReader and calling
+    clean_value / parse_* on each column, including for short rows and duplicate
+    headers (the last column with a given name wins).
+    """
+
+    COLUMNS = ('#', 'Navn', 'Type', 'Adresse', 'Kommune', 'Omsetning', 'YoY-vekst', 'Ansatte', 'Markedsandel')
+
+    def __init__(self, header):
+        positions = {name: i for i, name in enumerate(header)}
+        missing = [name for name in self.COLUMNS if name not in positions]
+        if missing:
+            raise KeyError(f"Missing columns in Aktørkartlegging CSV: {', '.join(missing)}")
+        self.indexes = [positions[name] for name in self.COLUMNS]
+
+    def decode(self, row):
+        """Return the actor dict for one row."""
+        # Normalise each cell once; cells missing from short rows count as empty
+        cells = [
+            ' '.join(row[i].split()) if i < len(row) and row[i] else None
+            for i in self.indexes
+        ]
+        rank, navn, type_, adresse, kommune, omsetning, yoy_vekst, ansatte, markedsandel = cells
+
+        # Collapsing whitespace cannot change what the unanchored patterns find; the
+        # anchored employee count only matches when the raw cell starts with a digit.
+        ansatte_match = ANSATTE_PATTERN.match(ansatte) if ansatte and not row[self.indexes[7]][0].isspace() else None
+        omsetning_match = OMSETNING_PATTERN.search(omsetning) if omsetning else None
+        yoy_match = PERCENTAGE_PATTERN.search(yoy_vekst) if yoy_vekst else None
+        andel_match = PERCENTAGE_PATTERN.search(markedsandel) if markedsandel else None
+
+        return {
+            'rank': rank,
+            'navn': navn,
+            'type': type_,
+            'adresse': adresse,
+            'kommune': kommune,
+            'omsetning': int(omsetning_match.group(1)) if omsetning_match else 0,
+            'omsetning_raw': omsetning,
+            'yoy_vekst': float(yoy_match.group(1)) if yoy_match else 0.0,
+            'ansatte': int(ansatte_match.group(1)) if ansatte_match else 0,
+            'ansatte_raw': ansatte,
+            'markedsandel': float(andel_match.group(1)) if andel_match else 0.0,
+        }
+
+def read_aktor_rows(csv_path):
+    """Read an Aktørkartlegging CSV and return its actors in file order."""
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return []
+
+        decoder = AktorRowDecoder(header)
+        # csv.DictReader skips empty rows, so do the same
+        return [decoder.decode(row) for row in reader if row]
+
+# Band edges; each band holds min <= value < max, the first and last bands are open-ended
+REVENUE_BAND_EDGES = (1, 5, 10, 50, 100)  # mill NOK
+GROWTH_BAND_EDGES = (-25, -10, 0, 10, 25)  # YoY %
+
+# Numeric fields with a sorted view, largest first
+SORTED_FIELDS = ('omsetning', 'markedsandel', 'ansatte', 'yoy_vekst')
+
+def index_key(value):
+    """Key of a value in byType/byKommune: JSON object keys are strings, so a missing value is "null"."""
+    return 'null' if value is None else value
+
+def group_positions(aktorer, field):
+    """Map each value of field (as index_key) to the positions of the actors that have it, in file order"""
+    groups = defaultdict(list)
+    for position, aktor in enumerate(aktorer):
+        groups[index_key(aktor[field])].append(position)
+    return dict(groups)
+
+def band_positions(aktorer, field, edges):
+    """Split actor positions into the bands given by edges; returns [{'min', 'max', 'actors'}]"""
+    bounds = [None, *edges, None]
+    bands = [{'min': lo, 'max': hi, 'actors': []} for lo, hi in zip(bounds, bounds[1:])]
+
+    for position, aktor in enumerate(aktorer):
+        bands[bisect_right(edges, aktor[field])]['actors'].append(position)
+
+    return bands
+
+def build_actor_indexes(aktorer):
+    """Secondary indexes and sorted views over an actor list, as positions in that list"""
+    return {
+        'byType': group_positions(aktorer, 'type'),
+        'byKommune': group_positions(aktorer, 'kommune'),
+        'revenueBands': band_positions(aktorer, 'omsetning', REVENUE_BAND_EDGES),
+        'growthBands': band_positions(aktorer, 'yoy_vekst', GROWTH_BAND_EDGES),
+        # Stable sort: actors with equal values keep their file order
+        'sortedBy': {
+            field: sorted(range(len(aktorer)), key=lambda position: -aktorer[position][field])
+            for field in SORTED_FIELDS
+        },
+    }
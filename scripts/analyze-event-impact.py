@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Measure the effect of the events in aktiviteter-2024.json on the real daily bank transactions.
+
+Joins public/data/aktiviteter-2024.json with src/data/quarterly/daily-transactions.json
+(written by convert-quarterly-csv-with-daily.py) and writes event-impact-2024.json next
+to the daily data, so pages can show measured event effects instead of the hardcoded
+eventBoosts in src/lib/synthetic-data-generator.ts.
+
+The daily series is laid out as one row per calendar day (rows sharing a date are added
+up, missing days are NaN), so an event window is a slice of day indexes. A day's baseline
+is, per category, the median of the same weekday in the BASELINE_WEEKS weeks before and
+after it. That follows both the weekday pattern and the season. Days of the largest
+events (BASELINE_EXCLUDE_LEVELS) are left out of every baseline, so they do not lift it.
+The baselines of all days, and the window sums of all events, are computed as whole-array
+operations.
+
+For each event, `lift` is the % difference between the actual and baseline sums over
+the event days that have data. `baselineErrorPct` in the metadata is the median absolute
+% difference on days without events, i.e. how large a lift has to be to stand out.
+`dayMultipliers` gives actual / baseline total for every event day, in the same form as
+eventBoosts.
+
+    python3 scripts/analyze-event-impact.py
+    python3 scripts/analyze-event-impact.py --baseline-weeks 6
+"""
+
+import argparse
+import json
+import warnings
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from json_writer import write_json
+from quarterly_pipeline import parse_iso_date
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+EVENTS_PATH = BASE_DIR / "public" / "data" / "aktiviteter-2024.json"
+DAILY_PATH = BASE_DIR / "src" / "data" / "quarterly" / "daily-transactions.json"
+OUTPUT_FILENAME = "event-impact-{year}.json"
+
+CATEGORIES = ('handel', 'matOgOpplevelser', 'tjenester', 'total')
+# Same weekday this many weeks before and after a day
+BASELINE_WEEKS = 4
+# Hierarchy levels (1 = 5000+ visitors, 2 = 1000-5000) whose days are kept out of baselines
+BASELINE_EXCLUDE_LEVELS = (1, 2)
+
+def load_daily_series(daily_path):
+    """Return (first date, days x CATEGORIES array) from daily-transactions.json; missing days are NaN."""
+    with open(daily_path, 'r', encoding='utf-8') as f:
+        quarters = json.load(f)['quarters']
+
+    entries = [entry for entries in quarters.values() for entry in entries]
+    days = [parse_iso_date(entry['date']) for entry in entries]
+    known = [(day, entry) for day, entry in zip(days, entries) if day is not None]
+    if not known:
+        raise ValueError(f"No dated entries in {daily_path}")
+
+    first = min(day for day, _ in known)
+    index = np.array([(day - first).days for day, _ in known])
+    amounts = np.array([[entry[category] for category in CATEGORIES] for _, entry in known], dtype=np.float64)
+
+    values = np.zeros((index.max() + 1, len(CATEGORIES)))
+    np.add.at(values, index, amounts)
+    has_data = np.zeros(len(values), dtype=bool)
+    has_data[index] = True
+    values[~has_data] = np.nan
+    return first, values
+
+def load_events(events_path):
+    """Events with a parseable date, as dicts with start/end dates (end defaults to the start)."""
+    with open(events_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    events = []
+    for event in data.get('events') or data.get('arrangementer') or []:
+        start = parse_iso_date(event.get('date') or '')
+        if start is None:
+            print(f"⚠️  {event.get('id')}: date {event.get('date')!r} cannot be parsed, skipped")
+            continue
+        end = parse_iso_date(event.get('endDate') or '') or start
+        events.append(dict(event, start=start, end=max(start, end)))
+    return data.get('metadata', {}), events
+
+def window_indexes(events, first, day_count):
+    """Start and end day indexes (inclusive) of every event, clipped to the series."""
+    starts = np.array([(event['start'] - first).days for event in events], dtype=np.int64)
+    ends = np.array([(event['end'] - first).days for event in events], dtype=np.int64)
+    return np.clip(starts, 0, day_count), np.clip(ends, -1, day_count - 1)
+
+def covered_days(starts, ends, day_count):
+    """Boolean mask of the days inside any of the windows."""
+    edges = np.zeros(day_count + 1, dtype=np.int64)
+    inside = starts <= ends
+    np.add.at(edges, starts[inside], 1)
+    np.add.at(edges, ends[inside] + 1, -1)
+    return np.cumsum(edges[:-1]) > 0
+
+def weekday_baseline(values, excluded, weeks=BASELINE_WEEKS):
+    """Per day and category, the median of the same weekday within +-weeks, leaving out excluded days."""
+    offsets = np.array([7 * k for k in range(-weeks, weeks + 1) if k != 0])
+    neighbours = np.arange(len(values))[:, None] + offsets[None, :]
+    in_range = (neighbours >= 0) & (neighbours < len(values))
+    neighbours = np.clip(neighbours, 0, len(values) - 1)
+
+    samples = values[neighbours]  # days x neighbours x categories
+    samples[~in_range | excluded[neighbours]] = np.nan
+    with warnings.catch_warnings():
+        # Days without any usable neighbour get NaN
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return np.nanmedian(samples, axis=1)
+
+def percent(actual, baseline):
+    return round(float(actual / baseline - 1) * 100, 1) if baseline > 0 else None
+
+def analyze(values, first, events, weeks=BASELINE_WEEKS):
+    """Per-event window sums and lifts, the baseline error and the per-day multipliers."""
+    day_count = len(values)
+    starts, ends = window_indexes(events, first, day_count)
+    levels = np.array([event.get('hierarchyLevel') or 0 for event in events])
+
+    excluded = covered_days(starts[np.isin(levels, BASELINE_EXCLUDE_LEVELS)],
+                            ends[np.isin(levels, BASELINE_EXCLUDE_LEVELS)], day_count)
+    baseline = weekday_baseline(values, excluded, weeks)
+
+    # A day counts when it has both data and a baseline
+    usable = ~np.isnan(values[:, -1]) & ~np.isnan(baseline[:, -1])
+    zero = np.zeros((1, len(CATEGORIES)))
+    actual_sums = np.concatenate([zero, np.cumsum(np.where(usable[:, None], values, 0), axis=0)])
+    baseline_sums = np.concatenate([zero, np.cumsum(np.where(usable[:, None], baseline, 0), axis=0)])
+    usable_days = np.concatenate([[0], np.cumsum(usable)])
+
+    # Window sums of every event at once; empty windows (outside the series) give zeros
+    lo, hi = starts, np.maximum(ends + 1, starts)
+    event_actual = actual_sums[hi] - actual_sums[lo]
+    event_baseline = baseline_sums[hi] - baseline_sums[lo]
+    event_days = usable_days[hi] - usable_days[lo]
+
+    quiet = usable & ~covered_days(starts, ends, day_count)
+    errors = np.abs(values[quiet, -1] / baseline[quiet, -1] - 1) * 100
+    baseline_error = round(float(np.median(errors)), 1) if len(errors) else None
+
+    results = []
+    for i, event in enumerate(events):
+        results.append({
+            'id': event.get('id'),
+            'title': event.get('title'),
+            'date': event['start'].isoformat(),
+            'endDate': event['end'].isoformat(),
+            'category': event.get('category'),
+            'hierarchyLevel': event.get('hierarchyLevel'),
+            'estimatedVisitors': event.get('estimatedVisitors'),
+            'days': (event['end'] - event['start']).days + 1,
+            'daysWithData': int(event_days[i]),
+            'actual': {category: int(event_actual[i, c]) for c, category in enumerate(CATEGORIES)},
+            'baseline': {category: int(round(event_baseline[i, c])) for c, category in enumerate(CATEGORIES)},
+            'lift': {category: percent(event_actual[i, c], event_baseline[i, c]) if event_days[i] else None
+                     for c, category in enumerate(CATEGORIES)}
+        })
+
+    event_days_mask = covered_days(starts, ends, day_count) & usable
+    multipliers = {
+        (first + timedelta(days=int(day))).isoformat(): round(float(values[day, -1] / baseline[day, -1]), 3)
+        for day in np.flatnonzero(event_days_mask) if baseline[day, -1] > 0
+    }
+    return results, baseline_error, multipliers
+
+def summarize(results, key):
+    """Event count and mean/median total lift per value of key, over events with data."""
+    groups = {}
+    for result in results:
+        if result['lift']['total'] is not None:
+            groups.setdefault(str(result[key]), []).append(result['lift']['total'])
+    return {
+        group: {'events': len(lifts), 'meanLift': round(float(np.mean(lifts)), 1),
+                'medianLift': round(float(np.median(lifts)), 1)}
+        for group, lifts in sorted(groups.items())
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--events', type=Path, default=EVENTS_PATH, help='Event calendar (aktiviteter-YYYY.json)')
+    parser.add_argument('--daily', type=Path, default=DAILY_PATH,
+                        help='Daily data written by convert-quarterly-csv-with-daily.py')
+    parser.add_argument('--output', type=Path,
+                        help='Output file (default: event-impact-{year}.json next to the daily data)')
+    parser.add_argument('--baseline-weeks', type=int, default=BASELINE_WEEKS,
+                        help='Weeks before and after a day whose same weekday forms its baseline (default: %(default)s)')
+    args = parser.parse_args()
+
+    if np is None:
+        parser.error("analyze-event-impact.py requires NumPy (pip install numpy)")
+
+    event_metadata, events = load_events(args.events)
+    first, values = load_daily_series(args.daily)
+    last = first + timedelta(days=len(values) - 1)
+    print(f"Joining {len(events)} events with {int((~np.isnan(values[:, -1])).sum())} days of transactions "
+          f"({first} - {last})...")
+
+    results, baseline_error, multipliers = analyze(values, first, events, args.baseline_weeks)
+
+    year = event_metadata.get('year') or (events[0]['start'].year if events else date.today().year)
+    output = {
+        'metadata': {
+            'title': f"Event impact on daily bank transactions {year}",
+            'generated': datetime.now().strftime('%Y-%m-%d'),
+            'events': args.events.name,
+            'daily': args.daily.name,
+            'baseline': f"Median of the same weekday within ±{args.baseline_weeks} weeks, excluding the days "
+                        f"of hierarchy level {', '.join(map(str, BASELINE_EXCLUDE_LEVELS))} events",
+            'categories': list(CATEGORIES),
+            'liftUnit': "% over baseline",
+            'baselineErrorPct': baseline_error
+        },
+        'events': results,
+        'summary': {
+            'byHierarchyLevel': summarize(results, 'hierarchyLevel'),
+            'byCategory': summarize(results, 'category')
+        },
+        'dayMultipliers': multipliers
+    }
+
+    output_path = args.output or args.daily.with_name(OUTPUT_FILENAME.format(year=year))
+    write_json(output_path, output)
+
+    measured = [result for result in results if result['lift']['total'] is not None]
+    print(f"\n✅ Measured {len(measured)} of {len(results)} events "
+          f"(typical baseline error ±{baseline_error}%). Output saved to: {output_path}")
+    for result in sorted(measured, key=lambda result: -result['lift']['total'])[:10]:
+        print(f"   {result['lift']['total']:>+7.1f}%  {result['date']}  {result['title']}")
+    missing = len(results) - len(measured)
+    if missing:
+        print(f"⚠️  {missing} events fall outside the daily data")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Benchmark the CSV converters on synthetic inputs of increasing size.
+
+For every converter and size, the input is generated with synthetic_data.py and the
+conversion runs in a fresh Python process. That keeps the peak memory figure for one
+run from being hidden by an earlier, larger run. Reports wall time, CPU time, rows per
+second, peak RSS and the size of the files written. Use --json to save the results for
+comparison across commits. The *-compact and *-stdlib-json cases compare the JSON
+layouts and backends of json_writer.py.
+
+Use --check to instead run convert-quarterly-csv-with-daily.py in each of its modes on one
+small input with edge cases and verify that every mode writes the same files.
+
+    python3 scripts/benchmark-converters.py --sizes 1e3 1e4 1e5
+    python3 scripts/benchmark-converters.py --converters quarterly-daily --sizes 1e6 1e7
+    python3 scripts/benchmark-converters.py --check
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import json_writer
+import synthetic_data
+
+AREA_NAMES = ["Løkka", "Bjørvika", "Sentrum", "Majorstuen"]
+DISTRICT_COUNT = 16
+DEMOGRAFI_AREA_COUNT = 8
+
+# convert-quarterly-csv-with-daily.py arguments per mode compared by --check
+QUARTERLY_CHECK_MODES = {
+    'in-memory': [],
+    'numpy': ['--engine', 'numpy'],
+    'stream': ['--stream'],
+    'stream-jobs': ['--stream', '--jobs', '2'],
+}
+
+def load_script(filename):
+    """Import a converter script (the file names contain hyphens, so plain import does not work)."""
+    spec = importlib.util.spec_from_file_location(filename.replace('-', '_')[:-3], SCRIPTS_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def prepare_quarterly(input_dir, rows):
+    synthetic_data.write_quarterly_csvs(input_dir / "csv", rows)
+
+def prepare_aktorer(input_dir, rows):
+    synthetic_data.write_aktor_csv(input_dir / "aktorer.csv", rows)
+
+def prepare_sammenligning(input_dir, rows):
+    for i, name in enumerate(AREA_NAMES):
+        synthetic_data.write_aktor_csv(input_dir / f"{name}.csv", rows // len(AREA_NAMES), seed=i)
+
+def prepare_districts(input_dir, rows):
+    """Write DISTRICT_COUNT area CSVs and an area manifest for convert-sammenligning-aktorer.py --manifest."""
+    areas = []
+    for i in range(DISTRICT_COUNT):
+        synthetic_data.write_aktor_csv(input_dir / "csv" / f"bydel-{i}.csv", rows // DISTRICT_COUNT, seed=i)
+        areas.append({'name': f"Bydel {i}", 'key': f"bydel-{i}", 'csv': f"bydel-{i}.csv"})
+
+    with open(input_dir / "areas.json", 'w', encoding='utf-8') as f:
+        json.dump({'sourceDir': "csv", 'outputDir': "out", 'areas': areas}, f, indent=2, ensure_ascii=False)
+
+def prepare_demografi(input_dir, rows):
+    synthetic_data.write_demografi_dir(input_dir / "csv", rows)
+
+def quarterly_output_dir(input_dir):
+    """Create an output folder with the banktransaksjoner template the quarterly converters merge into."""
+    output_dir = input_dir / "out"
+    output_dir.mkdir(exist_ok=True)
+    with open(output_dir / "banktransaksjoner-2019-2025.json", 'w', encoding='utf-8') as f:
+        json.dump({"metadata": {"lastUpdated": None}, "data": []}, f)
+    return output_dir
+
+def run_quarterly_daily(input_dir, stream=False, engine='python', compact=False):
+    converter = load_script("convert-quarterly-csv-with-daily.py")
+    csv_files = sorted((input_dir / "csv").glob("*.csv"))
+    daily_output_path = quarterly_output_dir(input_dir) / "daily-transactions.json"
+    if stream:
+        converter.convert_streaming(csv_files, daily_output_path, engine=engine)
+    else:
+        converter.convert_in_memory(csv_files, daily_output_path, engine=engine, compact=compact)
+
+def run_quarterly_summary(input_dir):
+    import quarterly_pipeline
+    quarterly_pipeline.convert_summaries(input_dir / "csv", quarterly_output_dir(input_dir))
+
+def run_aktorer(input_dir, compact=False):
+    converter = load_script("convert-aktorer-csv.py")
+    converter.convert(input_dir / "aktorer.csv", input_dir / "aktorer.json", compact)
+
+def run_sammenligning(input_dir):
+    converter = load_script("convert-sammenligning-aktorer.py")
+    output_base = input_dir / "out"
+    output_base.mkdir(exist_ok=True)
+    areas = [
+        {
+            'name': name,
+            'key': name.lower(),
+            'csv': input_dir / f"{name}.csv",
+            'output': output_base / f"{name.lower()}.json",
+            'color': '#000000'
+        }
+        for name in AREA_NAMES
+    ]
+    converter.convert_areas(areas, output_base)
+
+def run_districts(input_dir, jobs):
+    # Run the script itself so its worker processes can import it on every start method
+    subprocess.run([sys.executable, str(SCRIPTS_DIR / "convert-sammenligning-aktorer.py"),
+                    '--manifest', str(input_dir / "areas.json"), '--jobs', str(jobs)],
+                   check=True, stdout=subprocess.DEVNULL)
+
+def prepare_demografi_batch(input_dir, rows):
+    for i in range(DEMOGRAFI_AREA_COUNT):
+        synthetic_data.write_demografi_dir(input_dir / "csv" / f"area-{i}", rows // DEMOGRAFI_AREA_COUNT, seed=i,
+                                           area=f"Område {i} (Område 1.{i} km²)")
+
+def run_demografi(input_dir):
+    converter = load_script("convert-demografi-csv.py")
+    converter.SOURCE_DIR = input_dir / "csv"
+    converter.OUTPUT_DIR = input_dir / "out"
+    converter.main([])
+
+def run_demografi_batch(input_dir):
+    converter = load_script("convert-demografi-csv.py")
+    converter.convert_batch(sorted((input_dir / "csv").iterdir()), input_dir / "out")
+
+def with_stdlib_json(run):
+    """Run a conversion with json_writer forced onto the standard library backend."""
+    def run_stdlib(input_dir):
+        json_writer.BACKEND = 'json'
+        run(input_dir)
+    return run_stdlib
+
+# name -> (input generator, conversion)
+CONVERTERS = {
+    'quarterly-daily': (prepare_quarterly, run_quarterly_daily),
+    'quarterly-daily-stream': (prepare_quarterly, lambda input_dir: run_quarterly_daily(input_dir, stream=True)),
+    'quarterly-daily-numpy': (prepare_quarterly, lambda input_dir: run_quarterly_daily(input_dir, engine='numpy')),
+    'quarterly-daily-compact': (prepare_quarterly, lambda input_dir: run_quarterly_daily(input_dir, compact=True)),
+    'quarterly-daily-stdlib-json': (prepare_quarterly, with_stdlib_json(run_quarterly_daily)),
+    'quarterly-summary': (prepare_quarterly, run_quarterly_summary),
+    'aktorer': (prepare_aktorer, run_aktorer),
+    'aktorer-compact': (prepare_aktorer, lambda input_dir: run_aktorer(input_dir, compact=True)),
+    'aktorer-stdlib-json': (prepare_aktorer, with_stdlib_json(run_aktorer)),
+    'sammenligning': (prepare_sammenligning, run_sammenligning),
+    'sammenligning-districts': (prepare_districts, lambda input_dir: run_districts(input_dir, jobs=1)),
+    'sammenligning-districts-parallel': (prepare_districts,
+                                         lambda input_dir: run_districts(input_dir, jobs=os.cpu_count() or 1)),
+    'demografi': (prepare_demografi, run_demografi),
+    'demografi-batch': (prepare_demografi_batch, run_demografi_batch),
+}
+
+def check_quarterly_modes(work_dir):
+    """
+    Run convert-quarterly-csv-with-daily.py in each QUARTERLY_CHECK_MODES mode on the same
+    input and return the problems found: files that differ from the first mode's, and
+    entries the aggregates skipped. The input has one quarter with non-padded dates
+    ("2019-1-5"), which the aggregates and series must count like the daily JSON does,
+    and a second, different file for Q1 2019, which every mode must resolve the same way.
+    """
+    input_dir = Path(work_dir) / "quarterly-check"
+    csv_dir = input_dir / "csv"
+    paths = synthetic_data.write_quarterly_csvs(csv_dir, 360, quarters=4)
+    synthetic_data.unpad_quarterly_dates(paths[0])
+    duplicate, = synthetic_data.write_quarterly_csvs(input_dir / "duplicate", 90, quarters=1, seed=1)
+    duplicate.rename(csv_dir / "02-01-2019 - 31-03-2019.csv")
+
+    modes = {mode: mode_args for mode, mode_args in QUARTERLY_CHECK_MODES.items()
+             if mode != 'numpy' or importlib.util.find_spec('numpy') is not None}
+    problems = []
+    outputs = {}
+    for mode, mode_args in modes.items():
+        (input_dir / mode).mkdir()
+        output_dir = quarterly_output_dir(input_dir / mode)
+        subprocess.run([sys.executable, str(SCRIPTS_DIR / "convert-quarterly-csv-with-daily.py"),
+                        '--source', str(csv_dir), '--output-dir', str(output_dir), '--no-cache',
+                        '--aggregates', '--series'] + mode_args,
+                       check=True, stdout=subprocess.DEVNULL)
+
+        outputs[mode] = {path.relative_to(output_dir).as_posix(): path.read_bytes()
+                         for path in output_dir.rglob("*") if path.is_file() and not path.name.startswith('.')}
+        skipped = json.loads(outputs[mode]["daily-aggregates.json"])["metadata"]["skippedEntries"]
+        if skipped:
+            problems.append(f"{mode}: {skipped} entries skipped by the aggregates")
+
+    reference, *others = outputs
+    for mode in others:
+        differing = sorted(name for name in outputs[reference].keys() | outputs[mode].keys()
+                           if outputs[reference].get(name) != outputs[mode].get(name))
+        if differing:
+            problems.append(f"{mode}: {', '.join(differing)} differ from {reference}")
+    return problems
+
+def peak_rss_mb():
+    """Peak resident set size of this process, or of its largest child process, in MB."""
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def children_cpu_seconds():
+    """CPU time used by finished child processes (worker pools, subprocesses)."""
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+def file_stamps(root):
+    return {path: path.stat().st_mtime_ns for path in Path(root).rglob("*") if path.is_file()}
+
+def run_case(name, input_dir):
+    """Child-process side: run one conversion and print its measurements as JSON."""
+    _, convert = CONVERTERS[name]
+    inputs = file_stamps(input_dir)
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time() + children_cpu_seconds()
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        convert(Path(input_dir))
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() + children_cpu_seconds() - cpu_start
+
+    # Every file created or rewritten by the conversion
+    output_bytes = sum(path.stat().st_size for path, stamp in file_stamps(input_dir).items()
+                       if inputs.get(path) != stamp)
+
+    print(json.dumps({"wallSeconds": wall, "cpuSeconds": cpu, "peakRssMb": peak_rss_mb(),
+                      "outputBytes": output_bytes}))
+
+def benchmark(name, rows, work_dir):
+    """Generate the input for one case, then time the conversion in a separate process."""
+    prepare, _ = CONVERTERS[name]
+    input_dir = Path(tempfile.mkdtemp(prefix=f"{name}-{rows}-", dir=work_dir))
+    prepare(input_dir, rows)
+
+    completed = subprocess.run(
+        [sys.executable, __file__, '--run-case', name, str(input_dir)],
+        capture_output=True, text=True
+    )
+    shutil.rmtree(input_dir)
+
+    if completed.returncode != 0:
+        return {"converter": name, "rows": rows, "error": completed.stderr.strip().splitlines()[-1]}
+
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result.update(converter=name, rows=rows,
+                  rowsPerSecond=rows / result["wallSeconds"] if result["wallSeconds"] else None)
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--converters', nargs='+', choices=sorted(CONVERTERS), default=sorted(CONVERTERS),
+                        help='Converters to benchmark (default: all)')
+    parser.add_argument('--sizes', nargs='+', type=float, default=[1e3, 1e4, 1e5],
+                        help='Input sizes in rows, e.g. 1e3 1e5 1e7 (default: 1e3 1e4 1e5)')
+    parser.add_argument('--json', type=Path, help='Also write the results to this JSON file')
+    parser.add_argument('--check', action='store_true',
+                        help='Only check that the quarterly daily converter writes the same files in every mode')
+    parser.add_argument('--run-case', nargs=2, metavar=('CONVERTER', 'INPUT_DIR'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        run_case(*args.run_case)
+        return
+
+    if args.check:
+        with tempfile.TemporaryDirectory(prefix="converter-check-") as work_dir:
+            problems = check_quarterly_modes(work_dir)
+        for problem in problems:
+            print(f"❌ {problem}")
+        if problems:
+            sys.exit(1)
+        print("✅ convert-quarterly-csv-with-daily.py writes the same files in every mode")
+        return
+
+    results = []
+    print(f"{'converter':<34} {'rows':>10} {'wall s':>9} {'cpu s':>9} {'rows/s':>12} {'peak MB':>9} {'out MB':>9}")
+
+    with tempfile.TemporaryDirectory(prefix="converter-bench-") as work_dir:
+        for name in args.converters:
+            for rows in (int(size) for size in args.sizes):
+                result = benchmark(name, rows, work_dir)
+                results.append(result)
+
+                if "error" in result:
+                    print(f"{name:<34} {rows:>10} ⚠️  {result['error']}")
+                else:
+                    print(f"{name:<34} {rows:>10} {result['wallSeconds']:>9.3f} {result['cpuSeconds']:>9.3f} "
+                          f"{result['rowsPerSecond']:>12,.0f} {result['peakRssMb']:>9.1f} "
+                          f"{result['outputBytes'] / (1024 * 1024):>9.2f}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"python": sys.version.split()[0], "jsonBackend": json_writer.BACKEND, "results": results}, f,
+                  indent=2, ensure_ascii=False)
+        print(f"\n✅ Saved results to: {args.json}")
+
+if __name__ == "__main__":
+    main()
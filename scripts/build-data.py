@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Build every generated data file with one command, rebuilding only what changed.
+
+Each converter is a node in build_nodes() with its command, the files it reads and the files
+it writes. A node depends on the nodes that write one of its inputs, so
+analyze-event-impact.py waits for the quarterly converter. Independent nodes run
+concurrently, sharing a budget of --jobs worker processes: every running node holds one
+slot, and the free slots are split between the nodes that start at the same time and
+whose converter takes --jobs itself (parallel nodes), which are passed their share so
+they do not each start a process per CPU. Two nodes may not write the same path; that is why
+convert-quarterly-csv.py and convert-quarterly-csv-v2.py, which rewrite
+banktransaksjoner-2019-2025.json like convert-quarterly-csv-with-daily.py, are not nodes.
+
+A node is rebuilt, make-style, when one of its outputs is missing, its command changed,
+or one of its inputs (including its script and the shared modules it imports) changed
+since its last successful build. Inputs whose size and mtime are unchanged are taken as
+unchanged; otherwise their content hash decides, so touching or re-copying a file does
+not trigger a rebuild. The input fingerprints are kept in scripts/.cache/build-data.json.
+
+Nodes whose source exports are missing (e.g. the /Users/gabrielboen/Downloads folders on
+another machine) are skipped, and their dependents use the outputs already in the tree.
+After the run a timing summary lists every node and the critical path: the chain of
+dependent nodes that took longest, and so bounds the wall time of a full rebuild.
+
+    python3 scripts/build-data.py
+    python3 scripts/build-data.py event-impact --force
+    python3 scripts/build-data.py --source quarterly=/path/to/csv-folder --jobs 4
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+
+from json_writer import write_json
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+BASE_DIR = SCRIPTS_DIR.parent
+DATA_DIR = BASE_DIR / "src" / "data"
+QUARTERLY_DIR = DATA_DIR / "quarterly"
+STATE_PATH = SCRIPTS_DIR / ".cache" / "build-data.json"
+STATE_VERSION = 1
+
+# Source exports outside the repo, the same defaults as the converters; override with --source NAME=PATH
+SOURCES = {
+    'quarterly': Path("/Users/gabrielboen/Downloads/Quarterly  Reports Bank Transaction 2019-2025"),
+    'aktorer': Path("/Users/gabrielboen/Downloads/2024 /LØKKA Området Aktørkartlegging 2024 - Sheet1.csv"),
+    'sammenligning': Path("/Users/gabrielboen/Downloads/EN SAMMENLIGNING-LØKKA-BJØRVIKA-SENTRUM-MAJORSTUEN-2024"),
+    'demografi': Path("/Users/gabrielboen/Downloads/Demografi 2017-2023"),
+}
+
+# Shared modules imported by the converters
+CONVERTER_MODULES = ('instrumentation.py', 'json_writer.py')
+
+def build_nodes(sources):
+    """The data build graph: one dict per node, with absolute input and output paths"""
+    nodes = [
+        {
+            'name': 'quarterly',
+            'script': 'convert-quarterly-csv-with-daily.py',
+            'args': ['--source', sources['quarterly'], '--output-dir', QUARTERLY_DIR, '--series'],
+            'inputs': [sources['quarterly'], 'quarterly_pipeline.py'],
+            'outputs': [QUARTERLY_DIR / "banktransaksjoner-2019-2025.json", QUARTERLY_DIR / "daily-transactions.json",
+                        QUARTERLY_DIR / "daily-series"],
+            'parallel': True,
+        },
+        {
+            'name': 'aktorer',
+            'script': 'convert-aktorer-csv.py',
+            'args': ['--source', sources['aktorer'], '--output', DATA_DIR / "aktorer" / "2024-arsrapport.json"],
+            'inputs': [sources['aktorer'], 'aktor_rows.py'],
+            'outputs': [DATA_DIR / "aktorer" / "2024-arsrapport.json"],
+        },
+        {
+            'name': 'sammenligning',
+            'script': 'convert-sammenligning-aktorer.py',
+            'args': ['--source-dir', sources['sammenligning'],
+                     '--output-dir', DATA_DIR / "aktorer" / "sammenligning-2024"],
+            'inputs': [sources['sammenligning'], 'aktor_rows.py'],
+            'outputs': [DATA_DIR / "aktorer" / "sammenligning-2024"],
+            'parallel': True,
+        },
+        {
+            'name': 'demografi',
+            'script': 'convert-demografi-csv.py',
+            'args': ['--source', sources['demografi'], '--output-dir', DATA_DIR / "demografi"],
+            'inputs': [sources['demografi']],
+            'outputs': [DATA_DIR / "demografi" / "demografi-2017-2023.json"],
+        },
+        {
+            'name': 'graph-registry',
+            'script': 'build-graph-registry.py',
+            'args': [],
+            'inputs': [DATA_DIR / "graphs" / "registry.json", BASE_DIR / "src" / "types" / "graphs.ts",
+                       BASE_DIR / "public" / "images" / "graphs"],
+            'outputs': [DATA_DIR / "graphs" / "registry.built.json"],
+        },
+        {
+            'name': 'event-impact',
+            'script': 'analyze-event-impact.py',
+            'args': [],
+            'inputs': [BASE_DIR / "public" / "data" / "aktiviteter-2024.json",
+                       QUARTERLY_DIR / "daily-transactions.json", 'quarterly_pipeline.py'],
+            'outputs': [QUARTERLY_DIR / "event-impact-2024.json"],
+        },
+    ]
+
+    for node in nodes:
+        # Bare file names are modules in scripts/; every node also depends on its own script
+        inputs = [SCRIPTS_DIR / node['script']] + [SCRIPTS_DIR / name for name in CONVERTER_MODULES]
+        inputs += [SCRIPTS_DIR / path if isinstance(path, str) else path for path in node['inputs']]
+        node['inputs'] = list(dict.fromkeys(inputs))
+        # Parallel nodes take --jobs; it is added per run (see run_node), so it is not part of the command
+        node.setdefault('parallel', False)
+        node['command'] = [sys.executable, str(SCRIPTS_DIR / node['script'])] + [str(arg) for arg in node['args']]
+    return nodes
+
+def contains(parent, path):
+    """True when path is parent or inside it"""
+    return path == parent or parent in path.parents
+
+def link_nodes(nodes):
+    """Set each node's 'deps' from the inputs other nodes write; raises ValueError on shared outputs or cycles"""
+    for node in nodes:
+        for other in nodes:
+            if other is node:
+                continue
+            for output in node['outputs']:
+                for other_output in other['outputs']:
+                    if contains(output, other_output) or contains(other_output, output):
+                        raise ValueError(f"{node['name']} and {other['name']} both write {other_output}")
+
+    for node in nodes:
+        node['deps'] = [
+            other['name'] for other in nodes
+            if other is not node and any(contains(output, path) or contains(path, output)
+                                         for output in other['outputs'] for path in node['inputs'])
+        ]
+
+    # Depth-first search for cycles
+    by_name = {node['name']: node for node in nodes}
+    state = {}
+
+    def visit(name, chain):
+        if state.get(name) == 'done':
+            return
+        if state.get(name) == 'visiting':
+            raise ValueError(f"Dependency cycle: {' -> '.join(chain + [name])}")
+        state[name] = 'visiting'
+        for dep in by_name[name]['deps']:
+            visit(dep, chain + [name])
+        state[name] = 'done'
+
+    for node in nodes:
+        visit(node['name'], [])
+
+def select_nodes(nodes, targets):
+    """The named nodes plus everything they depend on, in NODES order"""
+    by_name = {node['name']: node for node in nodes}
+    unknown = [target for target in targets if target not in by_name]
+    if unknown:
+        raise ValueError(f"Unknown node {', '.join(unknown)}; choose from {', '.join(by_name)}")
+
+    wanted = set()
+    stack = list(targets)
+    while stack:
+        name = stack.pop()
+        if name not in wanted:
+            wanted.add(name)
+            stack.extend(by_name[name]['deps'])
+    return [node for node in nodes if node['name'] in wanted]
+
+def iter_files(path):
+    """The files an input path stands for: itself, or every non-hidden file below a folder"""
+    if path.is_dir():
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+            for name in sorted(files):
+                if not name.startswith('.'):
+                    yield Path(root) / name
+    elif path.exists():
+        yield path
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def fingerprint(inputs, previous):
+    """Map each input file to [size, mtimeNs, sha256]; files with the size and mtime in previous are not hashed"""
+    fingerprints = {}
+    for input_path in inputs:
+        for path in iter_files(input_path):
+            stat = path.stat()
+            key = str(path)
+            known = previous.get(key)
+            if known is not None and known[:2] == [stat.st_size, stat.st_mtime_ns]:
+                fingerprints[key] = known
+            else:
+                fingerprints[key] = [stat.st_size, stat.st_mtime_ns, file_digest(path)]
+    return fingerprints
+
+def rebuild_reason(node, record, fingerprints):
+    """Why node needs building, or None when it is up to date"""
+    if record is None:
+        return "never built"
+    if record['command'] != node['command']:
+        return "command changed"
+    missing = [path for path in node['outputs'] if not path.exists()]
+    if missing:
+        return f"missing {missing[0].name}"
+    previous = record['inputs']
+    if fingerprints.keys() != previous.keys():
+        changed = sorted(fingerprints.keys() ^ previous.keys())
+        return f"{Path(changed[0]).name} added or removed"
+    for key, (_, _, digest) in fingerprints.items():
+        if previous[key][2] != digest:
+            return f"{Path(key).name} changed"
+    return None
+
+def share_slots(starting, free):
+    """Worker slots for the nodes starting now: one each, and the rest of free split between the parallel ones"""
+    slots = [1] * len(starting)
+    parallel = [index for index, node in enumerate(starting) if node['parallel']]
+    extra = free - len(starting)
+    for rank, index in enumerate(parallel):
+        slots[index] += extra // len(parallel) + (1 if rank < extra % len(parallel) else 0)
+    return slots
+
+def run_node(node, jobs=1):
+    """Worker: run a node's command, parallel nodes with --jobs jobs; returns (exit code, output, seconds)"""
+    command = node['command'] + (['--jobs', str(jobs)] if node['parallel'] else [])
+    start = time.perf_counter()
+    completed = subprocess.run(command, cwd=SCRIPTS_DIR, capture_output=True, text=True)
+    return completed.returncode, completed.stdout + completed.stderr, time.perf_counter() - start
+
+def load_state():
+    """The last successful build of each node, from STATE_PATH"""
+    try:
+        with open(STATE_PATH, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    return state.get('nodes', {}) if state.get('version') == STATE_VERSION else {}
+
+def build(nodes, jobs=1, force=False, dry_run=False, verbose=False):
+    """
+    Run the out-of-date nodes in dependency order, within a budget of jobs worker processes.
+
+    Returns {name: result} with each node's status ('built', 'up to date', 'failed',
+    'skipped' after a failed dependency, 'no source' when an input is missing, or
+    'would build' with dry_run), its reason and its run time in seconds.
+    """
+    state = load_state()
+    results = {}
+    pending = list(nodes)
+    ready = []
+    running = {}
+    started = time.perf_counter()
+
+    def finish(node, status, reason=None, seconds=0.0):
+        results[node['name']] = {'status': status, 'reason': reason, 'seconds': seconds,
+                                 'end': time.perf_counter() - started}
+        icon = {'built': '✅', 'up to date': '✓ ', 'would build': '🔨', 'failed': '❌'}.get(status, '⚠️ ')
+        detail = f" ({reason})" if reason else ""
+        timing = f" in {seconds:.2f} s" if status in ('built', 'failed') else ""
+        print(f"{icon} {node['name']}: {status}{detail}{timing}")
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        while pending or ready or running:
+            for node in list(pending):
+                dep_results = [results.get(dep) for dep in node['deps']]
+                if any(result is None for result in dep_results):
+                    continue
+                pending.remove(node)
+
+                if any(result['status'] in ('failed', 'skipped') for result in dep_results):
+                    finish(node, 'skipped', "a dependency failed")
+                    continue
+                missing = [path for path in node['inputs'] if not path.exists()]
+                if missing:
+                    finish(node, 'no source', f"{missing[0]} not found")
+                    continue
+                if dry_run and any(result['status'] == 'would build' for result in dep_results):
+                    finish(node, 'would build', "a dependency would be rebuilt")
+                    continue
+
+                record = state.get(node['name'])
+                fingerprints = fingerprint(node['inputs'], record['inputs'] if record else {})
+                reason = "--force" if force else rebuild_reason(node, record, fingerprints)
+                if reason is None:
+                    finish(node, 'up to date')
+                elif dry_run:
+                    finish(node, 'would build', reason)
+                else:
+                    ready.append((node, fingerprints, reason))
+
+            free = max(1, jobs) - sum(slots for _, _, slots in running.values())
+            # Start as many ready nodes as there are free slots, one slot each plus a share of the rest
+            starting, ready = ready[:max(0, free)], ready[max(0, free):]
+            shares = share_slots([node for node, _, _ in starting], free)
+            for (node, fingerprints, reason), slots in zip(starting, shares):
+                workers = f" with {slots} jobs" if node['parallel'] else ""
+                print(f"🔨 {node['name']}: building ({reason}){workers}...")
+                running[executor.submit(run_node, node, slots)] = (node, fingerprints, slots)
+
+            if not running:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                node, fingerprints, _ = running.pop(future)
+                returncode, output, seconds = future.result()
+                if verbose or returncode != 0:
+                    print('\n'.join(f"   │ {line}" for line in output.rstrip().splitlines()))
+                if returncode != 0:
+                    finish(node, 'failed', f"exit code {returncode}", seconds)
+                    continue
+
+                state[node['name']] = {
+                    'command': node['command'],
+                    'builtAt': datetime.now().isoformat(timespec='seconds'),
+                    'seconds': round(seconds, 3),
+                    'inputs': fingerprints
+                }
+                STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+                write_json(STATE_PATH, {'version': STATE_VERSION, 'nodes': state}, compact=True)
+                finish(node, 'built', seconds=seconds)
+
+    return results
+
+def critical_path(nodes, results):
+    """The chain of dependent nodes with the largest total run time; returns (names, seconds)"""
+    selected = {node['name']: node for node in nodes}
+    longest = {}
+
+    def finish_time(name):
+        if name not in longest:
+            deps = [dep for dep in selected[name]['deps'] if dep in selected]
+            best = max(deps, key=lambda dep: finish_time(dep)[1], default=None)
+            chain, seconds = finish_time(best) if best is not None else ([], 0.0)
+            longest[name] = (chain + [name], seconds + results[name]['seconds'])
+        return longest[name]
+
+    return max((finish_time(name) for name in selected), key=lambda item: item[1], default=([], 0.0))
+
+def print_summary(nodes, results, wall_seconds, jobs):
+    node_seconds = sum(result['seconds'] for result in results.values())
+    path, path_seconds = critical_path(nodes, results)
+    print(f"\n⏱️  build-data: {wall_seconds:.3f} s wall, {node_seconds:.3f} s in nodes ({jobs} jobs)")
+    for node in nodes:
+        result = results[node['name']]
+        print(f"   {node['name']:<28} {result['status']:<12} {result['seconds']:>9.3f} s")
+    if path_seconds > 0:
+        print(f"   Critical path: {' → '.join(path)} ({path_seconds:.3f} s)")
+
+def parse_source(value):
+    name, sep, path = value.partition('=')
+    if not sep or name not in SOURCES:
+        raise argparse.ArgumentTypeError(f"expected NAME=PATH with NAME one of {', '.join(SOURCES)}")
+    return name, Path(path).expanduser()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('targets', nargs='*', metavar='NODE',
+                        help='Nodes to build, with the nodes they depend on (default: all)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes shared by the nodes run at the same time (default: number of CPUs)')
+    parser.add_argument('--force', action='store_true', help='Rebuild the selected nodes even if up to date')
+    parser.add_argument('--dry-run', action='store_true', help='Only show which nodes would be rebuilt and why')
+    parser.add_argument('--source', type=parse_source, action='append', default=[], metavar='NAME=PATH',
+                        help=f"Source export to read instead of the default ({', '.join(SOURCES)})")
+    parser.add_argument('--list', action='store_true', help='List the nodes with their inputs and outputs')
+    parser.add_argument('--verbose', action='store_true', help='Print the output of every node run')
+    args = parser.parse_args()
+
+    nodes = build_nodes(dict(SOURCES, **dict(args.source)))
+    try:
+        link_nodes(nodes)
+        nodes = select_nodes(nodes, args.targets) if args.targets else nodes
+    except ValueError as error:
+        parser.error(str(error))
+
+    if args.list:
+        for node in nodes:
+            print(f"{node['name']}: {node['script']}" + (f" (after {', '.join(node['deps'])})" if node['deps'] else ""))
+            for path in node['inputs']:
+                print(f"   ← {path}")
+            for path in node['outputs']:
+                print(f"   → {path}")
+        return
+
+    start = time.perf_counter()
+    results = build(nodes, args.jobs, args.force, args.dry_run, args.verbose)
+    if not args.dry_run:
+        print_summary(nodes, results, time.perf_counter() - start, args.jobs)
+
+    if any(result['status'] == 'failed' for result in results.values()):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Validate the graph registry and build its lookup indexes for src/lib/graph-registry.ts.
+
+Reads src/data/graphs/registry.json, checks every entry against the Graph type in
+src/types/graphs.ts and scans public/images/graphs for the image files, then writes
+src/data/graphs/registry.built.json: the registry plus these indexes, as positions
+into its `graphs` list:
+
+    byId        id -> position
+    byCategory  category -> positions
+    byYear      year -> positions
+    byTag       tag -> positions
+    tokens      lower-cased word of a title or description -> positions
+    ngrams      every 1 to NGRAM_LENGTH character substring of those words -> the words
+
+so getGraphById is a dict lookup, the category/year/tag lookups return a stored list,
+and searchGraphs finds the words containing a query word through its rarest n-gram
+and only checks the graphs with those words. The built file also stores the SHA-256
+of registry.json as sourceHash; rerun after editing registry.json, graph-registry.ts
+falls back to indexing registry.json itself while the hashes differ.
+
+Entries that break the Graph type (missing fields, unknown category or type, duplicate
+ids) are errors and stop the build. Missing image files, unknown relatedGraphs ids and
+images in public/images/graphs that no entry uses are reported as warnings.
+
+    python3 scripts/build-graph-registry.py
+    python3 scripts/build-graph-registry.py --strict
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from json_writer import write_json
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+REGISTRY_PATH = BASE_DIR / "src" / "data" / "graphs" / "registry.json"
+BUILT_FILENAME = "registry.built.json"
+TYPES_PATH = BASE_DIR / "src" / "types" / "graphs.ts"
+PUBLIC_DIR = BASE_DIR / "public"
+IMAGES_SUBDIR = "images/graphs"
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.svg', '.webp'}
+# Responsive copies written by create-image-derivatives.py, not graphs of their own
+DERIVATIVE_PATTERN = re.compile(r'-\d+w\.(webp|avif)$')
+
+REQUIRED_FIELDS = ('id', 'title', 'path', 'category', 'type', 'altText')
+TOKEN_PATTERN = re.compile(r'\w+')
+# Longest substring in the ngrams index; graph-registry.ts uses the same value
+NGRAM_LENGTH = 3
+
+def union_members(types_source, type_name):
+    """The string literals of a TypeScript union, e.g. GraphCategory in src/types/graphs.ts"""
+    match = re.search(rf"export type {type_name}\s*=([^;]+);", types_source)
+    if match is None:
+        raise ValueError(f"{type_name} not found in {TYPES_PATH}")
+    return set(re.findall(r"'([^']+)'", match.group(1)))
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+def ngrams(token):
+    """The distinct substrings of token of 1 to NGRAM_LENGTH characters"""
+    return {token[start:start + length]
+            for length in range(1, NGRAM_LENGTH + 1)
+            for start in range(len(token) - length + 1)}
+
+def validate_graph(graph, categories, types):
+    """Return the problems that make an entry break the Graph type"""
+    problems = []
+    for field in REQUIRED_FIELDS:
+        if not isinstance(graph.get(field), str) or not graph[field].strip():
+            problems.append(f"missing or empty '{field}'")
+
+    if graph.get('category') not in categories:
+        problems.append(f"unknown category {graph.get('category')!r}")
+    if graph.get('type') not in types:
+        problems.append(f"unknown type {graph.get('type')!r}")
+    if 'year' in graph and not isinstance(graph['year'], int):
+        problems.append(f"year {graph['year']!r} is not a number")
+    if 'month' in graph and graph['month'] not in range(1, 13):
+        problems.append(f"month {graph['month']!r} is not 1-12")
+    for field in ('tags', 'dataSource', 'relatedGraphs'):
+        values = graph.get(field, [])
+        if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+            problems.append(f"'{field}' is not a list of strings")
+    if isinstance(graph.get('path'), str) and not graph['path'].startswith('/'):
+        problems.append(f"path {graph['path']!r} is not absolute (e.g. /images/graphs/...)")
+    return problems
+
+def scan_images(public_dir):
+    """Public URLs of the graph images under public/images/graphs"""
+    images_dir = public_dir / IMAGES_SUBDIR
+    if not images_dir.exists():
+        return set()
+    return {
+        '/' + path.relative_to(public_dir).as_posix()
+        for path in images_dir.rglob("*")
+        if path.suffix.lower() in IMAGE_EXTENSIONS and not DERIVATIVE_PATTERN.search(path.name)
+    }
+
+def build_indexes(graphs):
+    """Lookup indexes over graphs, as positions in registry order"""
+    by_category = defaultdict(list)
+    by_year = defaultdict(list)
+    by_tag = defaultdict(list)
+    tokens = defaultdict(list)
+
+    for position, graph in enumerate(graphs):
+        by_category[graph['category']].append(position)
+        if 'year' in graph:
+            by_year[str(graph['year'])].append(position)
+        for tag in dict.fromkeys(graph.get('tags', [])):
+            by_tag[tag].append(position)
+        for token in dict.fromkeys(tokenize(graph['title']) + tokenize(graph.get('description', ''))):
+            tokens[token].append(position)
+
+    by_ngram = defaultdict(list)
+    for token in sorted(tokens):
+        for ngram in ngrams(token):
+            by_ngram[ngram].append(token)
+
+    return {
+        'byId': {graph['id']: position for position, graph in enumerate(graphs)},
+        'byCategory': dict(by_category),
+        'byYear': dict(by_year),
+        'byTag': dict(by_tag),
+        'tokens': dict(sorted(tokens.items())),
+        'ngrams': dict(sorted(by_ngram.items()))
+    }
+
+def build_registry(registry, categories, types, images, source_hash=None):
+    """Validate the registry; returns (built registry or None, errors, warnings)"""
+    graphs = registry.get('graphs', [])
+    errors = []
+    warnings = []
+
+    seen = set()
+    for position, graph in enumerate(graphs):
+        label = graph.get('id') or f"graphs[{position}]"
+        errors.extend(f"{label}: {problem}" for problem in validate_graph(graph, categories, types))
+        if graph.get('id') in seen:
+            errors.append(f"{label}: duplicate id")
+        seen.add(graph.get('id'))
+
+    if errors:
+        return None, errors, warnings
+
+    registered = set()
+    for graph in graphs:
+        registered.add(graph['path'])
+        if graph['path'] not in images:
+            warnings.append(f"{graph['id']}: image {graph['path']} not found in public/")
+        for related in graph.get('relatedGraphs', []):
+            if related not in seen:
+                warnings.append(f"{graph['id']}: relatedGraphs has unknown id {related!r}")
+
+    unused = sorted(images - registered)
+    if unused:
+        warnings.append(f"{len(unused)} images in public/{IMAGES_SUBDIR} are not in the registry, e.g. {unused[0]}")
+
+    built = {
+        'sourceHash': source_hash,
+        'version': registry.get('version'),
+        'lastUpdated': registry.get('lastUpdated'),
+        'graphs': graphs,
+        'indexes': build_indexes(graphs)
+    }
+    return built, errors, warnings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--registry', type=Path, default=REGISTRY_PATH, help='Graph registry to validate and index')
+    parser.add_argument('--output', type=Path,
+                        help=f'Built registry to write (default: {BUILT_FILENAME} next to the registry)')
+    parser.add_argument('--public-dir', type=Path, default=PUBLIC_DIR, help='Folder the graph paths are relative to')
+    parser.add_argument('--strict', action='store_true', help='Treat warnings as errors')
+    args = parser.parse_args()
+
+    source = args.registry.read_bytes()
+    registry = json.loads(source)
+    types_source = TYPES_PATH.read_text(encoding='utf-8')
+    categories = union_members(types_source, 'GraphCategory')
+    types = union_members(types_source, 'GraphType')
+
+    built, errors, warnings = build_registry(registry, categories, types, scan_images(args.public_dir),
+                                             hashlib.sha256(source).hexdigest())
+
+    for warning in warnings:
+        print(f"⚠️  {warning}")
+    for error in errors:
+        print(f"❌ {error}")
+    if errors or (args.strict and warnings):
+        print(f"\n❌ Registry not built: {len(errors)} errors, {len(warnings)} warnings")
+        sys.exit(1)
+
+    output_path = args.output or args.registry.with_name(BUILT_FILENAME)
+    write_json(output_path, built)
+
+    indexes = built['indexes']
+    print(f"\n✅ Built registry with {len(built['graphs'])} graphs: {len(indexes['byCategory'])} categories, "
+          f"{len(indexes['byTag'])} tags, {len(indexes['tokens'])} search tokens, {len(indexes['ngrams'])} n-grams")
+    print(f"📁 Saved to: {output_path}")
+
+if __name__ == "__main__":
+    main()
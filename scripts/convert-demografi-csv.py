@@ -1,209 +1,558 @@
 #!/usr/bin/env python3
 """
 Convert demographic CSV files (2017-2023) to JSON format for Next.js integration
+
+Every dataset is described once in DATASETS: the file name prefix, the JSON keys and
+which area column holds which value. The loader scans SOURCE_DIR once to discover the
+years available for each dataset, reads the files concurrently and resolves the column
+positions from each header once, so any area or year range goes through the same code.
+
+Use --batch with several export folders (one or more areas each) to load every area once
+into a DemografiStore and write one JSON file per area plus cross-area comparison tables.
+Use --check with --batch to verify that every area file equals what the single-area loader
+builds from the same exports. Use --compact to write the JSON without whitespace; the batch
+store is always compact.
 """
 
+import argparse
 import csv
-import json
+import math
 import os
+import re
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from instrumentation import add_instrumentation_arguments, instrumented, stage
+from json_writer import write_json
+
 SOURCE_DIR = Path("/Users/gabrielboen/Downloads/Demografi 2017-2023")
 OUTPUT_DIR = Path("/Users/gabrielboen/natural-state-place-analysis-grunerlokka-main/src/data/demografi")
-
-def read_csv(filepath):
-    """Read CSV file and return data as list of dicts"""
+OUTPUT_FILENAME = "demografi-2017-2023.json"
+
+# Batch mode output, inside the --batch-output folder
+AREAS_SUBDIR = "areas"
+STORE_FILENAME = "demografi-store.json"
+COMPARISON_FILENAME = "demografi-comparison.json"
+
+# Area column to convert; None uses the only area in the files
+AREA = "Thorvald Meyers gate 40B (Område 1.14 km²)"
+
+# Per-year datasets, in output order. Each value is (JSON key, column template, type);
+# "{area}" in a column template is replaced by the area column name. "summable" marks
+# counts, whose per-year totals the comparison tables include; medians have none.
+DATASETS = (
+    {
+        "key": "ageDistribution",
+        "file": "Aldersfordeling",
+        "items": "ageGroups",
+        "category": "ageGroup",
+        "values": (("male", "Mann ({area})", int), ("female", "Kvinne ({area})", int)),
+        "description": "age distribution",
+        "summable": True,
+    },
+    {
+        "key": "householdTypes",
+        "file": "Antall husholdninger",
+        "items": "households",
+        "category": "type",
+        "values": (("count", "{area}", int),),
+        "description": "household types",
+        "summable": True,
+    },
+    {
+        "key": "incomeDistribution",
+        "file": "Inntektsfordeling",
+        "items": "incomeBrackets",
+        "category": "bracket",
+        "values": (("count", "{area}", float),),
+        "description": "income distribution",
+        "summable": True,
+    },
+    {
+        "key": "buildingTypes",
+        "file": "Antall hus",
+        "items": "buildings",
+        "category": "type",
+        "values": (("count", "{area}", int),),
+        "description": "building types",
+        "summable": True,
+    },
+    {
+        "key": "medianIncomeByHousehold",
+        "file": "Medianinntekt per husholdningstype",
+        "items": "medianIncomes",
+        "category": "householdType",
+        "values": (("medianIncome", "{area}", float),),
+        "description": "median income by household type",
+        "summable": False,
+    },
+)
+
+# One file covering all years, one row per year
+POPULATION_FILE = "Demografi over tid.csv"
+
+YEAR_FILE_PATTERN = re.compile(r'^(?P<name>.+) (?P<year>\d{4})\.csv$')
+AREA_NAME_PATTERN = re.compile(r'^(?P<name>.+?) \(Område (?P<size>.+)\)$')
+NON_AREA_COLUMNS = {"Category", "Trendline"}
+
+def read_rows(filepath):
+    """Read a CSV file and return (header, rows)"""
     with open(filepath, 'r', encoding='utf-8-sig') as f:
-        reader = csv.DictReader(f)
-        return list(reader)
-
-def convert_age_distribution():
-    """Convert age distribution files (2017-2023)"""
-    age_data = []
-
-    for year in range(2017, 2024):
-        filepath = SOURCE_DIR / f"Aldersfordeling {year}.csv"
-        data = read_csv(filepath)
-
-        age_groups = []
-        for row in data:
-            age_groups.append({
-                "ageGroup": row["Category"],
-                "male": int(row["Mann (Thorvald Meyers gate 40B (Område 1.14 km²))"]),
-                "female": int(row["Kvinne (Thorvald Meyers gate 40B (Område 1.14 km²))"])
-            })
-
-        age_data.append({
-            "year": year,
-            "ageGroups": age_groups
-        })
-
-    return age_data
-
-def convert_household_types():
-    """Convert household type files (2017-2023)"""
-    household_data = []
-
-    for year in range(2017, 2024):
-        filepath = SOURCE_DIR / f"Antall husholdninger {year}.csv"
-        data = read_csv(filepath)
-
-        households = []
-        for row in data:
-            households.append({
-                "type": row["Category"],
-                "count": int(row["Thorvald Meyers gate 40B (Område 1.14 km²)"])
-            })
-
-        household_data.append({
-            "year": year,
-            "households": households
-        })
-
-    return household_data
-
-def convert_income_distribution():
-    """Convert income distribution files (2017-2023)"""
-    income_data = []
-
-    for year in range(2017, 2024):
-        filepath = SOURCE_DIR / f"Inntektsfordeling {year}.csv"
-        data = read_csv(filepath)
-
-        income_brackets = []
-        for row in data:
-            income_brackets.append({
-                "bracket": row["Category"],
-                "count": float(row["Thorvald Meyers gate 40B (Område 1.14 km²)"])
-            })
-
-        income_data.append({
-            "year": year,
-            "incomeBrackets": income_brackets
-        })
-
-    return income_data
-
-def convert_building_types():
-    """Convert building type files (2017-2023)"""
-    building_data = []
-
-    for year in range(2017, 2024):
-        filepath = SOURCE_DIR / f"Antall hus {year}.csv"
-        data = read_csv(filepath)
-
-        buildings = []
-        for row in data:
-            buildings.append({
-                "type": row["Category"],
-                "count": int(row["Thorvald Meyers gate 40B (Område 1.14 km²)"])
-            })
-
-        building_data.append({
-            "year": year,
-            "buildings": buildings
-        })
-
-    return building_data
-
-def convert_population_over_time():
-    """Convert population over time summary"""
-    filepath = SOURCE_DIR / "Demografi over tid.csv"
-    data = read_csv(filepath)
-
-    population_data = []
-    for row in data:
-        population_data.append({
-            "year": int(row["Category"]),
-            "population": int(row["Thorvald Meyers gate 40B (Område 1.14 km²)"]),
-            "trendline": float(row["Trendline"])
-        })
-
-    return population_data
-
-def convert_median_income_by_household():
-    """Convert median income by household type (2015-2022)"""
-    median_income_data = []
-
-    # Note: Data available from 2015-2022
-    for year in range(2015, 2023):
-        filepath = SOURCE_DIR / f"Medianinntekt per husholdningstype {year}.csv"
-        if not filepath.exists():
+        reader = csv.reader(f)
+        header = next(reader, [])
+        return header, list(reader)
+
+def discover_files(source_dir):
+    """Scan source_dir once; returns {dataset file prefix: {year: path}}"""
+    found = {}
+    with os.scandir(source_dir) as entries:
+        for entry in entries:
+            match = YEAR_FILE_PATTERN.match(entry.name)
+            if match:
+                found.setdefault(match['name'], {})[int(match['year'])] = Path(entry.path)
+    return found
+
+def column_pattern(template):
+    """Regex matching a column template such as "Mann ({area})" and capturing the area"""
+    return re.compile('^' + re.escape(template).replace(re.escape('{area}'), '(?P<area>.+)') + '$')
+
+def header_areas(header, templates=("{area}",)):
+    """Area names found in a header, in column order, given the dataset's column templates"""
+    patterns = [column_pattern(template) for template in templates]
+    areas = []
+    for column in header:
+        if column in NON_AREA_COLUMNS:
             continue
+        for pattern in patterns:
+            match = pattern.match(column)
+            if match and match['area'] not in areas:
+                areas.append(match['area'])
+                break
+    return areas
+
+def parse_dataset_rows(header, rows, dataset, areas=None):
+    """
+    Turn one per-year file into {area: [item, ...]} for the given areas (default: all in the header).
+
+    Column positions are looked up once per file, not once per row.
+    """
+    category_index = header.index("Category")
+    result = {}
+
+    templates = [template for _, template, _ in dataset["values"]]
+    for area in areas if areas is not None else header_areas(header, templates):
+        indexes = [(key, header.index(template.format(area=area)), convert)
+                   for key, template, convert in dataset["values"]]
+
+        items = []
+        for row in rows:
+            item = {dataset["category"]: row[category_index]}
+            for key, index, convert in indexes:
+                item[key] = convert(row[index])
+            items.append(item)
+        result[area] = items
+
+    return result
+
+def parse_population_rows(header, rows, areas=None):
+    """Turn "Demografi over tid.csv" into {area: [{year, population, trendline}, ...]}"""
+    category_index = header.index("Category")
+    trendline_index = header.index("Trendline")
+    result = {}
+
+    for area in areas if areas is not None else header_areas(header):
+        area_index = header.index(area)
+        result[area] = [
+            {
+                "year": int(row[category_index]),
+                "population": int(row[area_index]),
+                "trendline": float(row[trendline_index])
+            }
+            for row in rows
+        ]
+
+    return result
+
+def load_sources(source_dirs, areas=None):
+    """
+    Load every dataset in one or more export folders.
+
+    Returns {dataset key: {year: {area: items}}} plus "populationOverTime": {area: rows}.
+    The files of all folders are read concurrently; each is read and parsed exactly once,
+    whatever the number of areas in it. An area may only come from one folder.
+    """
+    jobs = []
+    population_paths = []
+    for source_dir in map(Path, source_dirs):
+        discovered = discover_files(source_dir)
+        jobs.extend(
+            (dataset, year, path)
+            for dataset in DATASETS
+            for year, path in sorted(discovered.get(dataset["file"], {}).items())
+        )
+        if (source_dir / POPULATION_FILE).exists():
+            population_paths.append(source_dir / POPULATION_FILE)
+
+    loaded = {dataset["key"]: {} for dataset in DATASETS}
+    loaded["populationOverTime"] = {}
+
+    def merge(target, parsed, path):
+        for area, items in parsed.items():
+            if area in target:
+                raise ValueError(f"{area} in {path} was already loaded from another folder")
+            target[area] = items
+
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) + 4)) as executor:
+        populations = executor.map(read_rows, population_paths)
+        contents = executor.map(read_rows, [path for _, _, path in jobs])
+
+        for (dataset, year, path), (header, rows) in zip(jobs, contents):
+            merge(loaded[dataset["key"]].setdefault(year, {}), parse_dataset_rows(header, rows, dataset, areas), path)
+
+        for path, (header, rows) in zip(population_paths, populations):
+            merge(loaded["populationOverTime"], parse_population_rows(header, rows, areas), path)
+
+    return loaded
+
+def load_source(source_dir, areas=None):
+    """Load every dataset in source_dir; see load_sources"""
+    return load_sources([source_dir], areas)
+
+def resolve_area(loaded, source_dir, area=None):
+    """Return area, or the only area in the data loaded from source_dir when area is None"""
+    if area is not None:
+        return area
+
+    found = set(loaded["populationOverTime"])
+    for dataset in DATASETS:
+        for by_area in loaded[dataset["key"]].values():
+            found.update(by_area)
+    if len(found) != 1:
+        raise ValueError(f"Expected one area in {source_dir}, found {len(found)}; set AREA")
+    return found.pop()
+
+def area_metadata(area, years):
+    """Split "Thorvald Meyers gate 40B (Område 1.14 km²)" into the display name and size"""
+    match = AREA_NAME_PATTERN.match(area)
+    name, size = (match['name'], match['size']) if match else (area, None)
+    time_range = f"{min(years)}-{max(years)}" if years else ""
+
+    return {
+        "title": f"Demografi {time_range}",
+        "area": name,
+        "areaSize": size,
+        "timeRange": time_range,
+        "source": "Plaace.ai / SSB",
+        "generatedAt": "2025-11-18"
+    }
 
-        data = read_csv(filepath)
-
-        median_incomes = []
-        for row in data:
-            median_incomes.append({
-                "householdType": row["Category"],
-                "medianIncome": float(row["Thorvald Meyers gate 40B (Område 1.14 km²)"])
-            })
-
-        median_income_data.append({
-            "year": year,
-            "medianIncomes": median_incomes
-        })
-
-    return median_income_data
+def build_area_output(loaded, area):
+    """Build the demografi JSON structure for one area from load_source output"""
+    population_data = loaded["populationOverTime"].get(area, [])
+    output = {
+        "metadata": area_metadata(area, [row["year"] for row in population_data]),
+        "populationOverTime": population_data,
+    }
 
-def main():
+    for dataset in DATASETS:
+        output[dataset["key"]] = [
+            {"year": year, dataset["items"]: by_area[area]}
+            for year, by_area in sorted(loaded[dataset["key"]].items())
+            if area in by_area
+        ]
+
+    return output
+
+class DemografiStore:
+    """
+    Columnar store of many areas: one area × year × category array per dataset value.
+
+    Built once from load_sources output; per-area JSON (area_output) and the cross-area
+    comparison tables (comparison) are both read from the arrays, so adding areas does
+    not add CSV reads.
+
+    Each dataset is held twice. The grid has one cell per area, year and category:
+    categories in the order they are first seen across all areas, NaN where an area's
+    export has no such row, and the last row winning where a file repeats a category.
+    It feeds the comparison tables and the store file. The rows keep every area's files
+    as they are, one entry per CSV row in file order (repeated categories included),
+    with `spans` giving each area and year's slice; area_output reads these, so it
+    matches build_area_output row for row.
+    """
+
+    def __init__(self, loaded):
+        self.areas = []
+        seen = set()
+        for by_area in [loaded["populationOverTime"]] + [
+                by_area for dataset in DATASETS for _, by_area in sorted(loaded[dataset["key"]].items())]:
+            for area in by_area:
+                if area not in seen:
+                    seen.add(area)
+                    self.areas.append(area)
+        self.area_index = {area: i for i, area in enumerate(self.areas)}
+
+        self.tables = {dataset["key"]: self._fill_dataset(dataset, loaded[dataset["key"]]) for dataset in DATASETS}
+        self.population = self._fill_population(loaded["populationOverTime"])
+
+    def _fill_dataset(self, dataset, by_year):
+        years = sorted(by_year)
+        categories = {}
+        for year in years:
+            for items in by_year[year].values():
+                for item in items:
+                    categories.setdefault(item[dataset["category"]], len(categories))
+
+        size = len(self.areas) * len(years) * len(categories)
+        values = {key: array('d', [math.nan]) * size for key, _, _ in dataset["values"]}
+        rows = {"spans": array('q', [0]), "present": bytearray(), "categories": array('q'),
+                "values": {key: array('d') for key, _, _ in dataset["values"]}}
+
+        for a, area in enumerate(self.areas):
+            for y, year in enumerate(years):
+                base = (a * len(years) + y) * len(categories)
+                for item in by_year[year].get(area, ()):
+                    category = categories[item[dataset["category"]]]
+                    rows["categories"].append(category)
+                    for key, column in values.items():
+                        column[base + category] = item[key]
+                        rows["values"][key].append(item[key])
+                rows["spans"].append(len(rows["categories"]))
+                rows["present"].append(area in by_year[year])
+
+        return {"years": years, "categories": list(categories), "values": values, "rows": rows}
+
+    def _fill_population(self, by_area):
+        years = sorted({row["year"] for rows in by_area.values() for row in rows})
+        year_index = {year: i for i, year in enumerate(years)}
+        values = {key: array('d', [math.nan]) * (len(self.areas) * len(years)) for key in ("population", "trendline")}
+
+        for area, rows in by_area.items():
+            base = self.area_index[area] * len(years)
+            for row in rows:
+                for key, column in values.items():
+                    column[base + year_index[row["year"]]] = row[key]
+
+        # Each area's rows in file order, as for the datasets
+        rows = {"spans": array('q', [0]), "values": {key: array('d') for key in ("year", "population", "trendline")}}
+        for area in self.areas:
+            for row in by_area.get(area, ()):
+                for key, column in rows["values"].items():
+                    column.append(row[key])
+            rows["spans"].append(len(rows["values"]["year"]))
+
+        return {"years": years, "values": values, "rows": rows}
+
+    def _rows(self, key, area, y):
+        """(category, {value key: value}) for each CSV row of one area and year, in file order"""
+        table = self.tables[key]
+        rows = table["rows"]
+        span = self.area_index[area] * len(table["years"]) + y
+        columns = rows["values"].items()
+        for r in range(rows["spans"][span], rows["spans"][span + 1]):
+            yield table["categories"][rows["categories"][r]], {value_key: column[r] for value_key, column in columns}
+
+    def area_output(self, area):
+        """The demografi JSON structure for one area, as written by the single-area converter"""
+        rows = self.population["rows"]
+        a = self.area_index[area]
+        columns = rows["values"]
+        population_data = [
+            {
+                "year": int(columns["year"][r]),
+                "population": int(columns["population"][r]),
+                "trendline": columns["trendline"][r]
+            }
+            for r in range(rows["spans"][a], rows["spans"][a + 1])
+        ]
+        output = {
+            "metadata": area_metadata(area, [row["year"] for row in population_data]),
+            "populationOverTime": population_data,
+        }
+
+        for dataset in DATASETS:
+            converters = {key: convert for key, _, convert in dataset["values"]}
+            entries = []
+            table = self.tables[dataset["key"]]
+            for y, year in enumerate(table["years"]):
+                items = [
+                    dict({dataset["category"]: category},
+                         **{key: converters[key](value) for key, value in cell.items()})
+                    for category, cell in self._rows(dataset["key"], area, y)
+                ]
+                # Every year the area has a file for, as in build_area_output, even without rows
+                if table["rows"]["present"][self.area_index[area] * len(table["years"]) + y]:
+                    entries.append({"year": year, dataset["items"]: items})
+            output[dataset["key"]] = entries
+
+        return output
+
+    def comparison(self):
+        """
+        Cross-area tables: for every dataset value, each area's values per year and
+        category, plus each area's total per year for summable datasets. Missing cells are null.
+        """
+        def cell(value, convert=float):
+            return None if math.isnan(value) else convert(value)
+
+        names = [area_metadata(area, [])["area"] for area in self.areas]
+        population = self.population
+        width = len(population["years"])
+        tables = {
+            "metadata": {"areas": names, "source": "Plaace.ai / SSB"},
+            "populationOverTime": {
+                "years": population["years"],
+                "population": {
+                    name: [cell(value, int) for value in population["values"]["population"][i * width:(i + 1) * width]]
+                    for i, name in enumerate(names)
+                }
+            }
+        }
+
+        for dataset in DATASETS:
+            table = self.tables[dataset["key"]]
+            categories = len(table["categories"])
+            block = len(table["years"]) * categories
+            entry = {"years": table["years"], "categories": table["categories"]}
+            if dataset["summable"]:
+                entry["totals"] = {}
+
+            converters = {key: convert for key, _, convert in dataset["values"]}
+            for key, column in table["values"].items():
+                convert = converters[key]
+                per_area = {}
+                totals = {}
+                for i, name in enumerate(names):
+                    rows = [column[i * block + y * categories:i * block + (y + 1) * categories]
+                            for y in range(len(table["years"]))]
+                    per_area[name] = [[cell(value, convert) for value in row] for row in rows]
+                    if dataset["summable"]:
+                        totals[name] = [
+                            convert(math.fsum(value for value in row if not math.isnan(value)))
+                            if any(not math.isnan(value) for value in row) else None
+                            for row in rows
+                        ]
+                entry[key] = per_area
+                if dataset["summable"]:
+                    entry["totals"][key] = totals
+
+            tables[dataset["key"]] = entry
+
+        return tables
+
+    def to_json(self):
+        """The raw arrays with their dimensions; NaN is written as null"""
+        def column(values):
+            return [None if math.isnan(value) else value for value in values]
+
+        return {
+            "metadata": {"layout": "area-major: index = (area * years + year) * categories + category"},
+            "areas": self.areas,
+            "populationOverTime": {
+                "years": self.population["years"],
+                "values": {key: column(values) for key, values in self.population["values"].items()}
+            },
+            "datasets": {
+                key: {
+                    "years": table["years"],
+                    "categories": table["categories"],
+                    "values": {value_key: column(values) for value_key, values in table["values"].items()}
+                }
+                for key, table in self.tables.items()
+            }
+        }
+
+def area_slug(area):
+    """File name stem for an area, e.g. "thorvald-meyers-gate-40b" for Thorvald Meyers gate 40B (Område 1.14 km²)"""
+    return re.sub(r'\W+', '-', area_metadata(area, [])["area"].lower()).strip('-')
+
+def check_store(store, sources):
+    """Names of the areas whose area_output differs from build_area_output on the same sources"""
+    return [area for area in store.areas if store.area_output(area) != build_area_output(sources, area)]
+
+def convert_batch(source_dirs, output_dir, compact=False, check=False):
+    """Load many area exports into one DemografiStore and write per-area JSON plus comparison tables"""
+    output_dir = Path(output_dir)
+    (output_dir / AREAS_SUBDIR).mkdir(parents=True, exist_ok=True)
+
+    print(f"Loading {len(source_dirs)} export folders...")
+    with stage("read and parse"):
+        sources = load_sources(source_dirs)
+    with stage("build store"):
+        store = DemografiStore(sources)
+
+    if check:
+        with stage("check store"):
+            mismatched = check_store(store, sources)
+        if mismatched:
+            raise ValueError(f"Store output differs from the single-area converter for: {', '.join(mismatched)}")
+        print(f"✓ Store output matches the single-area converter for all {len(store.areas)} areas")
+
+    with stage("write areas"):
+        for area in store.areas:
+            output_file = output_dir / AREAS_SUBDIR / f"{area_slug(area)}.json"
+            write_json(output_file, store.area_output(area), compact)
+            print(f"  ✓ {area} -> {output_file.name}")
+
+    with stage("write comparison"):
+        write_json(output_dir / COMPARISON_FILENAME, store.comparison(), compact)
+
+    with stage("write store"):
+        write_json(output_dir / STORE_FILENAME, store.to_json(), compact=True)
+
+    print(f"\n✅ Converted {len(store.areas)} areas. Output saved to: {output_dir}")
+    return store
+
+def year_span(entries):
+    years = [entry["year"] for entry in entries]
+    return f" ({min(years)}-{max(years)})" if years else ""
+
+def main(argv=None):
     """Main conversion function"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--batch', nargs='+', type=Path, metavar='EXPORT_DIR',
+                        help='Convert every area in these export folders into one store, per-area JSON '
+                             'and comparison tables')
+    parser.add_argument('--batch-output', type=Path, default=OUTPUT_DIR / "omrader",
+                        help='Output folder for --batch (default: src/data/demografi/omrader)')
+    parser.add_argument('--check', action='store_true',
+                        help='With --batch, check that every area file equals the single-area converter output')
+    parser.add_argument('--source', type=Path, default=SOURCE_DIR,
+                        help='Export folder converted without --batch')
+    parser.add_argument('--output-dir', type=Path, default=OUTPUT_DIR,
+                        help=f'Folder for {OUTPUT_FILENAME} without --batch')
+    parser.add_argument('--compact', action='store_true', help='Write the JSON files without whitespace')
+    add_instrumentation_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if args.batch:
+        with instrumented("convert-demografi-csv", args):
+            convert_batch(args.batch, args.batch_output, args.compact, args.check)
+        return
+
     print("Converting demographic CSV files to JSON...")
 
     # Create output directory if it doesn't exist
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-
-    # Convert all data types
-    print("Converting age distribution...")
-    age_data = convert_age_distribution()
-
-    print("Converting household types...")
-    household_data = convert_household_types()
-
-    print("Converting income distribution...")
-    income_data = convert_income_distribution()
-
-    print("Converting building types...")
-    building_data = convert_building_types()
+    args.output_dir.mkdir(parents=True, exist_ok=True)
 
-    print("Converting population over time...")
-    population_data = convert_population_over_time()
-
-    print("Converting median income by household type...")
-    median_income_data = convert_median_income_by_household()
-
-    # Create consolidated output
-    output = {
-        "metadata": {
-            "title": "Demografi 2017-2023",
-            "area": "Thorvald Meyers gate 40B",
-            "areaSize": "1.14 km²",
-            "timeRange": "2017-2023",
-            "source": "Plaace.ai / SSB",
-            "generatedAt": "2025-11-18"
-        },
-        "populationOverTime": population_data,
-        "ageDistribution": age_data,
-        "householdTypes": household_data,
-        "incomeDistribution": income_data,
-        "buildingTypes": building_data,
-        "medianIncomeByHousehold": median_income_data
-    }
+    print(f"Loading {', '.join(dataset['description'] for dataset in DATASETS)} and population over time...")
+    with instrumented("convert-demografi-csv", args):
+        with stage("read and parse"):
+            loaded = load_source(args.source, None if AREA is None else [AREA])
+        with stage("build output"):
+            output = build_area_output(loaded, resolve_area(loaded, args.source, AREA))
 
-    # Write to JSON file
-    output_file = OUTPUT_DIR / "demografi-2017-2023.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
+        # Write to JSON file
+        output_file = args.output_dir / OUTPUT_FILENAME
+        with stage("write json"):
+            write_json(output_file, output, args.compact)
 
     print(f"\n✅ Conversion complete! Output saved to: {output_file}")
     print(f"\nData summary:")
-    print(f"  - Population data: {len(population_data)} years (2017-2023)")
-    print(f"  - Age distribution: {len(age_data)} years")
-    print(f"  - Household types: {len(household_data)} years")
-    print(f"  - Income distribution: {len(income_data)} years")
-    print(f"  - Building types: {len(building_data)} years")
-    print(f"  - Median income by household: {len(median_income_data)} years (2015-2022)")
+    print(f"  - Population data: {len(output['populationOverTime'])} years{year_span(output['populationOverTime'])}")
+    for dataset in DATASETS:
+        entries = output[dataset["key"]]
+        print(f"  - {dataset['description'].capitalize()}: {len(entries)} years{year_span(entries)}")
 
 if __name__ == "__main__":
     main()
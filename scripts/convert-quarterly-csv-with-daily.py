@@ -1,195 +1,992 @@
 #!/usr/bin/env python3
 """
 Convert quarterly CSV files from Plaace to JSON format with both quarterly summaries and daily data.
+
+This is the full quarterly pipeline: the reader, parser and aggregator stages come from
+quarterly_pipeline.py, and one pass over each CSV feeds every writer below.
+
+Use --stream for large multi-year / multi-area exports: daily rows are then written
+to daily-transactions.json as they are parsed instead of being collected in memory first.
+Use --jobs N to parse the CSV files in N worker processes; the output is identical to a serial run.
+Use --engine numpy to parse the amount columns as NumPy arrays instead of row by row (same output, faster).
+Converted files are cached by content hash (see --cache-dir), so unchanged quarters are not parsed again.
+Use --columnar to also write daily-transactions.bin, a compact typed-array version of the daily data
+with a per-quarter index in daily-transactions.index.json.
+Use --shards to also write one daily-transactions/Q{n}_{year}.json file per quarter plus an index.json
+listing each shard's size, date range and totals, so pages can load only the quarters they show.
+Use --aggregates to also write daily-aggregates.json with weekly, monthly, rolling 7/28-day and
+year-over-year series per category, so pages do not re-aggregate the daily points themselves.
+Use --series to also write daily-series/{year}.json with daily, weekly and monthly {date, amount}
+points of the daily totals plus an index.json, the real counterpart of the synthetic chart data.
+Use --compact to write daily-transactions.json, the shards, the aggregates and the series without whitespace
+(about a third smaller); JSON is written with orjson when installed (see json_writer.py).
 """
 
-import csv
+import argparse
+import hashlib
 import json
-from datetime import datetime
+import os
+import shutil
+import sys
+import tempfile
+import warnings
+from array import array
+from collections import deque
+from contextlib import ExitStack
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from itertools import repeat
 from pathlib import Path
 
-def parse_csv_file_with_daily(csv_path):
-    """Parse a single CSV file and return both totals and daily breakdown."""
-    daily_data = []
-    total_amount = 0
+from instrumentation import add_instrumentation_arguments, instrumented, stage
+from json_writer import atomic_open, dumps, temp_path, write_json
+from quarterly_pipeline import (
+    AMOUNT_COLUMNS, DEFAULT_OUTPUT_DIR, DEFAULT_SOURCE_DIR, PARSER_VERSION, SUMMARY_FILENAME,
+    aggregate_quarter, build_quarterly_entry, format_date, iter_daily_rows, parse_iso_date,
+    plan_quarter_files, read_csv_rows, save_quarterly_summaries,
+)
+
+try:
+    import numpy as np
+except ImportError:  # Only needed for --engine numpy
+    np = None
+
+# Per-file conversion results, reused while the source CSV is unchanged
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "quarterly-daily"
+CACHE_VERSION = 1
+
+DAILY_METADATA = {
+    "title": "Daily Bank Transaction Data by Quarter",
+    "description": "Daily breakdown of bank transactions by category (Handel, Mat og opplevelser, Tjenester)"
+}
+
+# Columns of daily-transactions.bin; formattedDate is derived from date on read
+COLUMNAR_FIELDS = ('date', 'handel', 'matOgOpplevelser', 'tjenester', 'total')
+COLUMNAR_EPOCH = date(1970, 1, 1)
+INT32_RANGE = range(-2**31, 2**31)
+
+# Series in daily-aggregates.json; amounts per category, summed over all rows of a day
+AGGREGATE_FIELDS = COLUMNAR_FIELDS[1:]
+ROLLING_WINDOWS = (7, 28)
+# Month-name dates seen in the exports, e.g. "December 25, 2021", tried after parse_iso_date
+FALLBACK_DATE_FORMATS = ('%B %d, %Y', '%b %d, %Y')
+
+def parse_amount_column(strings):
+    """Convert a string array of amounts in millions to NOK; empty or invalid cells become 0."""
+    try:
+        amounts = np.where(strings != '', strings, '0').astype(np.float64)
+    except ValueError:
+        # At least one malformed cell: fall back to per-cell parsing for this column only
+        amounts = np.zeros(len(strings), dtype=np.float64)
+        for i, value in enumerate(strings.tolist()):
+            if value:
+                try:
+                    amounts[i] = float(value)
+                except ValueError:
+                    pass
+    return amounts * 1_000_000
+
+# Columns read by the numpy engine: date (0), batch date (3) and the amounts
+DAILY_COLUMNS = (0, 3) + AMOUNT_COLUMNS
+DAILY_COLUMNS_DTYPE = [('date', object), ('batch_date', object),
+                       ('handel', np.float64), ('mat', np.float64), ('tjenester', np.float64)] if np else None
+
+def loadtxt_columns(csv_path, dtype):
+    """Read DAILY_COLUMNS with NumPy's C reader; raises ValueError on short rows or cells that do not fit dtype."""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', UserWarning)  # Header-only file
+        return np.loadtxt(csv_path, dtype=dtype, delimiter=',', quotechar='"', comments=None,
+                          skiprows=1, usecols=DAILY_COLUMNS, ndmin=1 if dtype is not str else 2,
+                          encoding='utf-8-sig')
+
+def load_string_columns(csv_path):
+    """
+    Read DAILY_COLUMNS as a 2-D string array, one row per CSV record.
+
+    Short rows are padded with empty strings, and rows with fewer than three
+    columns are dropped, as in iter_daily_rows.
+    """
+    try:
+        return loadtxt_columns(csv_path, str)
+    except ValueError:
+        pass
+
+    rows = []
+    for row in read_csv_rows(csv_path):
+        n = len(row)
+        if n < 3:
+            continue
+        rows.append([row[i] if n > i else '' for i in DAILY_COLUMNS])
 
-    with open(csv_path, 'r', encoding='utf-8-sig') as f:
-        reader = csv.reader(f)
-        header = next(reader)  # Skip header
+    return np.array(rows, dtype=str).reshape(len(rows), len(DAILY_COLUMNS))
 
-        for row in reader:
-            if len(row) < 3:
-                continue
+def read_daily_arrays(csv_path):
+    """
+    Read a CSV file into column arrays for the numpy engine.
 
-            try:
-                # Extract date from column 0 or 3
-                date_str = row[3] if len(row) > 3 and row[3] else row[0]
-
-                # Parse amounts from columns 2, 5, 8
-                handel = 0
-                mat = 0
-                tjenester = 0
-
-                if len(row) > 2 and row[2]:
-                    try:
-                        handel = float(row[2]) * 1_000_000  # Convert millions to NOK
-                    except ValueError:
-                        pass
-
-                if len(row) > 5 and row[5]:
-                    try:
-                        mat = float(row[5]) * 1_000_000
-                    except ValueError:
-                        pass
-
-                if len(row) > 8 and row[8]:
-                    try:
-                        tjenester = float(row[8]) * 1_000_000
-                    except ValueError:
-                        pass
-
-                daily_total = handel + mat + tjenester
-
-                if daily_total > 0:
-                    # Parse date
-                    try:
-                        # Date format from CSV: "2019-01-01"
-                        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                        formatted_date = date_obj.strftime('%b %d, %Y')
-                    except:
-                        formatted_date = date_str
-
-                    daily_data.append({
-                        'date': date_str,
-                        'handel': int(handel),
-                        'matOgOpplevelser': int(mat),
-                        'tjenester': int(tjenester),
-                        'total': int(daily_total),
-                        'formattedDate': formatted_date
-                    })
-
-                    total_amount += daily_total
-
-            except (ValueError, IndexError) as e:
-                continue
+    Returns the date strings and the Handel / Mat og opplevelser / Tjenester / total
+    amounts in NOK for the rows with a positive total, in file order.
+    """
+    try:
+        # Fast path: every row is complete and every amount is a number
+        table = loadtxt_columns(csv_path, DAILY_COLUMNS_DTYPE)
+        columns = [table[name] for name in ('date', 'batch_date')]
+        handel, mat, tjenester = (table[name] * 1_000_000 for name in ('handel', 'mat', 'tjenester'))
+    except ValueError:
+        # Blank, invalid or missing cells: read strings and parse each column leniently
+        table = load_string_columns(csv_path)
+        columns = [table[:, 0], table[:, 1]]
+        handel, mat, tjenester = (parse_amount_column(table[:, i]) for i in range(2, 5))
+
+    # Date from column 3, falling back to column 0
+    dates = np.where(columns[1] != '', columns[1], columns[0])
+    total = handel + mat + tjenester
+
+    keep = total > 0
+    return dates[keep].tolist(), handel[keep], mat[keep], tjenester[keep], total[keep]
+
+def sum_in_order(values):
+    """Sum a float array left to right, matching a Python accumulation loop bit for bit."""
+    # np.sum uses pairwise summation, which can differ in the last bits; cumsum does not
+    return float(np.cumsum(values)[-1]) if len(values) else 0
+
+def build_daily_entries(dates, handel, mat, tjenester, total):
+    """Build the daily entry dicts from the arrays returned by read_daily_arrays."""
+    return [
+        {
+            'date': date_str,
+            'handel': h,
+            'matOgOpplevelser': m,
+            'tjenester': t,
+            'total': day_total,
+            'formattedDate': format_date(date_str)
+        }
+        for date_str, h, m, t, day_total in zip(
+            dates,
+            handel.astype(np.int64).tolist(),
+            mat.astype(np.int64).tolist(),
+            tjenester.astype(np.int64).tolist(),
+            total.astype(np.int64).tolist(),
+        )
+    ]
+
+def iter_daily_rows_numpy(csv_path):
+    """Numpy-engine counterpart of iter_daily_rows: same (entry, daily_total) pairs, parsed in bulk."""
+    dates, handel, mat, tjenester, total = read_daily_arrays(csv_path)
+    entries = build_daily_entries(dates, handel, mat, tjenester, total)
+    return zip(entries, total.tolist())
+
+def parse_csv_file_with_daily_numpy(csv_path):
+    """Numpy-engine counterpart of parse_csv_file_with_daily."""
+    dates, handel, mat, tjenester, total = read_daily_arrays(csv_path)
+    daily_data = build_daily_entries(dates, handel, mat, tjenester, total)
 
     return {
         'daily_data': daily_data,
-        'total_nok': int(total_amount),
+        'total_nok': int(sum_in_order(total)),
         'day_count': len(daily_data)
     }
 
-def extract_quarter_info(filename):
-    """Extract year and quarter from filename."""
-    if not filename.endswith('.csv'):
-        return None, None
+ROW_ITERATORS = {
+    'python': iter_daily_rows,
+    'numpy': iter_daily_rows_numpy,
+}
 
-    parts = filename.split(' - ')
-    if len(parts) < 2:
-        return None, None
-
-    start_date = parts[0]
+def parse_csv_file_with_daily(csv_path, engine='python'):
+    """Parse a single CSV file and return both totals and daily breakdown."""
+    if engine == 'numpy':
+        return parse_csv_file_with_daily_numpy(csv_path)
+
+    return aggregate_quarter(iter_daily_rows(csv_path))
+
+class DailyJSONStreamWriter:
+    """
+    Incrementally write the daily-transactions.json structure.
+
+    The output is byte-for-byte what json.dump(..., indent=2, ensure_ascii=False)
+    produces for the same data, but only one daily entry is held in memory at a time.
+    It is written to a temporary file that replaces path only when the block completes,
+    so a failed run leaves the previous file intact.
+    """
+
+    def __init__(self, path, metadata):
+        self.path = path
+        self.metadata = metadata
+        self.f = None
+        self.quarter_count = 0
+        self.row_count = 0
+
+    def __enter__(self):
+        self.f = open(temp_path(self.path), 'w', encoding='utf-8')
+        metadata_json = dumps(self.metadata).replace('\n', '\n  ')
+        self.f.write('{\n  "metadata": ' + metadata_json + ',\n  "quarters": {')
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        tmp_path = Path(self.f.name)
+        try:
+            if exc_type is None:
+                self.f.write('\n  }\n}' if self.quarter_count else '}\n}')
+                self.f.close()
+                os.replace(tmp_path, self.path)
+        finally:
+            # No-op after a successful rename
+            self.f.close()
+            tmp_path.unlink(missing_ok=True)
+        return False
+
+    def _begin_quarter(self, quarter_key):
+        prefix = ',\n    ' if self.quarter_count else '\n    '
+        self.f.write(prefix + dumps(quarter_key) + ': [')
+        self.quarter_count += 1
+
+    def _end_quarter(self, count):
+        self.f.write('\n    ]' if count else ']')
+        self.row_count += count
+
+    def write_quarter(self, quarter_key, entries):
+        """Write one quarter from an iterable of daily entries; returns the number of entries written."""
+        self._begin_quarter(quarter_key)
+        count = write_entries(self.f, entries)
+        self._end_quarter(count)
+        return count
+
+    def write_quarter_fragment(self, quarter_key, fragment_path, count):
+        """Write one quarter whose entries were already rendered by write_entries into fragment_path."""
+        self._begin_quarter(quarter_key)
+        with open(fragment_path, 'r', encoding='utf-8') as fragment:
+            shutil.copyfileobj(fragment, self.f)
+        self._end_quarter(count)
+
+def write_entries(f, entries):
+    """Write daily entries as the body of an indented JSON list; returns the number written."""
+    count = 0
+    for entry in entries:
+        entry_json = dumps(entry).replace('\n', '\n      ')
+        f.write((',\n      ' if count else '\n      ') + entry_json)
+        count += 1
+    return count
+
+class DailyColumnarWriter:
+    """
+    Write the daily data as little-endian typed arrays plus a JSON index.
+
+    Each quarter is stored as one array per field in COLUMNAR_FIELDS: dates as days
+    since 1970-01-01 and amounts in NOK, int32 unless a value needs int64. The index
+    gives every array's byte offset and dtype, so a reader can load a single quarter
+    with a ranged read and view it directly as an Int32Array / BigInt64Array. Dates
+    that are not ISO formatted are kept verbatim in the quarter's "rawDates", keyed by
+    row number. Like the JSON stream, the binary file is written to a temporary file
+    and only renamed into place (and indexed) when the block completes.
+    """
+
+    def __init__(self, bin_path, index_path, metadata):
+        self.bin_path = bin_path
+        self.index_path = index_path
+        self.metadata = metadata
+        self.f = None
+        self.offset = 0
+        self.quarters = {}
+
+    def __enter__(self):
+        self.f = open(temp_path(self.bin_path), 'wb')
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        tmp_path = Path(self.f.name)
+        try:
+            self.f.close()
+            if exc_type is None:
+                os.replace(tmp_path, self.bin_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        if exc_type is None:
+            index = {
+                "metadata": dict(self.metadata, byteOrder="little", dateEncoding="days since 1970-01-01",
+                                 fields=list(COLUMNAR_FIELDS)),
+                "quarters": self.quarters
+            }
+            write_json(self.index_path, index)
+        return False
+
+    def _write_array(self, values):
+        typecode, dtype = ('i', 'int32') if all(v in INT32_RANGE for v in values) else ('q', 'int64')
+        data = array(typecode, values)
+        if sys.byteorder != 'little':
+            data.byteswap()
+
+        # Typed array views need offsets aligned to their element size
+        padding = -self.offset % 8
+        self.f.write(b'\0' * padding)
+        self.offset += padding
+
+        column = {"offset": self.offset, "dtype": dtype}
+        self.f.write(data.tobytes())
+        self.offset += len(data) * data.itemsize
+        return column
+
+    def write_quarter(self, quarter_key, entries):
+        """Write one quarter from an iterable of daily entries; returns the number of entries written."""
+        values = {field: [] for field in COLUMNAR_FIELDS}
+        raw_dates = {}
+        for i, entry in enumerate(entries):
+            day_number = date_to_day_number(entry['date'])
+            if day_number is None:
+                raw_dates[str(i)] = entry['date']
+                day_number = 0
+            values['date'].append(day_number)
+            for field in COLUMNAR_FIELDS[1:]:
+                values[field].append(entry[field])
+
+        days = len(values['date'])
+        self.quarters[quarter_key] = {
+            "days": days,
+            "columns": {field: self._write_array(values[field]) for field in COLUMNAR_FIELDS}
+        }
+        if raw_dates:
+            self.quarters[quarter_key]["rawDates"] = raw_dates
+        return days
+
+@lru_cache(maxsize=8192)
+def date_to_day_number(date_str):
+    """Encode an ISO date ("2019-01-01") as days since 1970-01-01, or return None for any other format."""
+    if len(date_str) != 10 or date_str[4] != '-' or date_str[7] != '-':
+        return None
     try:
-        date_parts = start_date.split('-')
-        day = int(date_parts[0])
-        month = int(date_parts[1])
-        year = int(date_parts[2])
-
-        if month <= 3:
-            quarter = 1
-        elif month <= 6:
-            quarter = 2
-        elif month <= 9:
-            quarter = 3
+        day = date.fromisoformat(date_str)
+    except ValueError:
+        return None
+    return (day - COLUMNAR_EPOCH).days
+
+def read_columnar_quarter(bin_path, index, quarter_key):
+    """Read one quarter from daily-transactions.bin back into daily entry dicts."""
+    quarter = index['quarters'][quarter_key]
+    columns = {}
+
+    with open(bin_path, 'rb') as f:
+        for field, column in quarter['columns'].items():
+            data = array('i' if column['dtype'] == 'int32' else 'q')
+            f.seek(column['offset'])
+            data.frombytes(f.read(quarter['days'] * data.itemsize))
+            if sys.byteorder != 'little':
+                data.byteswap()
+            columns[field] = data.tolist()
+
+    raw_dates = quarter.get('rawDates', {})
+    iso_dates = {}
+    entries = []
+    for i, day_number in enumerate(columns['date']):
+        date_str = raw_dates.get(str(i)) or iso_dates.get(day_number)
+        if not date_str:
+            date_str = iso_dates[day_number] = date.fromordinal(COLUMNAR_EPOCH.toordinal() + day_number).isoformat()
+        entry = {'date': date_str}
+        entry.update((field, columns[field][i]) for field in COLUMNAR_FIELDS[1:])
+        entry['formattedDate'] = format_date(date_str)
+        entries.append(entry)
+    return entries
+
+class DailyShardWriter:
+    """
+    Write each quarter's daily entries to its own JSON file plus an index.json manifest.
+
+    A shard holds the same list as daily-transactions.json has under that quarter key.
+    The index lists every shard's file name, size in bytes, day count, date range and
+    category totals. Shards left over from earlier runs are removed on exit. With compact,
+    the shards are written without whitespace.
+    """
+
+    def __init__(self, shard_dir, metadata, compact=False):
+        self.shard_dir = shard_dir
+        self.metadata = metadata
+        self.compact = compact
+        self.quarters = {}
+
+    def __enter__(self):
+        self.shard_dir.mkdir(parents=True, exist_ok=True)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            written = {entry['file'] for entry in self.quarters.values()}
+            for shard_path in self.shard_dir.glob("Q*_*.json"):
+                if shard_path.name not in written:
+                    shard_path.unlink()
+
+            write_json(self.shard_dir / "index.json", {"metadata": self.metadata, "quarters": self.quarters})
+        return False
+
+    def write_quarter(self, quarter_key, entries):
+        """Write one quarter's shard from a list of daily entries; returns the number of entries written."""
+        shard_path = self.shard_dir / f"{quarter_key}.json"
+        shard_bytes = write_json(shard_path, entries, self.compact)
+
+        # Date range over ISO dates only; other formats do not sort chronologically
+        iso_dates = [entry['date'] for entry in entries if date_to_day_number(entry['date']) is not None]
+
+        self.quarters[quarter_key] = {
+            "file": shard_path.name,
+            "bytes": shard_bytes,
+            "days": len(entries),
+            "firstDate": min(iso_dates) if iso_dates else None,
+            "lastDate": max(iso_dates) if iso_dates else None,
+            "totals": {field: sum(entry[field] for entry in entries) for field in COLUMNAR_FIELDS[1:]}
+        }
+        return len(entries)
+
+def render_quarter_fragment(csv_file, fragment_path, engine='python'):
+    """Worker for --stream --jobs: render one file's entries to a fragment file and return its totals."""
+    total = 0
+    with atomic_open(fragment_path, 'w', encoding='utf-8') as f:
+        def entries():
+            nonlocal total
+            for entry, daily_total in ROW_ITERATORS[engine](csv_file):
+                total += daily_total
+                yield entry
+
+        count = write_entries(f, entries())
+
+    return int(total), count
+
+def read_fragment(fragment_path):
+    """Load the daily entries from a fragment written by write_entries."""
+    with open(fragment_path, 'r', encoding='utf-8') as f:
+        return json.loads('[' + f.read() + ']')
+
+def file_digest(path):
+    """Return the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ConversionCache:
+    """
+    Persistent record of converted CSV files.
+
+    manifest.json maps each source file to its content hash and quarter totals, and the
+    daily entries are stored next to it as write_entries fragments named by hash. A file
+    whose hash is unchanged is neither read nor parsed again. The manifest records
+    CACHE_VERSION and the parser's PARSER_VERSION, and is discarded when either changes.
+    Manifest and fragments are written atomically, so an interrupted run cannot leave a
+    truncated fragment behind that a later run would take for a cache hit.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.manifest_path = cache_dir / "manifest.json"
+        self.files = {}
+        self.hits = 0
+
+        if self.manifest_path.exists():
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') == CACHE_VERSION and manifest.get('parserVersion') == PARSER_VERSION:
+                self.files = manifest['files']
+
+    def fragment_path(self, digest):
+        return self.cache_dir / f"{digest}.json"
+
+    def lookup(self, csv_file, digest):
+        """Return (total_nok, day_count) if csv_file was converted with this content, otherwise None."""
+        entry = self.files.get(str(csv_file.resolve()))
+        if entry and entry['sha256'] == digest and self.fragment_path(digest).exists():
+            self.hits += 1
+            return entry['totalNok'], entry['dayCount']
+        return None
+
+    def store(self, csv_file, digest, total_nok, day_count):
+        self.files[str(csv_file.resolve())] = {
+            'sha256': digest,
+            'totalNok': total_nok,
+            'dayCount': day_count
+        }
+
+    def save(self, csv_files):
+        """Write the manifest, evicting entries and fragments for files not in csv_files."""
+        current = {str(csv_file.resolve()) for csv_file in csv_files}
+        self.files = {key: entry for key, entry in self.files.items() if key in current}
+
+        live = {entry['sha256'] for entry in self.files.values()}
+        for fragment_path in self.cache_dir.glob("*.json"):
+            if fragment_path != self.manifest_path and fragment_path.stem not in live:
+                fragment_path.unlink()
+
+        write_json(self.manifest_path, {'version': CACHE_VERSION, 'parserVersion': PARSER_VERSION, 'files': self.files})
+
+def map_files(func, csv_files, jobs, *extra_args):
+    """Apply func to each file, in a process pool when jobs > 1; results keep the input order."""
+    if jobs > 1 and len(csv_files) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            yield from executor.map(func, csv_files, *extra_args)
+    else:
+        yield from map(func, csv_files, *extra_args)
+
+def parse_files(csv_paths, jobs, engine, cache):
+    """Yield parse_csv_file_with_daily results in file order, reusing cached results for unchanged files."""
+    if cache is None:
+        yield from map_files(parse_csv_file_with_daily, csv_paths, jobs, repeat(engine))
+        return
+
+    digests = [file_digest(csv_file) for csv_file in csv_paths]
+    hits = [cache.lookup(csv_file, digest) for csv_file, digest in zip(csv_paths, digests)]
+    misses = map_files(parse_csv_file_with_daily,
+                       [csv_file for csv_file, hit in zip(csv_paths, hits) if hit is None],
+                       jobs, repeat(engine))
+
+    for csv_file, digest, hit in zip(csv_paths, digests, hits):
+        fragment_path = cache.fragment_path(digest)
+
+        if hit is None:
+            result = next(misses)
+            with atomic_open(fragment_path, 'w', encoding='utf-8') as f:
+                write_entries(f, result['daily_data'])
+            cache.store(csv_file, digest, result['total_nok'], result['day_count'])
         else:
-            quarter = 4
+            total_nok, day_count = hit
+            result = {
+                'daily_data': read_fragment(fragment_path),
+                'total_nok': total_nok,
+                'day_count': day_count
+            }
+
+        yield result
+
+def render_files(csv_paths, fragment_paths, jobs, engine, cache):
+    """
+    Render each file to a fragment and yield (fragment_path, total_nok, day_count) in file order.
+
+    With a cache the given fragment paths are not used: fragments live in the cache
+    folder and are only rendered for new or changed files.
+    """
+    if cache is None:
+        results = map_files(render_quarter_fragment, csv_paths, jobs, fragment_paths, repeat(engine))
+        for fragment_path, (total_nok, day_count) in zip(fragment_paths, results):
+            yield fragment_path, total_nok, day_count
+        return
+
+    digests = [file_digest(csv_file) for csv_file in csv_paths]
+    hits = [cache.lookup(csv_file, digest) for csv_file, digest in zip(csv_paths, digests)]
+
+    # Identical files share one fragment, so render each missing hash only once
+    pending = {}
+    for csv_file, digest, hit in zip(csv_paths, digests, hits):
+        if hit is None and digest not in pending:
+            pending[digest] = csv_file
+    rendered = map_files(render_quarter_fragment, list(pending.values()), jobs,
+                         [cache.fragment_path(digest) for digest in pending], repeat(engine))
+
+    results = {}
+    for csv_file, digest, hit in zip(csv_paths, digests, hits):
+        if hit is None:
+            if digest not in results:
+                results[digest] = next(rendered)
+            hit = results[digest]
+            cache.store(csv_file, digest, *hit)
+        yield (cache.fragment_path(digest),) + tuple(hit)
+
+@lru_cache(maxsize=8192)
+def parse_entry_date(date_str):
+    """
+    Parse a daily entry's date like the summaries do (parse_iso_date, so also "2019-3-2"),
+    or with one of FALLBACK_DATE_FORMATS; returns None if none matches.
+    """
+    day = parse_iso_date(date_str)
+    if day is not None:
+        return day
+    for date_format in FALLBACK_DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, date_format).date()
+        except ValueError:
+            pass
+    return None
+
+class DailyAggregateWriter:
+    """
+    Write weekly, monthly, rolling and year-over-year series of the daily data to one JSON file.
+
+    Quarters are folded into per-day sums as they arrive (rows sharing a date, e.g. from
+    multi-area exports, are added together), so only one small vector per calendar day is
+    held. On exit the days are walked once in date order to build every series:
+
+        weekly      sums per ISO week, keyed by its Monday
+        monthly     sums per calendar month, keyed by its first day
+        rolling7    trailing 7 and 28 calendar-day sums for every day with data,
+        rolling28   with the number of data days in the window
+        yoy         per month, the % change of each category against the same month a year earlier
+
+    Entries whose date cannot be parsed are counted in metadata.skippedEntries.
+    """
+
+    def __init__(self, aggregates_path, metadata, compact=False):
+        self.aggregates_path = aggregates_path
+        self.metadata = metadata
+        self.compact = compact
+        self.days = {}
+        self.skipped = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            write_json(self.aggregates_path, self.build(), self.compact)
+        return False
+
+    def write_quarter(self, quarter_key, entries):
+        """Add one quarter's daily entries to the per-day sums; returns the number of entries read."""
+        count = 0
+        for entry in entries:
+            count += 1
+            day = parse_entry_date(entry['date'])
+            if day is None:
+                self.skipped += 1
+                continue
 
-        return year, quarter
-    except (ValueError, IndexError):
-        return None, None
+            sums = self.days.get(day)
+            if sums is None:
+                sums = self.days[day] = [0] * len(AGGREGATE_FIELDS)
+            for i, field in enumerate(AGGREGATE_FIELDS):
+                sums[i] += entry[field]
+        return count
+
+    def build(self):
+        """Build every series in one pass over the days in date order."""
+        buckets = {'weekly': {}, 'monthly': {}}
+        windows = {size: deque() for size in ROLLING_WINDOWS}
+        window_sums = {size: [0] * len(AGGREGATE_FIELDS) for size in ROLLING_WINDOWS}
+        rolling = {size: [] for size in ROLLING_WINDOWS}
+
+        for day in sorted(self.days):
+            sums = self.days[day]
+
+            for name, key in (('weekly', day - timedelta(days=day.weekday())), ('monthly', day.replace(day=1))):
+                bucket = buckets[name].get(key)
+                if bucket is None:
+                    bucket = buckets[name][key] = [0, [0] * len(AGGREGATE_FIELDS)]
+                bucket[0] += 1
+                bucket[1] = [a + b for a, b in zip(bucket[1], sums)]
+
+            for size, window in windows.items():
+                window.append((day, sums))
+                window_sums[size] = [a + b for a, b in zip(window_sums[size], sums)]
+                # Drop days that fell out of the trailing window
+                while window[0][0] <= day - timedelta(days=size):
+                    _, old = window.popleft()
+                    window_sums[size] = [a - b for a, b in zip(window_sums[size], old)]
+                rolling[size].append(self.series_point(day, len(window), window_sums[size]))
+
+        monthly = buckets['monthly']
+        yoy = []
+        for month, (_, sums) in monthly.items():
+            previous = monthly.get(month.replace(year=month.year - 1))
+            if previous is None:
+                continue
+            point = {'date': month.isoformat(), 'previousDate': month.replace(year=month.year - 1).isoformat()}
+            for field, current, before in zip(AGGREGATE_FIELDS, sums, previous[1]):
+                point[field] = round((current - before) / before * 100, 2) if before else None
+            yoy.append(point)
+
+        aggregates = {
+            "metadata": dict(self.metadata, fields=list(AGGREGATE_FIELDS), rollingWindows=list(ROLLING_WINDOWS),
+                             days=len(self.days), skippedEntries=self.skipped),
+            "weekly": [self.series_point(key, days, sums) for key, (days, sums) in buckets['weekly'].items()],
+            "monthly": [self.series_point(key, days, sums) for key, (days, sums) in monthly.items()],
+        }
+        for size in ROLLING_WINDOWS:
+            aggregates[f"rolling{size}"] = rolling[size]
+        aggregates["yoy"] = yoy
+        return aggregates
+
+    @staticmethod
+    def series_point(day, days, sums):
+        point = {'date': day.isoformat(), 'days': days}
+        point.update(zip(AGGREGATE_FIELDS, sums))
+        return point
+
+class DailySeriesWriter(DailyAggregateWriter):
+    """
+    Write chart-ready {date, amount} series of the daily totals, one JSON file per year.
+
+    Each daily-series/{year}.json holds that year's daily, weekly and monthly points in
+    the DailyDataPoint shape the charts take (amount is the summed `total` of the day),
+    so a page loads only its year. Weeks are keyed by their Monday and months by their
+    first day, as aggregateToWeekly and aggregateToMonthly in
+    src/lib/synthetic-data-generator.ts do for one year of points; a week crossing New
+    Year is split between the two files. index.json lists every year's file, day count
+    and date range. Per-day sums are folded as in DailyAggregateWriter.
+    """
+
+    def __init__(self, series_dir, metadata, compact=False):
+        super().__init__(None, metadata, compact)
+        self.series_dir = series_dir
+
+    def __enter__(self):
+        self.series_dir.mkdir(parents=True, exist_ok=True)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            years = self.build_years()
+            for series_path in self.series_dir.glob("[0-9][0-9][0-9][0-9].json"):
+                if int(series_path.stem) not in years:
+                    series_path.unlink()
+
+            index = {}
+            for year, series in years.items():
+                series_path = self.series_dir / f"{year}.json"
+                index[str(year)] = {
+                    "file": series_path.name,
+                    "bytes": write_json(series_path, series, self.compact),
+                    "days": series['metadata']['days'],
+                    "firstDate": series['daily'][0]['date'],
+                    "lastDate": series['daily'][-1]['date']
+                }
+            write_json(self.series_dir / "index.json", {"metadata": self.metadata, "years": index})
+        return False
+
+    def build_years(self):
+        """Build the daily, weekly and monthly series of every year in one pass over the days in date order."""
+        total = AGGREGATE_FIELDS.index('total')
+        years = {}
+        for day in sorted(self.days):
+            series = years.get(day.year)
+            if series is None:
+                series = years[day.year] = {'daily': [], 'weekly': {}, 'monthly': {}}
+            amount = self.days[day][total]
+            series['daily'].append({'date': day.isoformat(), 'amount': amount})
+            for name, key in (('weekly', day - timedelta(days=day.weekday())), ('monthly', day.replace(day=1))):
+                series[name][key] = series[name].get(key, 0) + amount
+
+        return {
+            year: {
+                "metadata": dict(self.metadata, year=year, field='total', days=len(series['daily']),
+                                 skippedEntries=self.skipped),
+                "daily": series['daily'],
+                "weekly": [{'date': key.isoformat(), 'amount': amount} for key, amount in series['weekly'].items()],
+                "monthly": [{'date': key.isoformat(), 'amount': amount} for key, amount in series['monthly'].items()]
+            }
+            for year, series in years.items()
+        }
 
-def main():
-    downloads_path = Path("/Users/gabrielboen/Downloads/Quarterly  Reports Bank Transaction 2019-2025")
-    csv_files = [f for f in downloads_path.glob("*.csv")]
+def daily_metadata():
+    """Metadata block shared by daily-transactions.json and the optional outputs."""
+    return {
+        "title": DAILY_METADATA["title"],
+        "lastUpdated": datetime.now().strftime('%Y-%m-%d'),
+        "description": DAILY_METADATA["description"]
+    }
+
+def plan_unique_quarters(csv_files):
+    """
+    plan_quarter_files, keeping only the first file of each quarter.
 
-    print(f"Found {len(csv_files)} CSV files\n")
+    Later files for a quarter are skipped with a warning in both modes: a streamed
+    quarter cannot be replaced once written, so the in-memory mode does not replace it either.
+    """
+    planned = []
+    seen_keys = set()
+    for csv_file, year, quarter in plan_quarter_files(csv_files):
+        quarter_key = f"Q{quarter}_{year}"
+        if quarter_key in seen_keys:
+            print(f"Skipping: {csv_file.name}")
+            print(f"  ⚠️  {quarter_key} already converted from another file\n")
+            continue
+        seen_keys.add(quarter_key)
+        planned.append((csv_file, year, quarter))
+    return planned
 
-    # Store both quarterly summaries and daily data
+def convert_in_memory(csv_files, daily_output_path, jobs=1, engine='python', cache=None, extra_writers=(),
+                      compact=False):
+    """Parse every file into memory, then write daily-transactions.json in one go."""
     quarterly_summaries = []
     all_daily_data = {}
 
-    for csv_file in sorted(csv_files):
-        print(f"Processing: {csv_file.name}")
+    planned = plan_unique_quarters(csv_files)
+    results = parse_files([csv_file for csv_file, _, _ in planned], jobs, engine, cache)
 
-        year, quarter = extract_quarter_info(csv_file.name)
+    with stage("read and parse") as record:
+        record['rows'] = 0
+        for (csv_file, year, quarter), result in zip(planned, results):
+            print(f"Processing: {csv_file.name}")
 
-        if year is None or quarter is None:
-            print(f"  ⚠️  Could not determine quarter from filename\n")
-            continue
+            quarterly_summaries.append(build_quarterly_entry(year, quarter, result['total_nok'], result['day_count']))
+            record['rows'] += result['day_count']
 
-        result = parse_csv_file_with_daily(csv_file)
-
-        # Create quarterly summary
-        quarterly_entry = {
-            "year": year,
-            "quarter": quarter,
-            "quarterLabel": f"Q{quarter} {year}",
-            "amount": result['total_nok'],
-            "transactionCount": result['day_count'] * 1000,
-            "averageTransaction": int(result['total_nok'] / (result['day_count'] * 1000)) if result['day_count'] > 0 else 0,
-            "note": f"Parsed from CSV: {result['day_count']} days"
-        }
+            # Store daily data
+            quarter_key = f"Q{quarter}_{year}"
+            all_daily_data[quarter_key] = result['daily_data']
 
-        quarterly_summaries.append(quarterly_entry)
+            print(f"  ✓ Q{quarter} {year}: {result['total_nok'] / 1_000_000:.2f}M NOK ({result['day_count']} days)")
+            print()
 
-        # Store daily data
-        quarter_key = f"Q{quarter}_{year}"
-        all_daily_data[quarter_key] = result['daily_data']
+    daily_data_structure = {
+        "metadata": daily_metadata(),
+        "quarters": all_daily_data
+    }
 
-        print(f"  ✓ Q{quarter} {year}: {result['total_nok'] / 1_000_000:.2f}M NOK ({result['day_count']} days)")
-        print()
+    with stage("write daily json") as record:
+        write_json(daily_output_path, daily_data_structure, compact)
+        record['rows'] = sum(len(entries) for entries in all_daily_data.values())
 
-    # Sort quarterly data
-    quarterly_summaries.sort(key=lambda x: (x['year'], x['quarter']))
+    for extra_writer in extra_writers:
+        with stage(f"write {type(extra_writer).__name__}") as record, extra_writer:
+            record['rows'] = 0
+            for quarter_key, entries in all_daily_data.items():
+                record['rows'] += extra_writer.write_quarter(quarter_key, entries)
 
-    # Update quarterly summaries JSON
-    output_path = Path("/Users/gabrielboen/natural-state-place-analysis-grunerlokka-2025/src/data/quarterly/banktransaksjoner-2019-2025.json")
+    return quarterly_summaries
 
-    with open(output_path, 'r', encoding='utf-8') as f:
-        existing_data = json.load(f)
+def convert_streaming(csv_files, daily_output_path, jobs=1, engine='python', cache=None, extra_writers=()):
+    """
+    Parse and write each file row by row so memory stays bounded regardless of input size.
 
-    existing_dict = {(q['year'], q['quarter']): q for q in existing_data['data']}
+    With jobs > 1 each worker renders its quarter to a fragment file in a temporary
+    folder, and the fragments are concatenated in file order afterwards. With a cache
+    the fragments are kept in the cache folder instead. With extra writers (columnar,
+    shards) each fragment is also read back, one quarter at a time, for those writers.
+    """
+    quarterly_summaries = []
+    planned = plan_unique_quarters(csv_files)
+
+    # Reading, parsing and writing are interleaved, so they are timed as one stage
+    with stage("read, parse and write") as record, \
+            tempfile.TemporaryDirectory() as fragment_dir, \
+            DailyJSONStreamWriter(daily_output_path, daily_metadata()) as writer, \
+            ExitStack() as stack:
+        record['rows'] = 0
+        for extra_writer in extra_writers:
+            stack.enter_context(extra_writer)
+        csv_paths = [csv_file for csv_file, _, _ in planned]
+
+        if jobs > 1 or cache is not None or extra_writers:
+            fragment_paths = [Path(fragment_dir) / f"{i}.json" for i in range(len(planned))]
+            results = render_files(csv_paths, fragment_paths, jobs, engine, cache)
+        else:
+            results = (None for _ in planned)
 
-    for q in quarterly_summaries:
-        existing_dict[(q['year'], q['quarter'])] = q
+        for (csv_file, year, quarter), result in zip(planned, results):
+            print(f"Processing: {csv_file.name}")
+            quarter_key = f"Q{quarter}_{year}"
 
-    merged_data = list(existing_dict.values())
-    merged_data.sort(key=lambda x: (x['year'], x['quarter']))
+            if result is not None:
+                fragment_path, total_nok, day_count = result
+                writer.write_quarter_fragment(quarter_key, fragment_path, day_count)
+                if extra_writers:
+                    entries = read_fragment(fragment_path)
+                    for extra_writer in extra_writers:
+                        extra_writer.write_quarter(quarter_key, entries)
+                if cache is None:
+                    fragment_path.unlink()
+            else:
+                totals = {'total': 0}
 
-    existing_data['data'] = merged_data
-    existing_data['metadata']['lastUpdated'] = datetime.now().strftime('%Y-%m-%d')
+                def entries():
+                    for entry, daily_total in ROW_ITERATORS[engine](csv_file):
+                        totals['total'] += daily_total
+                        yield entry
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(existing_data, f, indent=2, ensure_ascii=False)
+                day_count = writer.write_quarter(quarter_key, entries())
+                total_nok = int(totals['total'])
 
-    print(f"✅ Saved quarterly summaries to: {output_path}")
+            quarterly_summaries.append(build_quarterly_entry(year, quarter, total_nok, day_count))
+            record['rows'] += day_count
 
-    # Save daily data separately
-    daily_output_path = Path("/Users/gabrielboen/natural-state-place-analysis-grunerlokka-2025/src/data/quarterly/daily-transactions.json")
+            print(f"  ✓ Q{quarter} {year}: {total_nok / 1_000_000:.2f}M NOK ({day_count} days)")
+            print()
 
-    daily_data_structure = {
-        "metadata": {
-            "title": "Daily Bank Transaction Data by Quarter",
-            "lastUpdated": datetime.now().strftime('%Y-%m-%d'),
-            "description": "Daily breakdown of bank transactions by category (Handel, Mat og opplevelser, Tjenester)"
-        },
-        "quarters": all_daily_data
-    }
+    return quarterly_summaries
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--source', type=Path, default=DEFAULT_SOURCE_DIR,
+                        help='Folder containing the quarterly CSV exports')
+    parser.add_argument('--output-dir', type=Path, default=DEFAULT_OUTPUT_DIR,
+                        help='Folder containing banktransaksjoner-2019-2025.json')
+    parser.add_argument('--stream', action='store_true',
+                        help='Write daily data incrementally with bounded memory')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Number of worker processes used to parse CSV files (default: 1)')
+    parser.add_argument('--engine', choices=sorted(ROW_ITERATORS), default='python',
+                        help='Row parser: "numpy" parses amount columns as arrays (requires NumPy)')
+    parser.add_argument('--cache-dir', type=Path, default=DEFAULT_CACHE_DIR,
+                        help='Folder for cached per-file results (default: scripts/.cache/quarterly-daily)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Parse every CSV file again and leave the cache untouched')
+    parser.add_argument('--columnar', action='store_true',
+                        help='Also write daily-transactions.bin and daily-transactions.index.json')
+    parser.add_argument('--shards', action='store_true',
+                        help='Also write one JSON file per quarter plus index.json to daily-transactions/')
+    parser.add_argument('--aggregates', action='store_true',
+                        help='Also write weekly, monthly, rolling and YoY series to daily-aggregates.json')
+    parser.add_argument('--series', action='store_true',
+                        help='Also write daily, weekly and monthly chart series per year to daily-series/')
+    parser.add_argument('--compact', action='store_true',
+                        help='Write the daily data, shards, aggregates and series without whitespace (not with --stream)')
+    add_instrumentation_arguments(parser)
+    args = parser.parse_args()
+
+    if args.engine == 'numpy' and np is None:
+        parser.error("--engine numpy requires NumPy (pip install numpy)")
+    if args.compact and args.stream:
+        parser.error("--compact cannot be combined with --stream, which writes indented JSON")
+
+    with instrumented("convert-quarterly-csv-with-daily", args):
+        csv_files = sorted(args.source.glob("*.csv"))
+
+        print(f"Found {len(csv_files)} CSV files\n")
+
+        daily_output_path = args.output_dir / "daily-transactions.json"
+
+        cache = None
+        if not args.no_cache:
+            args.cache_dir.mkdir(parents=True, exist_ok=True)
+            cache = ConversionCache(args.cache_dir)
+
+        # Optional outputs written alongside daily-transactions.json, one quarter at a time
+        extra_writers = []
+        if args.columnar:
+            extra_writers.append(DailyColumnarWriter(daily_output_path.with_suffix('.bin'),
+                                                     daily_output_path.with_suffix('.index.json'), daily_metadata()))
+        shard_dir = daily_output_path.with_suffix('')
+        if args.shards:
+            extra_writers.append(DailyShardWriter(shard_dir, daily_metadata(), args.compact))
+        aggregates_path = daily_output_path.with_name("daily-aggregates.json")
+        if args.aggregates:
+            extra_writers.append(DailyAggregateWriter(aggregates_path, daily_metadata(), args.compact))
+        series_dir = daily_output_path.with_name("daily-series")
+        if args.series:
+            extra_writers.append(DailySeriesWriter(series_dir, daily_metadata(), args.compact))
+
+        if args.stream:
+            quarterly_summaries = convert_streaming(csv_files, daily_output_path, args.jobs, args.engine, cache,
+                                                    extra_writers)
+        else:
+            quarterly_summaries = convert_in_memory(csv_files, daily_output_path, args.jobs, args.engine, cache,
+                                                    extra_writers, args.compact)
+
+        if cache is not None:
+            cache.save(csv_files)
+            print(f"♻️  Reused {cache.hits} unchanged files from cache: {args.cache_dir}\n")
+
+        # Sort quarterly data
+        quarterly_summaries.sort(key=lambda x: (x['year'], x['quarter']))
 
-    with open(daily_output_path, 'w', encoding='utf-8') as f:
-        json.dump(daily_data_structure, f, indent=2, ensure_ascii=False)
+        # Update quarterly summaries JSON
+        output_path = args.output_dir / SUMMARY_FILENAME
+        changed = save_quarterly_summaries(output_path, quarterly_summaries)
 
+    print(f"✅ Saved quarterly summaries to: {output_path} ({changed} quarters changed)")
     print(f"✅ Saved daily transaction data to: {daily_output_path}")
+    if args.columnar:
+        print(f"✅ Saved columnar daily data to: {daily_output_path.with_suffix('.bin')}")
+    if args.shards:
+        print(f"✅ Saved per-quarter shards to: {shard_dir}")
+    if args.aggregates:
+        print(f"✅ Saved weekly, monthly, rolling and YoY aggregates to: {aggregates_path}")
+    if args.series:
+        print(f"✅ Saved daily, weekly and monthly series per year to: {series_dir}")
 
     print(f"\n📊 Summary:")
     for q in quarterly_summaries:
@@ -1,66 +1,40 @@
 #!/usr/bin/env python3
-import csv
+"""
+Convert the Aktørkartlegging CSVs of several areas to one JSON file per area plus combined.json.
+
+Without arguments the four 2024 comparison areas below are converted. Use --manifest to
+convert any number of areas listed in a JSON file:
+
+    {
+      "sourceDir": "/path/to/csv-folder",
+      "outputDir": "/path/to/src/data/aktorer/some-comparison",
+      "areas": [
+        {"name": "Løkka", "key": "lokka", "csv": "Løkka.csv", "color": "#2D5F3F"},
+        ...
+      ]
+    }
+
+Relative "csv" paths are resolved against sourceDir (or the manifest's folder), and each
+area is written to outputDir/{key}.json unless it has its own "output". Areas are
+converted in --jobs worker processes; combined.json is the same as for a serial run.
+Use --compact to write the JSON files without whitespace.
+"""
+
+import argparse
 import json
-import re
+import os
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 
-def clean_value(value):
-    """Clean multiline values and extract main data"""
-    if not value:
-        return None
-    # Remove newlines and extra spaces
-    cleaned = ' '.join(value.split())
-    return cleaned.strip()
-
-def parse_omsetning(value):
-    """Extract NOK amount from omsetning field"""
-    if not value:
-        return 0
-    match = re.search(r'NOK\s+(\d+)\s+mill', value)
-    if match:
-        return int(match.group(1))
-    return 0
-
-def parse_percentage(value):
-    """Extract percentage from YoY or market share"""
-    if not value:
-        return 0.0
-    match = re.search(r'(-?\d+(?:\.\d+)?)\s*%', value)
-    if match:
-        return float(match.group(1))
-    return 0.0
-
-def parse_ansatte(value):
-    """Extract employee count"""
-    if not value:
-        return 0
-    match = re.search(r'^(\d+)', value)
-    if match:
-        return int(match.group(1))
-    return 0
+from aktor_rows import build_actor_indexes, read_aktor_rows
+from instrumentation import add_instrumentation_arguments, instrumented, stage
+from json_writer import write_json
 
 def process_csv(csv_path, area_name):
     """Process a single CSV file and return structured data"""
-    aktorer = []
-
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            aktor = {
-                'rank': clean_value(row['#']),
-                'navn': clean_value(row['Navn']),
-                'type': clean_value(row['Type']),
-                'adresse': clean_value(row['Adresse']),
-                'kommune': clean_value(row['Kommune']),
-                'omsetning': parse_omsetning(row['Omsetning']),
-                'omsetning_raw': clean_value(row['Omsetning']),
-                'yoy_vekst': parse_percentage(row['YoY-vekst']),
-                'ansatte': parse_ansatte(row['Ansatte']),
-                'ansatte_raw': clean_value(row['Ansatte']),
-                'markedsandel': parse_percentage(row['Markedsandel']),
-            }
-            aktorer.append(aktor)
+    aktorer = read_aktor_rows(csv_path)
 
     # Calculate statistics
     total_omsetning = sum(a['omsetning'] for a in aktorer)
@@ -88,6 +62,7 @@ def process_csv(csv_path, area_name):
         },
         'actors': aktorer,
         'categoryStats': category_stats,
+        'indexes': build_actor_indexes(aktorer),
     }
 
 # Define areas with their CSV paths and output paths
@@ -125,24 +100,43 @@ areas = [
     }
 ]
 
-# Process each area
-area_data = {}
-total_actors = 0
-total_revenue = 0
-total_employees = 0
-
-print("Prosesserer aktørdata for fire områder...\n")
-
-for area in areas:
-    print(f"📍 Behandler {area['name']}...")
+def load_manifest(manifest_path, output_dir=None):
+    """Read an area manifest and return (areas, output_base) with absolute paths"""
+    manifest_path = Path(manifest_path)
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    source_dir = manifest_path.parent / manifest.get('sourceDir', '.')
+    manifest_output = manifest_path.parent / manifest['outputDir'] if 'outputDir' in manifest else None
+    output_base = Path(output_dir) if output_dir else manifest_output
+    if output_base is None:
+        raise ValueError(f"{manifest_path} has no outputDir; pass --output-dir")
+
+    areas = []
+    for area in manifest['areas']:
+        missing = [field for field in ('name', 'key', 'csv') if field not in area]
+        if missing:
+            raise ValueError(f"Area {area.get('name', area)} in {manifest_path} is missing: {', '.join(missing)}")
+
+        areas.append({
+            'name': area['name'],
+            'key': area['key'],
+            'csv': source_dir / area['csv'],
+            'output': output_base / area['output'] if 'output' in area else output_base / f"{area['key']}.json",
+            'color': area.get('color', '#000000')
+        })
+
+    return areas, output_base
+
+def convert_area(area, compact=False):
+    """Worker: convert one area, write its JSON file and return the summary used in combined.json"""
     data = process_csv(area['csv'], area['name'])
 
     # Save individual JSON
-    with open(area['output'], 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    write_json(area['output'], data, compact)
 
-    # Store for combined file
-    area_data[area['key']] = {
+    # Only the summary goes back to the parent process, not the actor list
+    return {
         'displayName': area['name'],
         'color': area['color'],
         'totalActors': data['metadata']['totalActors'],
@@ -151,35 +145,110 @@ for area in areas:
         'categoryStats': data['categoryStats']
     }
 
-    total_actors += data['metadata']['totalActors']
-    total_revenue += data['metadata']['totalRevenue']
-    total_employees += data['metadata']['totalEmployees']
-
-    print(f"   ✓ {data['metadata']['totalActors']} aktører")
-    print(f"   ✓ {data['metadata']['totalRevenue']}M NOK omsetning")
-    print(f"   ✓ {data['metadata']['totalEmployees']} ansatte\n")
-
-# Create combined file
-combined = {
-    'metadata': {
-        'generated': '2024-12-31',
-        'source': 'Plaace.ai Aktørkartlegging',
-        'totalAreas': len(areas),
-        'totalActors': total_actors,
-        'totalRevenue': total_revenue,
-        'totalEmployees': total_employees
-    },
-    'areas': area_data
-}
-
-combined_path = output_base / 'combined.json'
-with open(combined_path, 'w', encoding='utf-8') as f:
-    json.dump(combined, f, ensure_ascii=False, indent=2)
-
-print("=" * 60)
-print("✅ FULLFØRT - Aktørdata konvertert til JSON")
-print("=" * 60)
-print(f"📊 Totalt: {total_actors} aktører på tvers av 4 områder")
-print(f"💰 Total omsetning: {total_revenue}M NOK")
-print(f"👥 Totalt ansatte: {total_employees}")
-print(f"\n📁 Filer lagret i: {output_base}")
+def map_areas(areas, jobs, compact=False):
+    """Yield convert_area results in area order, in a process pool when jobs > 1"""
+    if jobs > 1 and len(areas) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(areas))) as executor:
+            yield from executor.map(convert_area, areas, repeat(compact))
+    else:
+        yield from map(convert_area, areas, repeat(compact))
+
+def merge_category_stats(target, category_stats):
+    """Add one area's categoryStats into target"""
+    for type_key, stats in category_stats.items():
+        merged = target.setdefault(type_key, {'count': 0, 'omsetning': 0, 'ansatte': 0})
+        merged['count'] += stats['count']
+        merged['omsetning'] += stats['omsetning']
+        merged['ansatte'] += stats['ansatte']
+
+def convert_areas(areas, output_base, jobs=1, compact=False):
+    """Convert every area CSV, write the per-area files and combined.json, and return the combined data"""
+    output_base = Path(output_base)
+    output_base.mkdir(parents=True, exist_ok=True)
+
+    # Process each area
+    area_data = {}
+    category_stats = {}
+    total_actors = 0
+    total_revenue = 0
+    total_employees = 0
+
+    print(f"Prosesserer aktørdata for {len(areas)} områder...\n")
+
+    # Each area is read, parsed and written in one go (in a worker with jobs > 1)
+    with stage("convert areas") as record:
+        for area, summary in zip(areas, map_areas(areas, jobs, compact)):
+            print(f"📍 Behandler {area['name']}...")
+
+            # Store for combined file
+            area_data[area['key']] = summary
+            merge_category_stats(category_stats, summary['categoryStats'])
+
+            total_actors += summary['totalActors']
+            total_revenue += summary['totalRevenue']
+            total_employees += summary['totalEmployees']
+
+            print(f"   ✓ {summary['totalActors']} aktører")
+            print(f"   ✓ {summary['totalRevenue']}M NOK omsetning")
+            print(f"   ✓ {summary['totalEmployees']} ansatte\n")
+        record['rows'] = total_actors
+
+    # Create combined file
+    combined = {
+        'metadata': {
+            'generated': '2024-12-31',
+            'source': 'Plaace.ai Aktørkartlegging',
+            'totalAreas': len(areas),
+            'totalActors': total_actors,
+            'totalRevenue': total_revenue,
+            'totalEmployees': total_employees
+        },
+        'areas': area_data,
+        'categoryStats': category_stats
+    }
+
+    combined_path = output_base / 'combined.json'
+    with stage("write combined"):
+        write_json(combined_path, combined, compact)
+
+    print("=" * 60)
+    print("✅ FULLFØRT - Aktørdata konvertert til JSON")
+    print("=" * 60)
+    print(f"📊 Totalt: {total_actors} aktører på tvers av {len(areas)} områder")
+    print(f"💰 Total omsetning: {total_revenue}M NOK")
+    print(f"👥 Totalt ansatte: {total_employees}")
+    print(f"\n📁 Filer lagret i: {output_base}")
+
+    return combined
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--manifest', type=Path,
+                        help='JSON file listing the areas to convert (default: the four 2024 comparison areas)')
+    parser.add_argument('--source-dir', type=Path,
+                        help='Folder containing the four 2024 comparison CSVs (not with --manifest)')
+    parser.add_argument('--output-dir', type=Path,
+                        help='Folder for the per-area files and combined.json (overrides the manifest)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help='Number of areas converted in parallel (default: number of CPUs)')
+    parser.add_argument('--compact', action='store_true', help='Write the JSON files without whitespace')
+    add_instrumentation_arguments(parser)
+    args = parser.parse_args()
+
+    if args.manifest and args.source_dir:
+        parser.error("--source-dir cannot be combined with --manifest, which has its own sourceDir")
+
+    if args.manifest:
+        selected_areas, selected_output = load_manifest(args.manifest, args.output_dir)
+    else:
+        selected_areas, selected_output = areas, args.output_dir or output_base
+        if args.source_dir:
+            selected_areas = [dict(area, csv=args.source_dir / area['csv'].name) for area in selected_areas]
+        if args.output_dir:
+            selected_areas = [dict(area, output=args.output_dir / area['output'].name) for area in selected_areas]
+
+    with instrumented("convert-sammenligning-aktorer", args):
+        convert_areas(selected_areas, selected_output, args.jobs, args.compact)
+
+if __name__ == "__main__":
+    main()
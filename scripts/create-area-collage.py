@@ -1,81 +1,64 @@
 #!/usr/bin/env python3
 """
 Create a 2x2 collage of the 4 Oslo area images
+
+Without arguments this builds public/images/areas/sammenligning-collage.jpg. Use --spec
+with a JSON file holding a list of layouts (see image_pipeline.py) to build other grids,
+sizes and hero images. Rendered images are kept in the shared image cache, so outputs
+whose layout and input images are unchanged are skipped or copied from the cache; use
+--force to render them anyway.
 """
 
-from PIL import Image
-import os
+import argparse
+import json
+from pathlib import Path
 
-# Paths
-base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-areas_dir = os.path.join(base_dir, 'public', 'images', 'areas')
+from image_pipeline import DEFAULT_CACHE_DIR, DEFAULT_CACHE_MAX_BYTES, ImageCache, build_layouts
 
-# Input images (in order: top-left, top-right, bottom-left, bottom-right)
-images = [
-    'grunerlokka.jpg',  # Top-left
-    'bjørvika.jpg',     # Top-right
-    'sentrum.jpg',      # Bottom-left
-    'majorstuen.jpg'    # Bottom-right
+DEFAULT_LAYOUTS = [
+    {
+        "output": "public/images/areas/sammenligning-collage.jpg",
+        "source": "public/images/areas",
+        # Input images (in order: top-left, top-right, bottom-left, bottom-right)
+        "images": [
+            "grunerlokka.jpg",  # Top-left
+            "bjørvika.jpg",     # Top-right
+            "sentrum.jpg",      # Bottom-left
+            "majorstuen.jpg"    # Bottom-right
+        ],
+        "grid": [2, 2],
+        # Output dimensions (full 16:9 ratio), 960x540 per image
+        "size": [1920, 1080],
+        "quality": 90
+    }
 ]
 
-# Target dimensions for each quadrant (1920x1080 / 2 = 960x540 per image)
-target_width = 960
-target_height = 540
-
-# Output dimensions (full 16:9 ratio)
-output_width = 1920
-output_height = 1080
-
-print("Creating 2x2 collage of Oslo areas...")
-
-# Load and resize images
-image_objects = []
-for img_name in images:
-    img_path = os.path.join(areas_dir, img_name)
-    print(f"Loading {img_name}...")
-    img = Image.open(img_path)
-
-    # Resize to fit quadrant while maintaining aspect ratio (crop to fill)
-    img_ratio = img.width / img.height
-    target_ratio = target_width / target_height
-
-    if img_ratio > target_ratio:
-        # Image is wider, resize by height and crop width
-        new_height = target_height
-        new_width = int(new_height * img_ratio)
-        img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-        # Crop to center
-        left = (new_width - target_width) // 2
-        img = img.crop((left, 0, left + target_width, target_height))
-    else:
-        # Image is taller, resize by width and crop height
-        new_width = target_width
-        new_height = int(new_width / img_ratio)
-        img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-        # Crop to center
-        top = (new_height - target_height) // 2
-        img = img.crop((0, top, target_width, top + target_height))
-
-    image_objects.append(img)
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--spec', type=Path, help='JSON file with a list of layouts (default: the area collage)')
+    parser.add_argument('--jobs', type=int, help='Threads used to decode and resize tiles (default: Python default)')
+    parser.add_argument('--cache-dir', type=Path, default=DEFAULT_CACHE_DIR,
+                        help='Folder for the image cache (default: scripts/.cache/images)')
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_MAX_BYTES // 2**20,
+                        help='Evict least recently used cache entries above this many MB (default: %(default)s)')
+    parser.add_argument('--force', action='store_true', help='Render every layout even if unchanged')
+    args = parser.parse_args()
 
-# Create new image for collage
-collage = Image.new('RGB', (output_width, output_height))
+    layouts = DEFAULT_LAYOUTS
+    if args.spec:
+        with open(args.spec, 'r', encoding='utf-8') as f:
+            layouts = json.load(f)
 
-# Paste images in 2x2 grid
-print("Assembling collage...")
-collage.paste(image_objects[0], (0, 0))                          # Top-left: Grünerløkka
-collage.paste(image_objects[1], (target_width, 0))               # Top-right: Bjørvika
-collage.paste(image_objects[2], (0, target_height))              # Bottom-left: Sentrum
-collage.paste(image_objects[3], (target_width, target_height))   # Bottom-right: Majorstuen
+    print(f"Creating {len(layouts)} image layout(s)...")
+    cache = ImageCache(args.cache_dir, args.cache_size * 2**20)
+    built, skipped = build_layouts(layouts, args.jobs, cache, args.force)
 
-# Save collage
-output_path = os.path.join(areas_dir, 'sammenligning-collage.jpg')
-collage.save(output_path, 'JPEG', quality=90, optimize=True)
+    for output_path in built:
+        print(f"✓ Created: {output_path}")
+    for output_path in skipped:
+        print(f"♻️  Unchanged, skipped: {output_path}")
+    if cache.evicted:
+        print(f"🧹 Evicted {cache.evicted} old cache entries")
 
-print(f"✓ Collage created: {output_path}")
-print(f"  Dimensions: {output_width}x{output_height}")
-print(f"  Layout:")
-print(f"    Top-left: Grünerløkka")
-print(f"    Top-right: Bjørvika")
-print(f"    Bottom-left: Sentrum")
-print(f"    Bottom-right: Majorstuen")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Create responsive WebP/AVIF derivatives of the images in the graph registry.
+
+For every graph in src/data/graphs/registry.json whose image exists under public/, this
+writes {name}-{width}w.webp and .avif next to the image for each of DERIVATIVE_WIDTHS
+narrower than the original, and stores the original width/height plus the derivative
+list in the graph's metadata, so pages can build a srcset and reserve the right space.
+Derivatives of widths or formats that are no longer requested are deleted.
+Each derivative is kept in the shared image cache (see ImageCache in image_pipeline.py),
+keyed by the source contents, width, format and quality: an unchanged image costs a stat
+and a manifest lookup, a derivative that is cached but missing on disk is copied back,
+and only the rest is encoded, in --jobs worker processes.
+
+    python3 scripts/create-image-derivatives.py
+    python3 scripts/create-image-derivatives.py --widths 640 1280 --formats webp
+"""
+
+import argparse
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from PIL import features
+
+from image_pipeline import (
+    BASE_DIR, DEFAULT_CACHE_DIR, DEFAULT_CACHE_MAX_BYTES, PIPELINE_VERSION, ImageCache, build_derivatives,
+    derivative_path, derivative_widths
+)
+from json_writer import write_json
+
+REGISTRY_PATH = BASE_DIR / "src" / "data" / "graphs" / "registry.json"
+PUBLIC_DIR = BASE_DIR / "public"
+
+DERIVATIVE_WIDTHS = (640, 1280, 1920, 2560)
+# Encoder quality per format
+DERIVATIVE_QUALITIES = {'webp': 80, 'avif': 60}
+
+def public_url(path):
+    return '/' + path.relative_to(PUBLIC_DIR).as_posix()
+
+def plan_derivatives(cache, source_path, widths, qualities):
+    """Source dimensions and one (key, width, extension, quality, output path) per derivative."""
+    source = cache.source_info(source_path)
+    planned = []
+    for width in sorted(derivative_widths(source['width'], widths)):
+        for extension, quality in qualities.items():
+            key = cache.key('derivative', PIPELINE_VERSION, source['digest'], width, extension, quality)
+            planned.append((key, width, extension, quality, derivative_path(source_path, width, extension)))
+    return source, planned
+
+def stale_derivatives(source_path, planned):
+    """Derivatives of source_path on disk that the current widths and formats no longer produce"""
+    pattern = re.compile(rf"{re.escape(source_path.stem)}-\d+w\.({'|'.join(DERIVATIVE_QUALITIES)})")
+    current = {output_path for _, _, _, _, output_path in planned}
+    return [path for path in source_path.parent.iterdir()
+            if pattern.fullmatch(path.name) and path not in current]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--registry', type=Path, default=REGISTRY_PATH, help='Graph registry to walk and update')
+    parser.add_argument('--widths', nargs='+', type=int, default=list(DERIVATIVE_WIDTHS),
+                        help=f"Derivative widths in pixels (default: {' '.join(map(str, DERIVATIVE_WIDTHS))})")
+    parser.add_argument('--formats', nargs='+', choices=sorted(DERIVATIVE_QUALITIES),
+                        default=sorted(DERIVATIVE_QUALITIES), help='Derivative formats (default: avif webp)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help='Number of worker processes (default: number of CPUs)')
+    parser.add_argument('--cache-dir', type=Path, default=DEFAULT_CACHE_DIR,
+                        help='Folder for the image cache (default: scripts/.cache/images)')
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_MAX_BYTES // 2**20,
+                        help='Evict least recently used cache entries above this many MB (default: %(default)s)')
+    parser.add_argument('--force', action='store_true', help='Rebuild derivatives even if cached')
+    args = parser.parse_args()
+
+    qualities = {extension: DERIVATIVE_QUALITIES[extension] for extension in args.formats}
+    if 'avif' in qualities and not features.check('avif'):
+        print("⚠️  This Pillow build cannot write AVIF; only writing WebP")
+        del qualities['avif']
+
+    with open(args.registry, 'r', encoding='utf-8') as f:
+        registry = json.load(f)
+
+    cache = ImageCache(args.cache_dir, args.cache_size * 2**20)
+    plans = {}
+    pending = []
+    restored = 0
+
+    for graph in registry['graphs']:
+        source_path = PUBLIC_DIR / graph['path'].lstrip('/')
+        if not source_path.exists():
+            print(f"⚠️  {graph['id']}: {graph['path']} not found, skipped")
+            continue
+
+        source, planned = plan_derivatives(cache, source_path, args.widths, qualities)
+        plans[graph['id']] = (source, planned)
+
+        missing = []
+        for key, width, extension, quality, output_path in planned:
+            if args.force:
+                missing.append((key, width, extension, quality, output_path))
+            elif cache.output_current(output_path, key):
+                continue
+            elif cache.lookup(key) is not None and cache.materialize(key, output_path):
+                restored += 1
+            else:
+                missing.append((key, width, extension, quality, output_path))
+        if missing:
+            pending.append((source_path, missing))
+
+    print(f"Encoding {sum(len(missing) for _, missing in pending)} derivatives for {len(pending)} images "
+          f"({cache.hits} unchanged, {restored} restored from cache)...")
+
+    with ProcessPoolExecutor(max_workers=max(1, min(args.jobs, len(pending)))) as executor:
+        targets = [
+            [(width, extension, quality, cache.object_path(key, extension))
+             for key, width, extension, quality, _ in missing]
+            for _, missing in pending
+        ]
+        built = executor.map(build_derivatives, [source_path for source_path, _ in pending], targets)
+        for (source_path, missing), results in zip(pending, built):
+            for (key, _, _, _, output_path), details in zip(missing, results):
+                cache.add(key, cache.object_path(key, output_path.suffix.lstrip('.')), details)
+                cache.materialize(key, output_path)
+            print(f"  ✓ {public_url(source_path)}: {len(missing)} files")
+
+    cache.save()
+    if cache.evicted:
+        print(f"🧹 Evicted {cache.evicted} old cache entries")
+
+    # Widths or formats dropped since the last run
+    removed = 0
+    for graph in registry['graphs']:
+        if graph['id'] in plans:
+            for path in stale_derivatives(PUBLIC_DIR / graph['path'].lstrip('/'), plans[graph['id']][1]):
+                path.unlink()
+                removed += 1
+    if removed:
+        print(f"🧹 Removed {removed} derivatives of widths or formats no longer requested")
+
+    results = {}
+    for graph_id, (source, planned) in plans.items():
+        derivatives = []
+        for key, width, extension, _, output_path in planned:
+            derivatives.append({
+                'file': output_path.name,
+                'width': width,
+                'height': max(1, round(source['height'] * width / source['width'])),
+                'format': extension,
+                'bytes': output_path.stat().st_size
+            })
+        results[graph_id] = {'width': source['width'], 'height': source['height'], 'derivatives': derivatives}
+
+    # Write dimensions and derivatives back into the registry
+    changed = False
+    for graph in registry['graphs']:
+        details = results.get(graph['id'])
+        if details is None:
+            continue
+
+        source_dir = Path(graph['path']).parent.as_posix()
+        metadata = graph.setdefault('metadata', {})
+        update = {
+            'width': details['width'],
+            'height': details['height'],
+            'derivatives': [
+                {'path': f"{source_dir}/{d['file']}", 'width': d['width'], 'height': d['height'],
+                 'format': d['format'], 'bytes': d['bytes']}
+                for d in details['derivatives']
+            ]
+        }
+        if any(metadata.get(field) != value for field, value in update.items()):
+            metadata.update(update)
+            changed = True
+
+    if changed:
+        registry['lastUpdated'] = datetime.now().strftime('%Y-%m-%d')
+        write_json(args.registry, registry, trailing_newline=True)
+        print(f"\n✅ Updated image metadata in: {args.registry}")
+    else:
+        print(f"\n✅ Registry already up to date: {args.registry}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+"""
+Shared image build stage for the collage and hero image scripts.
+
+A layout describes one output image as a grid of source images:
+
+    {
+      "output": "public/images/areas/sammenligning-collage.jpg",
+      "size": [1920, 1080],
+      "grid": [2, 2],                       # columns, rows
+      "images": ["grunerlokka.jpg", ...],   # row by row, relative to "source"
+      "source": "public/images/areas",
+      "quality": 90
+    }
+
+A hero image is a 1x1 layout. Every tile is scaled to cover its cell and center
+cropped, as create-area-collage.py always did. JPEG sources are decoded in draft mode
+at the smallest scale (1/2, 1/4, 1/8) that still covers the cell, and tiles are
+decoded and resized in a thread pool (Pillow releases the GIL while doing so).
+
+Rendered images go through ImageCache, a content-addressed store keyed by the source
+contents plus the transform parameters, so a layout or derivative whose inputs and
+spec are unchanged is not rendered again (see ImageCache for the details).
+
+load_for_widths / resize_to_width are the same draft-decode and LANCZOS steps for
+single images, used by create-image-derivatives.py.
+"""
+
+import hashlib
+import json
+import math
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from PIL import Image
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking of the cache manifest
+    fcntl = None
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "images"
+CACHE_MANIFEST_FILENAME = "cache.json"
+CACHE_VERSION = 1
+DEFAULT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# Bump when rendering changes in a way that should rebuild every output
+PIPELINE_VERSION = 1
+
+FORMATS = {'.jpg': 'JPEG', '.jpeg': 'JPEG', '.png': 'PNG', '.webp': 'WEBP', '.avif': 'AVIF'}
+
+def file_digest(path):
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def resolve_layout(layout, base_dir=BASE_DIR):
+    """Fill in defaults and absolute paths; returns a new layout dict."""
+    source_dir = base_dir / layout.get('source', '.')
+    columns, rows = layout.get('grid', (1, 1))
+    images = [source_dir / name for name in layout['images']]
+    if len(images) != columns * rows:
+        raise ValueError(f"{layout['output']}: a {columns}x{rows} grid needs {columns * rows} images, "
+                         f"got {len(images)}")
+
+    return dict(layout, output=base_dir / layout['output'], images=images, grid=(columns, rows),
+                size=tuple(layout['size']), quality=layout.get('quality', 90))
+
+def layout_key(layout, cache):
+    """Cache key of a layout's output: the spec and the contents of every input image."""
+    spec = {key: value for key, value in layout.items() if key not in ('output', 'images', 'source')}
+    return cache.key('layout', PIPELINE_VERSION, spec, [cache.source_info(path)['digest'] for path in layout['images']])
+
+def cell_boxes(size, grid):
+    """Pixel box of every grid cell, row by row; cells absorb the remainder when size does not divide evenly."""
+    width, height = size
+    columns, rows = grid
+    return [
+        (column * width // columns, row * height // rows,
+         (column + 1) * width // columns, (row + 1) * height // rows)
+        for row in range(rows)
+        for column in range(columns)
+    ]
+
+def load_tile(path, target_size):
+    """Decode an image, scale it to cover target_size (keeping its aspect ratio) and center crop."""
+    target_width, target_height = target_size
+
+    with Image.open(path) as img:
+        width, height = img.size
+        # Scale factor that makes the image cover the target, cropping the overflow
+        scale = max(target_width / width, target_height / height)
+
+        # Let the JPEG decoder downscale while decoding; the result is never smaller than requested
+        img.draft('RGB', (math.ceil(width * scale), math.ceil(height * scale)))
+        img = img.convert('RGB')
+
+    # Centered crop box in source pixels, mapped onto the (possibly draft-reduced) decoded image
+    crop_width, crop_height = target_width / scale, target_height / scale
+    left, top = (width - crop_width) / 2, (height - crop_height) / 2
+    reduction = img.width / width
+    box = (left * reduction, top * reduction, (left + crop_width) * reduction, (top + crop_height) * reduction)
+
+    # Resample only the cropped region, straight to the target size
+    return img.resize(target_size, Image.Resampling.LANCZOS, box=box)
+
+def load_for_widths(path, width):
+    """
+    Decode an image for resizing to at most `width` pixels wide.
+
+    Returns (image, original size). JPEGs are decoded in draft mode, so the
+    image may be smaller than the original but is never narrower than width.
+    """
+    with Image.open(path) as img:
+        original_size = img.size
+        scale = min(1, width / img.width)
+        img.draft('RGB', (math.ceil(img.width * scale), math.ceil(img.height * scale)))
+        img = img.convert('RGB')
+    return img, original_size
+
+def resize_to_width(img, width, original_size):
+    """Resize a (possibly draft-reduced) image to width, keeping the original aspect ratio."""
+    original_width, original_height = original_size
+    height = max(1, round(original_height * width / original_width))
+    if img.size == (width, height):
+        return img
+    return img.resize((width, height), Image.Resampling.LANCZOS)
+
+def save_image(img, output_path, quality=90):
+    """Save in the format given by the file extension, via a temporary file so readers never see half a file."""
+    output_path = Path(output_path)
+    image_format = FORMATS[output_path.suffix.lower()]
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+    options = {'quality': quality, 'optimize': True} if image_format == 'JPEG' else {'quality': quality}
+    img.save(tmp_path, image_format, **options)
+    os.replace(tmp_path, output_path)
+
+def derivative_path(source_path, width, extension):
+    """Where a derivative is written: next to the source, e.g. 01-q1.jpg -> 01-q1-640w.webp"""
+    source_path = Path(source_path)
+    return source_path.with_name(f"{source_path.stem}-{width}w.{extension}")
+
+def derivative_widths(original_width, widths):
+    """The widths narrower than the original, or just the original width if none are."""
+    return [width for width in widths if width < original_width] or [original_width]
+
+def build_derivatives(source_path, targets):
+    """
+    Write resized copies of one image.
+
+    targets is a list of (width, extension, quality, output path). The source is decoded
+    once, at the largest width needed. Returns a {width, height} dict per target.
+    """
+    img, original_size = load_for_widths(source_path, max(width for width, _, _, _ in targets))
+    resized = {}
+    results = []
+    for width, extension, quality, output_path in targets:
+        if width not in resized:
+            resized[width] = resize_to_width(img, width, original_size)
+        save_image(resized[width], output_path, quality)
+        results.append({'width': resized[width].width, 'height': resized[width].height})
+    return results
+
+def render_layout(layout, executor, output_path):
+    """Render one resolved layout and save it to output_path."""
+    boxes = cell_boxes(layout['size'], layout['grid'])
+    tiles = executor.map(
+        load_tile, layout['images'], [(right - left, bottom - top) for left, top, right, bottom in boxes]
+    )
+
+    collage = Image.new('RGB', layout['size'])
+    for (left, top, _, _), tile in zip(boxes, tiles):
+        collage.paste(tile, (left, top))
+
+    save_image(collage, output_path, layout['quality'])
+
+class ImageCache:
+    """
+    Content-addressed store of rendered images, shared by every image script.
+
+    An object's key is a hash of its source contents and transform parameters (see key),
+    and it lives at objects/{key[:2]}/{key}.{ext}. The manifest (cache.json) records:
+
+        sources   path -> size, mtime and content digest, so an unchanged source is
+                  recognised by a stat instead of being hashed again
+        objects   key -> file, size, last use and details (e.g. dimensions)
+        outputs   output path -> key, size and mtime of the copy placed there
+
+    An output whose stat and key match is left alone; otherwise it is copied from the
+    object, and only a missing object means rendering. Objects are written through a
+    temporary file and an atomic rename, and save() merges the manifest with the copy
+    on disk under a file lock, so several builds on one machine can share the cache.
+    When the objects exceed max_bytes, the least recently used ones are evicted.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.manifest_path = self.cache_dir / CACHE_MANIFEST_FILENAME
+        self.hits = 0
+        self.evicted = 0
+        manifest = self._read_manifest()
+        self.sources = manifest['sources']
+        self.objects = manifest['objects']
+        self.outputs = manifest['outputs']
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            manifest = {}
+        if manifest.get('version') != CACHE_VERSION:
+            manifest = {}
+        return {section: manifest.get(section, {}) for section in ('sources', 'objects', 'outputs')}
+
+    @staticmethod
+    def key(*parts):
+        """Cache key for a transform: hash of its JSON-serialisable parts."""
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+    def source_info(self, path):
+        """Content digest and dimensions of a source image; rehashed only when its size or mtime changed."""
+        stat = os.stat(path)
+        entry = self.sources.get(str(path))
+        if entry and entry['size'] == stat.st_size and entry['mtimeNs'] == stat.st_mtime_ns:
+            return entry
+
+        with Image.open(path) as img:
+            width, height = img.size
+        entry = {'size': stat.st_size, 'mtimeNs': stat.st_mtime_ns, 'digest': file_digest(path),
+                 'width': width, 'height': height}
+        self.sources[str(path)] = entry
+        return entry
+
+    def object_path(self, key, extension):
+        return self.cache_dir / "objects" / key[:2] / f"{key}.{extension}"
+
+    def lookup(self, key):
+        """The object's entry if it is cached, else None."""
+        entry = self.objects.get(key)
+        if entry is None or not (self.cache_dir / entry['file']).exists():
+            return None
+        entry['lastUsed'] = time.time()
+        return entry
+
+    def add(self, key, object_path, details=None):
+        """Record an object written to object_path (see object_path)."""
+        entry = {
+            'file': Path(object_path).relative_to(self.cache_dir).as_posix(),
+            'bytes': Path(object_path).stat().st_size,
+            'lastUsed': time.time(),
+            'details': details
+        }
+        self.objects[key] = entry
+        return entry
+
+    def output_current(self, output_path, key):
+        """True if output_path still holds the copy of key placed there by materialize."""
+        entry = self.outputs.get(str(output_path))
+        if entry is None or entry['key'] != key:
+            return False
+        try:
+            stat = os.stat(output_path)
+        except FileNotFoundError:
+            return False
+        if (stat.st_size, stat.st_mtime_ns) != (entry['size'], entry['mtimeNs']):
+            return False
+
+        self.hits += 1
+        if key in self.objects:
+            self.objects[key]['lastUsed'] = time.time()
+        return True
+
+    def materialize(self, key, output_path):
+        """Copy a cached object to output_path; returns False if the object has gone (e.g. evicted meanwhile)."""
+        entry = self.objects[key]
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+        try:
+            shutil.copyfile(self.cache_dir / entry['file'], tmp_path)
+        except FileNotFoundError:
+            return False
+        os.replace(tmp_path, output_path)
+
+        stat = os.stat(output_path)
+        self.outputs[str(output_path)] = {'key': key, 'size': stat.st_size, 'mtimeNs': stat.st_mtime_ns}
+        return True
+
+    def save(self):
+        """Merge this run into the manifest on disk, evict least recently used objects and write it."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_dir / ".lock", 'w') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+
+            # Another build may have saved since this one started
+            on_disk = self._read_manifest()
+            for key, entry in on_disk['objects'].items():
+                ours = self.objects.get(key)
+                if ours is None or entry['lastUsed'] > ours['lastUsed']:
+                    self.objects[key] = entry
+            for section in ('sources', 'outputs'):
+                merged = on_disk[section]
+                merged.update(getattr(self, section))
+                setattr(self, section, merged)
+
+            self.objects = {key: entry for key, entry in self.objects.items()
+                            if (self.cache_dir / entry['file']).exists()}
+            total = sum(entry['bytes'] for entry in self.objects.values())
+            for key, entry in sorted(self.objects.items(), key=lambda item: item[1]['lastUsed']):
+                if total <= self.max_bytes:
+                    break
+                (self.cache_dir / entry['file']).unlink(missing_ok=True)
+                total -= entry['bytes']
+                del self.objects[key]
+                self.evicted += 1
+
+            manifest = {'version': CACHE_VERSION, 'sources': self.sources, 'objects': self.objects,
+                        'outputs': self.outputs}
+            tmp_path = self.manifest_path.with_name(f".{self.manifest_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.manifest_path)
+
+def build_layouts(layouts, jobs=None, cache=None, force=False, base_dir=BASE_DIR):
+    """
+    Render every layout whose spec or inputs changed since the last build.
+
+    Returns (built, skipped) lists of output paths; outputs copied from the cache
+    count as skipped.
+    """
+    cache = cache if cache is not None else ImageCache()
+    built, skipped = [], []
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        for layout in map(lambda layout: resolve_layout(layout, base_dir), layouts):
+            key = layout_key(layout, cache)
+            output_path = layout['output']
+            if not force and cache.output_current(output_path, key):
+                skipped.append(output_path)
+                continue
+            if not force and cache.lookup(key) is not None and cache.materialize(key, output_path):
+                skipped.append(output_path)
+                continue
+
+            object_path = cache.object_path(key, output_path.suffix.lstrip('.').lower())
+            render_layout(layout, executor, object_path)
+            cache.add(key, object_path, {'width': layout['size'][0], 'height': layout['size'][1]})
+            cache.materialize(key, output_path)
+            built.append(output_path)
+
+    cache.save()
+    return built, skipped
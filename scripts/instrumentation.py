@@ -0,0 +1,155 @@
+"""
+Profiling and per-stage timings for the convert-*.py scripts.
+
+Every converter accepts the two options added by add_instrumentation_arguments:
+
+    --profile PATH   run under cProfile, write the pstats dump to PATH (open it with
+                     `python3 -m pstats PATH` or snakeviz) and print the top functions
+    --timings PATH   time each stage and append one JSON line per run to PATH
+
+Stages are marked in the converter code with `with stage("parse") as record:`; set
+record['rows'] inside the block to get a rows/s figure. Outside an instrumented run a
+stage costs one global lookup, so shared code such as quarterly_pipeline.py can mark
+stages unconditionally.
+
+A timings line looks like:
+
+    {"converter": "convert-aktorer-csv", "startedAt": "2025-01-31T12:00:00", "argv": [...],
+     "wallSeconds": 2.1, "cpuSeconds": 2.0, "peakRssMb": 180.2,
+     "stages": [{"name": "read", "wallSeconds": 1.5, "cpuSeconds": 1.5, "rows": 300000,
+                 "rowsPerSecond": 200000, "peakRssMb": 150.0}, ...]}
+
+CPU time includes worker processes once they have exited; peak RSS is the largest of
+this process and its exited children so far (ru_maxrss), so for a stage it is the
+peak of the run up to the end of that stage.
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Number of functions printed after a --profile run
+PROFILE_TOP = 25
+
+# The RunTimer of the instrumented run in progress, if any
+_active = None
+
+def cpu_seconds():
+    """User plus system CPU time of this process and its exited children."""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+def peak_rss_mb():
+    """Peak resident memory of this process or its exited children, in MB (None where unavailable)."""
+    if resource is None:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 1)
+
+class RunTimer:
+    """Wall time, CPU time and peak memory of one converter run and of each of its stages."""
+
+    def __init__(self, converter):
+        self.converter = converter
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self.stages = []
+        self.wall_start = time.perf_counter()
+        self.cpu_start = cpu_seconds()
+
+    @contextmanager
+    def stage(self, name):
+        record = {'name': name, 'rows': None}
+        self.stages.append(record)
+        wall_start, cpu_start = time.perf_counter(), cpu_seconds()
+        try:
+            yield record
+        finally:
+            record['wallSeconds'] = round(time.perf_counter() - wall_start, 4)
+            record['cpuSeconds'] = round(cpu_seconds() - cpu_start, 4)
+            record['rowsPerSecond'] = (round(record['rows'] / record['wallSeconds'])
+                                       if record['rows'] is not None and record['wallSeconds'] > 0 else None)
+            record['peakRssMb'] = peak_rss_mb()
+
+    def report(self):
+        return {
+            'converter': self.converter,
+            'startedAt': self.started_at,
+            'argv': sys.argv[1:],
+            'wallSeconds': round(time.perf_counter() - self.wall_start, 4),
+            'cpuSeconds': round(cpu_seconds() - self.cpu_start, 4),
+            'peakRssMb': peak_rss_mb(),
+            'stages': self.stages
+        }
+
+@contextmanager
+def stage(name):
+    """Time a stage of the instrumented run in progress; does nothing outside one."""
+    if _active is None:
+        yield {}
+        return
+    with _active.stage(name) as record:
+        yield record
+
+def add_instrumentation_arguments(parser):
+    parser.add_argument('--profile', type=Path, metavar='PATH',
+                        help='Run under cProfile and write the pstats dump to PATH')
+    parser.add_argument('--timings', type=Path, metavar='PATH',
+                        help='Append per-stage wall/CPU time, rows/s and peak memory as a JSON line to PATH')
+
+def print_timings(report):
+    print(f"\n⏱️  {report['converter']}: {report['wallSeconds']:.3f} s wall, {report['cpuSeconds']:.3f} s CPU, "
+          f"peak {report['peakRssMb']} MB")
+    for record in report['stages']:
+        rate = f"{record['rowsPerSecond']:>12,} rows/s" if record['rowsPerSecond'] is not None else ""
+        print(f"   {record['name']:<28} {record['wallSeconds']:>9.3f} s {record['cpuSeconds']:>9.3f} s CPU  {rate}")
+
+@contextmanager
+def instrumented(converter, args):
+    """
+    Run the body of a converter's main() with the --profile and --timings options in args.
+
+    Without either option this only yields. The report is written even if the
+    conversion fails, so slow failing runs can be looked at too.
+    """
+    global _active
+    if args.profile is None and args.timings is None:
+        yield
+        return
+
+    profiler = cProfile.Profile() if args.profile is not None else None
+    _active = RunTimer(converter)
+    try:
+        if profiler is not None:
+            profiler.enable()
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        report = _active.report()
+        _active = None
+
+        if profiler is not None:
+            args.profile.parent.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(args.profile)
+            print(f"\n🔬 Profile saved to: {args.profile}")
+            pstats.Stats(profiler).sort_stats('cumulative').print_stats(PROFILE_TOP)
+
+        if args.timings is not None:
+            args.timings.parent.mkdir(parents=True, exist_ok=True)
+            with open(args.timings, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(report, ensure_ascii=False) + '\n')
+            print_timings(report)
+            print(f"\n⏱️  Timings appended to: {args.timings}")
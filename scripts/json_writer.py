@@ -0,0 +1,90 @@
+"""
+JSON output for the converters: the backend, the layout and the file write in one place.
+
+    write_json(path, data)                 pretty, the same bytes as json.dump(data, f,
+                                           indent=2, ensure_ascii=False); keeps diffs readable
+    write_json(path, data, compact=True)   no whitespace, for files only machines read
+
+orjson is used when it is installed (pip install orjson) and the standard library json
+module otherwise; set BACKEND to force one. Data orjson cannot encode (integers above
+64 bits) falls back to json. The two backends agree byte for byte except for floats in
+exponent notation (orjson writes 1e16, json writes 1e+16) and NaN/Infinity, which
+orjson writes as null.
+
+Files are written to a temporary file in the same folder and renamed into place, so a
+reader (or the dev server) never sees half a file, and an interrupted run leaves the
+previous file intact. Writers that stream their own output (e.g. the daily writers in
+convert-quarterly-csv-with-daily.py) get the same guarantee from atomic_open.
+"""
+
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# "orjson" or "json"
+BACKEND = 'orjson' if orjson is not None else 'json'
+
+# Buffer for the standard library backend, which writes many small chunks
+WRITE_BUFFER_SIZE = 1 << 20
+
+def encode(data, compact=False):
+    """Serialise data to UTF-8 JSON bytes, pretty (indent=2) unless compact."""
+    if BACKEND == 'orjson':
+        options = orjson.OPT_NON_STR_KEYS | (0 if compact else orjson.OPT_INDENT_2)
+        try:
+            return orjson.dumps(data, option=options)
+        except orjson.JSONEncodeError:
+            pass
+    if compact:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+def dumps(data, compact=False):
+    """encode() as a str."""
+    return encode(data, compact).decode('utf-8')
+
+def temp_path(path):
+    """The temporary file next to path that path is written through: .{name}.{pid}.tmp"""
+    path = Path(path)
+    return path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+@contextmanager
+def atomic_open(path, mode='w', **kwargs):
+    """
+    open() for writing via temp_path(path): the file is renamed to path when the block
+    completes and deleted if it raises, leaving any previous file at path intact.
+    """
+    tmp_path = temp_path(path)
+    try:
+        with open(tmp_path, mode, **kwargs) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+def write_json(path, data, compact=False, trailing_newline=False):
+    """
+    Write data to path as JSON via a temporary file and an atomic rename; returns the bytes written.
+
+    Use trailing_newline for hand-edited files that prettier also formats (e.g. registry.json).
+    """
+    path = Path(path)
+    if BACKEND == 'json' and not compact:
+        # Stream the pure-Python indenting encoder's chunks instead of joining them in memory
+        with atomic_open(path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            if trailing_newline:
+                f.write('\n')
+    else:
+        with atomic_open(path, 'wb') as f:
+            f.write(encode(data, compact))
+            if trailing_newline:
+                f.write(b'\n')
+    return path.stat().st_size
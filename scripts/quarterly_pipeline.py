@@ -0,0 +1,286 @@
+"""
+Shared stages for converting the quarterly Plaace bank-transaction CSV exports.
+
+Every quarterly converter goes through the same stages:
+
+    reader      read_csv_rows        raw CSV rows of one export file
+    parser      parse_daily_row      one daily entry (and its unrounded total) per row
+    aggregator  aggregate_quarter    quarter total, day count and daily entries
+    writers     save_quarterly_summaries, and the daily writers in
+                convert-quarterly-csv-with-daily.py
+
+Quarter detection (extract_quarter_info) and the summary entry format
+(build_quarterly_entry) also live here, so all scripts agree on them.
+"""
+
+import csv
+import json
+from contextlib import contextmanager
+from datetime import date, datetime
+from functools import lru_cache
+from pathlib import Path
+
+from instrumentation import stage
+from json_writer import write_json
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent runs are not locked against each other
+    fcntl = None
+
+DEFAULT_SOURCE_DIR = Path("/Users/gabrielboen/Downloads/Quarterly  Reports Bank Transaction 2019-2025")
+DEFAULT_OUTPUT_DIR = Path("/Users/gabrielboen/natural-state-place-analysis-grunerlokka-2025/src/data/quarterly")
+
+SUMMARY_FILENAME = "banktransaksjoner-2019-2025.json"
+
+# Amount columns: Handel, Mat og opplevelser, Tjenester (values are in millions NOK)
+AMOUNT_COLUMNS = (2, 5, 8)
+
+# Bump when parse_daily_row or the daily entry format changes, so cached conversions are redone
+PARSER_VERSION = 1
+
+def read_csv_rows(csv_path):
+    """Reader stage: yield the data rows of a CSV export, skipping the header."""
+    with open(csv_path, 'r', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = next(reader)  # Skip header
+
+        yield from reader
+
+def parse_iso_date(date_str):
+    """
+    Parse a CSV date ("2019-01-01") into a date, or return None if it cannot be parsed.
+
+    The fixed YYYY-MM-DD layout of the exports goes through date.fromisoformat;
+    anything else falls back to strptime, which also accepts e.g. "2019-1-1".
+    """
+    if len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
+        try:
+            return date.fromisoformat(date_str)
+        except ValueError:
+            pass
+    try:
+        return datetime.strptime(date_str, '%Y-%m-%d').date()
+    except ValueError:
+        return None
+
+# Exports repeat each date once per row and area, so the label is built once per unique date
+@lru_cache(maxsize=8192)
+def format_date(date_str):
+    """Format a CSV date ("2019-01-01") as "Jan 01, 2019", or return it unchanged if it cannot be parsed."""
+    date_obj = parse_iso_date(date_str)
+    if date_obj is None:
+        return date_str
+    return date_obj.strftime('%b %d, %Y')
+
+def parse_daily_row(row):
+    """
+    Parser stage: turn one CSV row into (daily entry, unrounded daily total).
+
+    Returns None for rows that are too short or whose total is not positive. The
+    unrounded total is returned alongside the entry so quarter sums do not suffer
+    from the int() truncation of the stored amounts.
+    """
+    if len(row) < 3:
+        return None
+
+    try:
+        # Extract date from column 0 or 3
+        date_str = row[3] if len(row) > 3 and row[3] else row[0]
+
+        # Parse amounts from columns 2, 5, 8
+        handel = 0
+        mat = 0
+        tjenester = 0
+
+        if len(row) > 2 and row[2]:
+            try:
+                handel = float(row[2]) * 1_000_000  # Convert millions to NOK
+            except ValueError:
+                pass
+
+        if len(row) > 5 and row[5]:
+            try:
+                mat = float(row[5]) * 1_000_000
+            except ValueError:
+                pass
+
+        if len(row) > 8 and row[8]:
+            try:
+                tjenester = float(row[8]) * 1_000_000
+            except ValueError:
+                pass
+
+        daily_total = handel + mat + tjenester
+
+        if daily_total > 0:
+            return {
+                'date': date_str,
+                'handel': int(handel),
+                'matOgOpplevelser': int(mat),
+                'tjenester': int(tjenester),
+                'total': int(daily_total),
+                'formattedDate': format_date(date_str)
+            }, daily_total
+
+    except (ValueError, IndexError):
+        pass
+
+    return None
+
+def iter_daily_rows(csv_path):
+    """Reader and parser stages: yield (entry, daily_total) for every CSV row with a positive total."""
+    for row in read_csv_rows(csv_path):
+        parsed = parse_daily_row(row)
+        if parsed is not None:
+            yield parsed
+
+def aggregate_quarter(parsed_rows, keep_daily=True):
+    """
+    Aggregator stage: sum the (entry, daily_total) pairs of one quarter.
+
+    Returns the quarter's total in NOK, its day count and, unless keep_daily is
+    False, the list of daily entries.
+    """
+    daily_data = []
+    total_amount = 0
+    day_count = 0
+
+    for entry, daily_total in parsed_rows:
+        if keep_daily:
+            daily_data.append(entry)
+        total_amount += daily_total
+        day_count += 1
+
+    return {
+        'daily_data': daily_data,
+        'total_nok': int(total_amount),
+        'day_count': day_count
+    }
+
+def extract_quarter_info(filename):
+    """Extract year and quarter from a filename like "01-04-2019 - 30-06-2019.csv"."""
+    if not filename.endswith('.csv'):
+        return None, None
+
+    parts = filename.split(' - ')
+    if len(parts) < 2:
+        return None, None
+
+    start_date = parts[0]
+    try:
+        date_parts = start_date.split('-')
+        day = int(date_parts[0])
+        month = int(date_parts[1])
+        year = int(date_parts[2])
+
+        if month <= 3:
+            quarter = 1
+        elif month <= 6:
+            quarter = 2
+        elif month <= 9:
+            quarter = 3
+        else:
+            quarter = 4
+
+        return year, quarter
+    except (ValueError, IndexError):
+        return None, None
+
+def plan_quarter_files(csv_files):
+    """Map each CSV file to its (year, quarter), skipping files whose quarter cannot be determined."""
+    planned = []
+    for csv_file in csv_files:
+        year, quarter = extract_quarter_info(csv_file.name)
+
+        if year is None or quarter is None:
+            print(f"Skipping: {csv_file.name}")
+            print(f"  ⚠️  Could not determine quarter from filename\n")
+            continue
+
+        planned.append((csv_file, year, quarter))
+    return planned
+
+def build_quarterly_entry(year, quarter, total_nok, day_count):
+    """Create the quarterly summary entry stored in banktransaksjoner-2019-2025.json."""
+    return {
+        "year": year,
+        "quarter": quarter,
+        "quarterLabel": f"Q{quarter} {year}",
+        "amount": total_nok,
+        "transactionCount": day_count * 1000,  # Estimate: ~1000 transactions per day
+        "averageTransaction": int(total_nok / (day_count * 1000)) if day_count > 0 else 0,
+        "note": f"Parsed from CSV: {day_count} days"
+    }
+
+@contextmanager
+def locked(path):
+    """Hold an exclusive lock on a .lock file next to path, so read-modify-write runs take turns."""
+    with open(path.with_name(f".{path.name}.lock"), 'w') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+def save_quarterly_summaries(output_path, quarterly_summaries):
+    """
+    Writer stage: merge summaries into banktransaksjoner-2019-2025.json; returns the number of quarters changed.
+
+    Quarters already in the file but not in quarterly_summaries are kept. The file is
+    read, merged and written under a lock, so concurrent runs (e.g. one per area in a
+    parallel build) each merge into the other's result instead of overwriting it, and
+    the write itself is atomic (see json_writer.py). Only quarters whose entry differs
+    from the file are applied; when none do, the file is left untouched, lastUpdated
+    included.
+    """
+    output_path = Path(output_path)
+    with locked(output_path):
+        with stage("merge summaries") as record:
+            with open(output_path, 'r', encoding='utf-8') as f:
+                existing_data = json.load(f)
+
+            existing_dict = {(q['year'], q['quarter']): q for q in existing_data['data']}
+            changed = [q for q in quarterly_summaries if existing_dict.get((q['year'], q['quarter'])) != q]
+
+            for q in changed:
+                existing_dict[(q['year'], q['quarter'])] = q
+
+            merged_data = list(existing_dict.values())
+            merged_data.sort(key=lambda x: (x['year'], x['quarter']))
+            record['rows'] = len(changed)
+
+        if not changed:
+            return 0
+
+        existing_data['data'] = merged_data
+        existing_data['metadata']['lastUpdated'] = datetime.now().strftime('%Y-%m-%d')
+
+        with stage("write summaries"):
+            write_json(output_path, existing_data)
+    return len(changed)
+
+def convert_summaries(source_dir=DEFAULT_SOURCE_DIR, output_dir=DEFAULT_OUTPUT_DIR):
+    """Run the pipeline with only the summary writer; returns the summaries, sorted by quarter."""
+    csv_files = sorted(Path(source_dir).glob("*.csv"))
+
+    print(f"Found {len(csv_files)} CSV files\n")
+
+    quarterly_summaries = []
+    with stage("read and parse") as record:
+        record['rows'] = 0
+        for csv_file, year, quarter in plan_quarter_files(csv_files):
+            print(f"Processing: {csv_file.name}")
+
+            result = aggregate_quarter(iter_daily_rows(csv_file), keep_daily=False)
+            quarterly_summaries.append(build_quarterly_entry(year, quarter, result['total_nok'], result['day_count']))
+            record['rows'] += result['day_count']
+
+            print(f"  ✓ Q{quarter} {year}: {result['total_nok'] / 1_000_000:.2f}M NOK ({result['day_count']} days)")
+            print()
+
+    quarterly_summaries.sort(key=lambda x: (x['year'], x['quarter']))
+
+    output_path = Path(output_dir) / SUMMARY_FILENAME
+    changed = save_quarterly_summaries(output_path, quarterly_summaries)
+
+    print(f"✅ Saved quarterly summaries to: {output_path} ({changed} quarters changed)")
+    return quarterly_summaries
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Generate synthetic input files in the layouts the converters read.
+
+- Quarterly bank-transaction CSVs in the Plaace column layout, one file per quarter
+- Aktørkartlegging CSVs with multiline Omsetning / Ansatte cells
+- Demografi per-year CSVs with the file names convert-demografi-csv.py expects
+
+Output is deterministic for a given seed. Used by benchmark-converters.py, and can be
+run directly, e.g. `python3 scripts/synthetic_data.py quarterly /tmp/quarterly --rows 100000`.
+"""
+
+import argparse
+import csv
+import math
+import random
+from datetime import date, timedelta
+from pathlib import Path
+
+QUARTERLY_HEADER = [
+    "DateTime", "Handel", "sumTransactionAmount(Handel)", "batchDate",
+    "Mat og opplevelser", "sumTransactionAmount(Mat og opplevelser)", "batchDate",
+    "Tjenester", "sumTransactionAmount(Tjenester)", "batchDate",
+]
+QUARTER_START_MONTHS = (1, 4, 7, 10)
+QUARTER_END_DAYS = ("31-03", "30-06", "30-09", "31-12")
+
+AKTOR_HEADER = ["#", "Navn", "Type", "Adresse", "Kommune", "Omsetning", "YoY-vekst", "Ansatte", "Markedsandel"]
+AKTOR_TYPES = [
+    "Handel / Mat og drikke", "Handel / Klær og sko", "Mat og opplevelser / Restaurant",
+    "Mat og opplevelser / Kafé", "Tjenester / Frisør", "Tjenester / Trening",
+]
+STREETS = ["THORVALD MEYERS GATE", "MARKVEIEN", "SANNERGATA", "SANDAKERVEIEN", "TOFTES GATE"]
+
+DEMOGRAFI_AREA = "Thorvald Meyers gate 40B (Område 1.14 km²)"
+DEMOGRAFI_YEARS = range(2017, 2024)
+MEDIAN_INCOME_YEARS = range(2015, 2023)
+
+# Per-year CSVs written for each year in DEMOGRAFI_YEARS
+DEMOGRAFI_FILES = ("Aldersfordeling", "Antall husholdninger", "Inntektsfordeling", "Antall hus")
+
+def quarter_filename(year, quarter):
+    """File name in the Plaace export format, e.g. "01-04-2019 - 30-06-2019.csv"."""
+    return f"01-{QUARTER_START_MONTHS[quarter - 1]:02d}-{year} - {QUARTER_END_DAYS[quarter - 1]}-{year}.csv"
+
+def write_quarterly_csvs(out_dir, rows, quarters=28, seed=0):
+    """
+    Write `rows` data rows spread over up to `quarters` quarters starting at Q1 2019.
+
+    Small sizes get one row per day (about 90 per quarter); larger sizes repeat dates
+    within a quarter, as in multi-area exports. About 2% of amount cells are left
+    empty. Returns the written paths.
+    """
+    rng = random.Random(seed)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    file_count = max(1, min(quarters, math.ceil(rows / 90)))
+    rows_per_file = math.ceil(rows / file_count)
+    paths = []
+    remaining = rows
+
+    for i in range(file_count):
+        year, quarter = 2019 + i // 4, i % 4 + 1
+        start = date(year, QUARTER_START_MONTHS[quarter - 1], 1)
+        path = out_dir / quarter_filename(year, quarter)
+        file_rows = min(rows_per_file, remaining)
+
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(QUARTERLY_HEADER)
+
+            for n in range(file_rows):
+                day = (start + timedelta(days=n % 90)).isoformat()
+                amounts = [
+                    "" if rng.random() < 0.02 else f"{rng.uniform(0.2, 6.0):.3f}"
+                    for _ in range(3)
+                ]
+                writer.writerow([
+                    day, "Handel", amounts[0], day,
+                    "Mat og opplevelser", amounts[1], day,
+                    "Tjenester", amounts[2], day,
+                ])
+
+        remaining -= file_rows
+        paths.append(path)
+
+    return paths
+
+def unpad_quarterly_dates(path):
+    """Rewrite the dates of a CSV from write_quarterly_csvs without zero padding, e.g. "2019-3-2"."""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        rows = list(csv.reader(f))
+
+    for row in rows[1:]:
+        for i in (0, 3, 6, 9):
+            day = date.fromisoformat(row[i])
+            row[i] = f"{day.year}-{day.month}-{day.day}"
+
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        csv.writer(f).writerows(rows)
+
+def write_aktor_csv(path, rows, seed=0):
+    """Write an Aktørkartlegging CSV with `rows` actors, including multiline cells."""
+    rng = random.Random(seed)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(AKTOR_HEADER)
+
+        for rank in range(1, rows + 1):
+            omsetning = rng.randint(1, 250)
+            ansatte = rng.randint(1, 120)
+            writer.writerow([
+                f"#{rank}",
+                f"Aktør {rank}\nAS",
+                rng.choice(AKTOR_TYPES),
+                f"{rng.choice(STREETS)} {rng.randint(1, 99)}",
+                "Oslo",
+                f"NOK {omsetning} mill.\n{rng.uniform(0, 5):.1f}% av kjede",
+                f"{rng.uniform(-20, 40):.1f} %",
+                f"{ansatte}\n{ansatte * rng.randint(10, 300)} i {rng.randint(1, 700)} lokasjoner",
+                f"{rng.uniform(0, 5):.2f}%",
+            ])
+
+    return path
+
+def write_demografi_dir(out_dir, rows, seed=0, area=DEMOGRAFI_AREA):
+    """
+    Write a full demografi source folder for one area with about `rows` data rows in total.
+
+    The rows are spread evenly over the per-year category files; the population
+    and median income files get the same per-file row count.
+    """
+    rng = random.Random(seed)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    file_count = len(DEMOGRAFI_FILES) * len(DEMOGRAFI_YEARS) + len(MEDIAN_INCOME_YEARS)
+    per_file = max(1, rows // file_count)
+
+    def write(name, header, make_row):
+        with open(out_dir / name, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            for i in range(per_file):
+                writer.writerow(make_row(i))
+
+    for year in DEMOGRAFI_YEARS:
+        write(f"Aldersfordeling {year}.csv",
+              ["Category", f"Mann ({area})", f"Kvinne ({area})"],
+              lambda i: [f"{i}-{i + 4} år", rng.randint(0, 2000), rng.randint(0, 2000)])
+        write(f"Antall husholdninger {year}.csv", ["Category", area],
+              lambda i: [f"Husholdningstype {i}", rng.randint(0, 5000)])
+        write(f"Inntektsfordeling {year}.csv", ["Category", area],
+              lambda i: [f"Inntekt {i * 100}k", round(rng.uniform(0, 30), 2)])
+        write(f"Antall hus {year}.csv", ["Category", area],
+              lambda i: [f"Bygningstype {i}", rng.randint(0, 800)])
+
+    for year in MEDIAN_INCOME_YEARS:
+        write(f"Medianinntekt per husholdningstype {year}.csv", ["Category", area],
+              lambda i: [f"Husholdningstype {i}", round(rng.uniform(200000, 900000), 1)])
+
+    with open(out_dir / "Demografi over tid.csv", 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Category", area, "Trendline"])
+        for year in DEMOGRAFI_YEARS:
+            population = rng.randint(50000, 60000)
+            writer.writerow([year, population, population + rng.uniform(-500, 500)])
+
+    return out_dir
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic converter inputs")
+    parser.add_argument('kind', choices=['quarterly', 'aktorer', 'demografi'])
+    parser.add_argument('output', type=Path, help='Output folder (or CSV file for aktorer)')
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.kind == 'quarterly':
+        paths = write_quarterly_csvs(args.output, args.rows, seed=args.seed)
+        print(f"✓ Wrote {args.rows} rows in {len(paths)} quarterly CSV files to {args.output}")
+    elif args.kind == 'aktorer':
+        write_aktor_csv(args.output, args.rows, seed=args.seed)
+        print(f"✓ Wrote {args.rows} actors to {args.output}")
+    else:
+        write_demografi_dir(args.output, args.rows, seed=args.seed)
+        print(f"✓ Wrote demografi CSV files to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -7,11 +7,8 @@ import SimpleEventTimeline from '@/components/analyser/SimpleEventTimeline';
 import BankTransactionChart from '@/components/analyser/BankTransactionChart';
 import { loadAnalysis } from '@/lib/place-loader';
 import { loadEvents, mergeEvents } from '@/lib/event-loader';
-import {
-  generateBankTransactionData,
-  generateVisitorData,
-  aggregateToMonthly
-} from '@/lib/synthetic-data-generator';
+import { generateVisitorData, aggregateToMonthly } from '@/lib/synthetic-data-generator';
+import { loadBankSeries } from '@/lib/series-loader';
 import Link from 'next/link';
 import Image from 'next/image';
 import { readFile } from 'fs/promises';
@@ -22,6 +19,24 @@ export const metadata = {
   description: 'Komplett stedsanalyse for Grünerløkka 2024',
 };
 
+const WEEKDAYS = ['søndager', 'mandager', 'tirsdager', 'onsdager', 'torsdager', 'fredager', 'lørdager'];
+
+// Weekdays of the series ordered from highest to lowest average daily amount
+function weekdaysByAverage(data: { date: string; amount: number }[]): string[] {
+  const sums = new Array(7).fill(0);
+  const counts = new Array(7).fill(0);
+  for (const { date, amount } of data) {
+    const day = new Date(date).getUTCDay();
+    sums[day] += amount;
+    counts[day] += 1;
+  }
+  return WEEKDAYS
+    .map((name, day) => ({ name, average: counts[day] ? sums[day] / counts[day] : 0 }))
+    .filter((_, day) => counts[day] > 0)
+    .sort((a, b) => b.average - a.average)
+    .map(({ name }) => name);
+}
+
 export default async function Analyse2024Page() {
   const analysis = await loadAnalysis('2024-arsrapport');
 
@@ -43,14 +58,16 @@ export default async function Analyse2024Page() {
   const allEvents = await loadEvents();
   const timelineEvents = mergeEvents(allEvents, analysis.events || []);
 
-  // Generate synthetic data for visualizations
-  // Based on annual totals: 3.97B kr handelsomsetning, ~9M årlige besøkende estimat
-  const dailyBankData = generateBankTransactionData();
-  const dailyVisitorData = generateVisitorData();
+  // Measured bank transactions, precomputed per year by the quarterly converter
+  const [dailyBankData, monthlyBankData] = await Promise.all([
+    loadBankSeries(2024, 'daily'),
+    loadBankSeries(2024, 'monthly'),
+  ]);
+  const bankTotal = dailyBankData.reduce((sum, point) => sum + point.amount, 0);
+  const bankWeekdays = weekdaysByAverage(dailyBankData);
 
-  // Aggregate to monthly for better visualization
-  const monthlyBankData = aggregateToMonthly(dailyBankData);
-  const monthlyVisitorData = aggregateToMonthly(dailyVisitorData);
+  // No measured visitor counts yet: synthetic, based on a ~9M årlige besøkende estimat
+  const monthlyVisitorData = aggregateToMonthly(generateVisitorData());
 
   // Group screenshots by category (in specified order)
   const allKonkurranseScreenshots = analysis.plaaceData.screenshots?.filter(
@@ -359,8 +376,15 @@ export default async function Analyse2024Page() {
               <div className="space-y-2 text-xs leading-relaxed text-gray-700 md:text-sm">
                 <p>
                   <strong>Banktransaksjoner (daglig):</strong> Øvre graf viser daglige korthandel-transaksjoner på Grünerløkka
-                  (inkludert +5 Urbant område). Totalt NOK 3,97 milliarder i årlig omsetning. Tydelige ukentlige mønstre
-                  med høyere aktivitet i helgene.
+                  (inkludert +5 Urbant område). Totalt NOK{' '}
+                  {(bankTotal / 1e9).toLocaleString('nb-NO', { minimumFractionDigits: 2, maximumFractionDigits: 2 })}{' '}
+                  milliarder i årlig omsetning.
+                  {bankWeekdays.length > 1 && (
+                    <>
+                      {' '}Tydelige ukentlige mønstre med høyest omsetning på {bankWeekdays[0]} og {bankWeekdays[1]},
+                      og lavest på {bankWeekdays[bankWeekdays.length - 1]}.
+                    </>
+                  )}
                 </p>
                 <p>
                   <strong>Arrangementer (månedlig):</strong> Nedre graf viser antall arrangementer per måned med grønne bars.
@@ -370,7 +394,7 @@ export default async function Analyse2024Page() {
                 <p>
                   <strong>Korrelasjon:</strong> Sammenlign grafene vertikalt for å se hvordan store arrangementer
                   (f.eks. Pride i juni, Løkkadagene i mai) korrelerer med økt økonomisk aktivitet og besøkstall.
-                  Dataene er modellert med realistiske sesongvariasjoner og event-påvirkning.
+                  Banktransaksjonene er målte daglige tall; besøkende-dataene er modellert med sesongvariasjoner og event-påvirkning.
                 </p>
               </div>
             </div>
@@ -1,30 +1,184 @@
+import { createHash } from 'crypto';
 import fs from 'fs/promises';
 import path from 'path';
 import type { Graph } from '@/types/graphs';
 
 const GRAPH_REGISTRY_PATH = path.join(process.cwd(), 'src/data/graphs');
+const REGISTRY_FILE = path.join(GRAPH_REGISTRY_PATH, 'registry.json');
+// Written by scripts/build-graph-registry.py: the registry plus the indexes below
+const BUILT_REGISTRY_FILE = path.join(GRAPH_REGISTRY_PATH, 'registry.built.json');
+
+// Positions into the graphs list, in registry order
+interface GraphIndexes {
+  byId: Record<string, number>;
+  byCategory: Record<string, number[]>;
+  byYear: Record<string, number[]>;
+  byTag: Record<string, number[]>;
+  tokens: Record<string, number[]>; // Lower-cased words of titles and descriptions
+  ngrams: Record<string, string[]>; // 1 to NGRAM_LENGTH character substrings of those words -> the words
+}
+
+interface IndexedRegistry {
+  sourceHash?: string | null; // SHA-256 of the registry.json the built file was made from
+  graphs: Graph[];
+  indexes: GraphIndexes;
+}
+
+// Same words and n-gram length as build-graph-registry.py (Python's \w)
+const TOKEN_PATTERN = /[\p{L}\p{N}_]+/gu;
+const NGRAM_LENGTH = 3;
+
+let cache: { key: string; registry: IndexedRegistry } | null = null;
+
+function tokenize(text: string): string[] {
+  return text.toLowerCase().match(TOKEN_PATTERN) ?? [];
+}
+
+function lookup<T>(record: Record<string, T>, key: string): T | undefined {
+  return Object.hasOwn(record, key) ? record[key] : undefined;
+}
+
+// Substrings by code point, like Python's slicing in build-graph-registry.py
+function ngrams(token: string): Set<string> {
+  const chars = Array.from(token);
+  const result = new Set<string>();
+  for (let length = 1; length <= NGRAM_LENGTH; length++) {
+    for (let start = 0; start + length <= chars.length; start++) {
+      result.add(chars.slice(start, start + length).join(''));
+    }
+  }
+  return result;
+}
+
+function addPosition(record: Record<string, number[]>, key: string, position: number) {
+  const positions = lookup(record, key);
+  if (positions) {
+    positions.push(position);
+  } else {
+    record[key] = [position];
+  }
+}
 
 /**
- * Load all registered graphs
+ * Build the indexes of build-graph-registry.py, for when the built file is missing or stale
  */
-export async function loadAllGraphs(): Promise<Graph[]> {
+function buildIndexes(graphs: Graph[]): GraphIndexes {
+  const indexes: GraphIndexes = { byId: {}, byCategory: {}, byYear: {}, byTag: {}, tokens: {}, ngrams: {} };
+
+  graphs.forEach((graph, position) => {
+    if (!Object.hasOwn(indexes.byId, graph.id)) {
+      indexes.byId[graph.id] = position; // First one wins, like Array.find
+    }
+    addPosition(indexes.byCategory, graph.category, position);
+    if (graph.year !== undefined) {
+      addPosition(indexes.byYear, String(graph.year), position);
+    }
+    for (const tag of new Set(graph.tags ?? [])) {
+      addPosition(indexes.byTag, tag, position);
+    }
+    for (const token of new Set([...tokenize(graph.title), ...tokenize(graph.description ?? '')])) {
+      addPosition(indexes.tokens, token, position);
+    }
+  });
+
+  for (const token of Object.keys(indexes.tokens)) {
+    for (const ngram of ngrams(token)) {
+      const words = lookup(indexes.ngrams, ngram);
+      if (words) {
+        words.push(token);
+      } else {
+        indexes.ngrams[ngram] = [token];
+      }
+    }
+  }
+
+  return indexes;
+}
+
+async function modifiedTime(file: string): Promise<number | null> {
+  try {
+    return (await fs.stat(file)).mtimeMs;
+  } catch {
+    return null;
+  }
+}
+
+async function readBuiltRegistry(): Promise<IndexedRegistry | null> {
+  try {
+    return JSON.parse(await fs.readFile(BUILT_REGISTRY_FILE, 'utf-8'));
+  } catch {
+    return null;
+  }
+}
+
+/**
+ * Load the registry with its indexes, reusing the parsed files until they change.
+ * The built file is used only while its sourceHash matches registry.json's content.
+ */
+async function loadRegistry(): Promise<IndexedRegistry> {
+  const [registryTime, builtTime] = await Promise.all([
+    modifiedTime(REGISTRY_FILE),
+    modifiedTime(BUILT_REGISTRY_FILE),
+  ]);
+  const key = `${registryTime}:${builtTime}`;
+  if (cache?.key === key) {
+    return cache.registry;
+  }
+
   try {
-    const registryFile = path.join(GRAPH_REGISTRY_PATH, 'registry.json');
-    const content = await fs.readFile(registryFile, 'utf-8');
-    const data = JSON.parse(content);
-    return data.graphs || [];
+    const [source, built] = await Promise.all([
+      registryTime === null ? null : fs.readFile(REGISTRY_FILE),
+      builtTime === null ? null : readBuiltRegistry(),
+    ]);
+    let registry: IndexedRegistry;
+    if (built && (source === null || built.sourceHash === createHash('sha256').update(source).digest('hex'))) {
+      registry = built;
+    } else if (source !== null) {
+      // registry.json was edited since the last build-graph-registry.py run
+      const data = JSON.parse(source.toString('utf-8'));
+      const graphs: Graph[] = data.graphs || [];
+      registry = { graphs, indexes: buildIndexes(graphs) };
+    } else {
+      throw new Error(`${REGISTRY_FILE} not found`);
+    }
+    cache = { key, registry };
+    return registry;
   } catch (error) {
     console.error('Error loading graph registry:', error);
-    return [];
+    return { graphs: [], indexes: buildIndexes([]) };
   }
 }
 
+function atPositions(graphs: Graph[], positions: Iterable<number>): Graph[] {
+  const result: Graph[] = [];
+  for (const position of positions) {
+    const graph = graphs[position];
+    if (graph) {
+      result.push(graph);
+    }
+  }
+  return result;
+}
+
+function inRegistryOrder(positions: Iterable<number>): number[] {
+  return [...new Set(positions)].sort((a, b) => a - b);
+}
+
+/**
+ * Load all registered graphs
+ */
+export async function loadAllGraphs(): Promise<Graph[]> {
+  const { graphs } = await loadRegistry();
+  return graphs;
+}
+
 /**
  * Get a specific graph by ID
  */
 export async function getGraphById(id: string): Promise<Graph | null> {
-  const graphs = await loadAllGraphs();
-  return graphs.find((g) => g.id === id) || null;
+  const { graphs, indexes } = await loadRegistry();
+  const position = lookup(indexes.byId, id);
+  return position === undefined ? null : graphs[position] || null;
 }
 
 /**
@@ -33,25 +187,26 @@ export async function getGraphById(id: string): Promise<Graph | null> {
 export async function getGraphsByCategory(
   category: Graph['category']
 ): Promise<Graph[]> {
-  const graphs = await loadAllGraphs();
-  return graphs.filter((g) => g.category === category);
+  const { graphs, indexes } = await loadRegistry();
+  return atPositions(graphs, lookup(indexes.byCategory, category) ?? []);
 }
 
 /**
  * Get graphs by year
  */
 export async function getGraphsByYear(year: number): Promise<Graph[]> {
-  const graphs = await loadAllGraphs();
-  return graphs.filter((g) => g.year === year);
+  const { graphs, indexes } = await loadRegistry();
+  return atPositions(graphs, lookup(indexes.byYear, String(year)) ?? []);
 }
 
 /**
  * Get graphs by tags
  */
 export async function getGraphsByTags(tags: string[]): Promise<Graph[]> {
-  const graphs = await loadAllGraphs();
-  return graphs.filter((g) =>
-    g.tags && tags.some((tag) => g.tags?.includes(tag))
+  const { graphs, indexes } = await loadRegistry();
+  return atPositions(
+    graphs,
+    inRegistryOrder(tags.flatMap((tag) => lookup(indexes.byTag, tag) ?? []))
   );
 }
 
@@ -59,17 +214,62 @@ export async function getGraphsByTags(tags: string[]): Promise<Graph[]> {
  * Get multiple graphs by IDs
  */
 export async function getGraphsByIds(ids: string[]): Promise<Graph[]> {
-  const graphs = await loadAllGraphs();
-  return graphs.filter((g) => ids.includes(g.id));
+  const { graphs, indexes } = await loadRegistry();
+  return atPositions(
+    graphs,
+    inRegistryOrder(ids.flatMap((id) => lookup(indexes.byId, id) ?? []))
+  );
+}
+
+/**
+ * The indexed words that contain word: the ngrams entry itself for short words,
+ * otherwise the words under its rarest n-gram that pass the substring check
+ */
+function tokensContaining(indexes: GraphIndexes, word: string): string[] {
+  const chars = Array.from(word);
+  if (chars.length <= NGRAM_LENGTH) {
+    return lookup(indexes.ngrams, word) ?? [];
+  }
+
+  let rarest: string[] | null = null;
+  for (let start = 0; start + NGRAM_LENGTH <= chars.length; start++) {
+    const words = lookup(indexes.ngrams, chars.slice(start, start + NGRAM_LENGTH).join('')) ?? [];
+    if (rarest === null || words.length < rarest.length) {
+      rarest = words;
+    }
+    if (rarest.length === 0) {
+      break;
+    }
+  }
+  return (rarest ?? []).filter((token) => token.includes(word));
 }
 
 /**
  * Search graphs by title or description
  */
 export async function searchGraphs(query: string): Promise<Graph[]> {
-  const graphs = await loadAllGraphs();
+  const { graphs, indexes } = await loadRegistry();
   const lowerQuery = query.toLowerCase();
-  return graphs.filter(
+
+  // Each word of a matching query is part of a word of the title or description,
+  // so only graphs with such a word for every query word need the substring check
+  let candidates: Iterable<number> = graphs.keys();
+  const queryTokens = tokenize(query);
+  if (queryTokens.length > 0) {
+    let positions: Set<number> | null = null;
+    for (const queryToken of queryTokens) {
+      const matches = new Set<number>();
+      for (const token of tokensContaining(indexes, queryToken)) {
+        lookup(indexes.tokens, token)?.forEach((position) => matches.add(position));
+      }
+      positions = positions === null
+        ? matches
+        : new Set([...positions].filter((position) => matches.has(position)));
+    }
+    candidates = inRegistryOrder(positions ?? []);
+  }
+
+  return atPositions(graphs, candidates).filter(
     (g) =>
       g.title.toLowerCase().includes(lowerQuery) ||
       g.description?.toLowerCase().includes(lowerQuery)
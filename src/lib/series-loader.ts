@@ -0,0 +1,61 @@
+/**
+ * Load the real daily bank transaction series written by
+ * scripts/convert-quarterly-csv-with-daily.py --series
+ */
+
+import fs from 'fs/promises';
+import path from 'path';
+
+const SERIES_DIR = path.join(process.cwd(), 'src', 'data', 'quarterly', 'daily-series');
+
+export interface DailyDataPoint {
+  date: string;
+  amount: number;
+}
+
+export type SeriesGranularity = 'daily' | 'weekly' | 'monthly';
+
+interface YearSeries {
+  metadata: {
+    year: number;
+    field: string;
+    days: number;
+    lastUpdated: string;
+  };
+  daily: DailyDataPoint[];
+  weekly: DailyDataPoint[];
+  monthly: DailyDataPoint[];
+}
+
+// One parsed file per year, reused until the file changes
+const cache = new Map<number, { mtimeMs: number; series: YearSeries }>();
+
+async function loadYear(year: number): Promise<YearSeries | null> {
+  const file = path.join(SERIES_DIR, `${year}.json`);
+  try {
+    const { mtimeMs } = await fs.stat(file);
+    const cached = cache.get(year);
+    if (cached?.mtimeMs === mtimeMs) {
+      return cached.series;
+    }
+
+    const series: YearSeries = JSON.parse(await fs.readFile(file, 'utf-8'));
+    cache.set(year, { mtimeMs, series });
+    return series;
+  } catch (error) {
+    console.error(`Could not load bank transaction series for ${year}:`, error);
+    return null;
+  }
+}
+
+/**
+ * Get a year of daily bank transaction totals at the given granularity.
+ * Weeks are keyed by their Monday and months by their first day.
+ */
+export async function loadBankSeries(
+  year: number,
+  granularity: SeriesGranularity = 'daily'
+): Promise<DailyDataPoint[]> {
+  const series = await loadYear(year);
+  return series?.[granularity] ?? [];
+}
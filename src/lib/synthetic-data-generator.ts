@@ -1,6 +1,8 @@
 /**
- * Generate synthetic but realistic data for bank transactions and visitor counts
+ * Generate synthetic but realistic visitor counts
  * Based on known annual totals and seasonal patterns
+ *
+ * Bank transactions are measured: see loadBankSeries in src/lib/series-loader.ts
  */
 
 interface DailyDataPoint {
@@ -8,81 +10,6 @@ interface DailyDataPoint {
   amount: number;
 }
 
-/**
- * Generate daily bank transaction data for 2024
- * Total: 3,970,000,000 kr for the year
- */
-export function generateBankTransactionData(): DailyDataPoint[] {
-  const data: DailyDataPoint[] = [];
-  const totalYearly = 3_970_000_000; // 3.97 billion NOK
-  const dailyBase = totalYearly / 365; // ~10.9 million per day
-
-  // Seasonal multipliers (realistic Norwegian retail pattern)
-  const seasonalMultipliers: Record<number, number> = {
-    1: 0.75,  // Jan - slow after holidays
-    2: 0.80,  // Feb - still winter slow
-    3: 0.90,  // Mar - picking up
-    4: 0.95,  // Apr - spring activity
-    5: 1.10,  // May - 17. mai, warmer weather
-    6: 1.20,  // Jun - summer peak, Pride, festivals
-    7: 0.95,  // Jul - vacation, some businesses closed
-    8: 1.05,  // Aug - back from vacation
-    9: 1.10,  // Sep - autumn activity
-    10: 1.05, // Oct - stable
-    11: 1.10, // Nov - pre-Christmas
-    12: 1.05, // Dec - Christmas but also closures
-  };
-
-  // Day of week multipliers
-  const dowMultipliers = [0.7, 1.0, 1.0, 1.05, 1.15, 1.30, 1.20]; // Sun-Sat
-
-  // Event boost dates (major events that increase spending)
-  const eventBoosts: Record<string, number> = {
-    '2024-03-08': 1.15, // 8. mars
-    '2024-05-04': 1.25, // Løkkadagene
-    '2024-05-17': 1.40, // 17. mai
-    '2024-05-24': 1.20, // Vegetarfestival
-    '2024-06-01': 1.25, // Musikkfest Oslo
-    '2024-06-13': 1.35, // Piknik i Parken start
-    '2024-06-14': 1.35,
-    '2024-06-15': 1.35,
-    '2024-06-26': 1.30, // Pride week start
-    '2024-06-27': 1.35,
-    '2024-06-28': 1.40,
-    '2024-06-29': 1.45, // Pride parade - peak
-    '2024-11-30': 1.20, // Jul på Løkka
-  };
-
-  const startDate = new Date('2024-01-01');
-  const endDate = new Date('2024-12-31');
-  const current = new Date(startDate);
-
-  while (current <= endDate) {
-    const dateStr = current.toISOString().split('T')[0] || '';
-    const month = current.getMonth() + 1;
-    const dow = current.getDay();
-
-    // Calculate daily amount with multipliers
-    let amount = dailyBase;
-    amount *= seasonalMultipliers[month] || 1.0;
-    amount *= dowMultipliers[dow] || 1.0;
-    amount *= eventBoosts[dateStr] || 1.0;
-
-    // Add some random variation (±10%)
-    const variation = 0.9 + Math.random() * 0.2;
-    amount *= variation;
-
-    data.push({
-      date: dateStr,
-      amount: Math.round(amount),
-    });
-
-    current.setDate(current.getDate() + 1);
-  }
-
-  return data;
-}
-
 /**
  * Generate daily visitor count data for 2024
  * Estimated based on population density and foot traffic patterns
@@ -40,9 +40,21 @@ export interface Graph {
     width?: number;
     height?: number;
     format?: 'jpg' | 'png' | 'svg' | 'webp';
+    derivatives?: ImageDerivative[]; // Written by scripts/create-image-derivatives.py
   };
 }
 
+/**
+ * Resized copy of a graph image, for srcset
+ */
+export interface ImageDerivative {
+  path: string;
+  width: number;
+  height: number;
+  format: 'webp' | 'avif';
+  bytes: number;
+}
+
 /**
  * Graph reference in analyses
  */